@@ -32,6 +32,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'students.instrumentation.InstrumentationMiddleware',
+    'students.routers.PinPrimaryAfterWriteMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -45,7 +47,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, timing renders for the instrumentation middleware
+        'BACKEND': 'students.instrumentation.TimedDjangoTemplates',
         'DIRS': [BASE_DIR, 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -71,16 +74,117 @@ DATABASES = {
     }
 }
 
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.postgresql',
-#         'NAME': os.getenv('DB_NAME', 'student_management'),
-#         'USER': os.getenv('DB_USER', 'postgres'),
-#         'PASSWORD': os.getenv('DB_PASSWORD', ''),
-#         'HOST': os.getenv('DB_HOST', 'localhost'),
-#         'PORT': os.getenv('DB_PORT', '5432'),
-#     }
-# }
+if os.getenv('DB_ENGINE', 'sqlite') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'student_management'),
+            'USER': os.getenv('DB_USER', 'postgres'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+        }
+    }
+
+# Connection tuning profile. 'development' keeps Django's defaults.
+# 'production' keeps connections open between requests and, on SQLite,
+# switches to WAL with a busy timeout so concurrent workers queue for the
+# write lock instead of failing with "database is locked".
+DB_PROFILE = os.getenv('DB_PROFILE', 'development')
+
+if DB_PROFILE == 'production':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+        DATABASES['default']['ENGINE'] = 'students.backends.sqlite3'
+        DATABASES['default']['OPTIONS'] = {
+            # Seconds to wait for a lock; sets SQLite's busy_timeout
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA busy_timeout=20000;'
+                'PRAGMA cache_size=-20000;'
+                'PRAGMA mmap_size=134217728;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        }
+    else:
+        DATABASES['default']['OPTIONS'] = {'connect_timeout': 5}
+        # Transaction-mode poolers such as PgBouncer cannot keep the
+        # server-side cursors iterator() opens across transactions
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = os.getenv('DB_POOLER', 'False') == 'True'
+
+# A read replica for the reporting views (see students.routers). Set
+# DB_REPLICA to the path of a copy of the primary database, or to "mirror"
+# to open a second connection to the primary itself as a stand-in.
+DB_REPLICA = os.getenv('DB_REPLICA', '')
+if DB_REPLICA:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DATABASES['default']['NAME'] if DB_REPLICA == 'mirror' else DB_REPLICA,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['students.routers.ReplicaRouter']
+
+# How long a browser keeps reading from the primary after it writes
+STUDENTS_REPLICA_STICKY_SECONDS = int(os.getenv('STUDENTS_REPLICA_STICKY_SECONDS', '10'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'student-management',
+    },
+    # Rendered table rows for the {% cache %} tag, which uses this alias by
+    # name. Set STUDENTS_FRAGMENT_CACHE_DIR to share them between worker
+    # processes through files instead of keeping a copy in each.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+    # Sessions in front of the database, see SESSION_ENGINE below
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+if os.getenv('STUDENTS_FRAGMENT_CACHE_DIR'):
+    CACHES['template_fragments'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('STUDENTS_FRAGMENT_CACHE_DIR'),
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+
+
+# Sessions and authentication
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/#using-cached-sessions
+
+# Read sessions from the 'sessions' cache, writing them through to the
+# database (students.sessions), and keep logged-in users in a per-process
+# cache (students.auth), so a request spends no queries on either. Cached
+# copies expire after these many seconds, which bounds how long another
+# worker process can miss a logout or a password change; 0 turns the user
+# cache off.
+STUDENTS_CACHED_SESSIONS = os.getenv('STUDENTS_CACHED_SESSIONS', 'True') == 'True'
+STUDENTS_SESSION_CACHE_SECONDS = int(os.getenv('STUDENTS_SESSION_CACHE_SECONDS', '60'))
+STUDENTS_USER_CACHE_SECONDS = int(os.getenv('STUDENTS_USER_CACHE_SECONDS', '60'))
+
+if STUDENTS_CACHED_SESSIONS:
+    SESSION_ENGINE = 'students.sessions'
+    SESSION_CACHE_ALIAS = 'sessions'
+
+# Sessions name the backend that logged them in, so ones started under the
+# stock ModelBackend have to log in again once
+AUTHENTICATION_BACKENDS = ['students.auth.CachedModelBackend']
 
 
 # Password validation
@@ -121,12 +225,65 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS =[BASE_DIR / 'static'] 
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Unless DEBUG, collectstatic gives static files content-hashed names and
+# precompressed copies (students.assets), and {% static %} links to those.
+# While DEBUG they are served unhashed from the app directories as edited.
+STUDENTS_STATIC_MANIFEST = os.getenv('STUDENTS_STATIC_MANIFEST', str(not DEBUG)) == 'True'
+
+# Serve STATIC_ROOT from Django, precompressed copies first, with far-future
+# cache headers on hashed names. Turn off when a web server in front does it.
+STUDENTS_SERVE_STATIC = os.getenv('STUDENTS_SERVE_STATIC', str(STUDENTS_STATIC_MANIFEST)) == 'True'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'students.assets.PrecompressedManifestStaticFilesStorage' if STUDENTS_STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 # Default primary key field type
 
-DEFATUL_AUTO_FIELD = 'django.db.models.BigAutoField'
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Read course enrollment counts from the denormalized Course counters instead
+# of annotating them with a COUNT join. The counters are always maintained.
+STUDENTS_DENORMALIZED_COUNTERS = os.getenv('STUDENTS_DENORMALIZED_COUNTERS', 'False') == 'True'
+
+# Views declare query budgets with students.instrumentation.query_budget.
+# Going over one logs a warning, or raises when strict (e.g. in test runs).
+STUDENTS_QUERY_BUDGET_STRICT = os.getenv('STUDENTS_QUERY_BUDGET_STRICT', 'False') == 'True'
+
+# What to do when code reads a field a list projection left out: '' to
+# allow it, 'warn' to log it, 'raise' to fail (e.g. in test runs)
+STUDENTS_DEFERRED_FIELD_GUARD = os.getenv('STUDENTS_DEFERRED_FIELD_GUARD', '')
+
+# Mount the async versions of the dashboard and list pages under /async/
+# (see students.async_views), for ASGI deployments
+STUDENTS_ASYNC_VIEWS = os.getenv('STUDENTS_ASYNC_VIEWS', 'False') == 'True'
+
+# Threads the async views run their independent queries on, each with its
+# own database connection. 0 runs them one after another on the request's
+# connection, as tests wrapped in a transaction need.
+STUDENTS_ASYNC_QUERY_WORKERS = int(os.getenv('STUDENTS_ASYNC_QUERY_WORKERS', '4'))
+
+# Background jobs (students.jobs, run by `manage.py run_workers`): attempts
+# before a job is failed, the delay before the first retry in seconds (it
+# doubles with each attempt), and how long a job may run before it is
+# presumed abandoned by a dead worker and queued again.
+STUDENTS_JOB_MAX_ATTEMPTS = int(os.getenv('STUDENTS_JOB_MAX_ATTEMPTS', '3'))
+STUDENTS_JOB_RETRY_DELAY = int(os.getenv('STUDENTS_JOB_RETRY_DELAY', '30'))
+STUDENTS_JOB_TIMEOUT = int(os.getenv('STUDENTS_JOB_TIMEOUT', '3600'))
+
+# Addresses allowed to scrape the Prometheus metrics at /metrics/
+STUDENTS_METRICS_ALLOWED_IPS = os.getenv('STUDENTS_METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
 
 # Crispy Forms Settings
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
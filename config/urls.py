@@ -1,8 +1,12 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from students import views
+from students.assets import serve_static
+from students.instrumentation import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,8 +14,18 @@ urlpatterns = [
     path('login/', views.custom_login, name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('students/', include('students.urls')),
+    path('api/', include('students.api_urls')),
+    path('export/<str:export_type>/', views.export_data, name='export_data'),
+    path('export/<str:export_type>/background/', views.export_job, name='export_job'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
+if settings.STUDENTS_ASYNC_VIEWS:
+    urlpatterns += [path('async/', include('students.async_urls'))]
+
+if settings.STUDENTS_SERVE_STATIC:
+    urlpatterns += [re_path(r'^%s(?P<path>.+)$' % re.escape(settings.STATIC_URL.lstrip('/')), serve_static)]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
@@ -1,8 +1,18 @@
 from django.contrib import admin
-from .models import Student, Course, Enrollment, Grade
+from .models import Student, Course, Enrollment, Grade, Job
+from .pagination import EstimatedCountPaginator
+from .search import search_related, search_students
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables too large to count on every page view:
+    an estimated total, and no second COUNT(*) for the unfiltered total.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(LargeTableAdmin):
     list_display = ('student_id', 'full_name', 'email', 'status', 'enrollment_date')
     list_filter = ('status', 'gender', 'enrollment_date')
     search_fields = ('student_id', 'first_name', 'last_name', 'email')
@@ -27,34 +37,62 @@ class StudentAdmin(admin.ModelAdmin):
         }),
     )
     list_per_page = 20
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Use the prefix index instead of OR-ing icontains over search_fields
+        if not search_term:
+            return queryset, False
+        return search_students(queryset, search_term), False
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ('course_code', 'course_name', 'credits', 'level', 'fee', 'is_active')
+    list_display = ('course_code', 'course_name', 'credits', 'level', 'fee', 'is_active', 'enrollment_count')
     list_filter = ('is_active', 'level')
     search_fields = ('course_code', 'course_name')
     ordering = ('course_code',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('enrollment_count', 'active_enrollment_count', 'created_at', 'updated_at')
     list_per_page = 20
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(LargeTableAdmin):
     list_display = ('student', 'course', 'semester', 'academic_year', 'enrollment_date', 'is_active')
     list_filter = ('is_active', 'semester', 'academic_year')
+    # Describes the search box; get_search_results does the matching
     search_fields = ('student__student_id', 'student__first_name', 'student__last_name', 'course__course_code')
-    raw_id_fields = ('student', 'course')
+    autocomplete_fields = ('student', 'course')
+    list_select_related = ('student', 'course')
     ordering = ('-enrollment_date',)
     list_per_page = 20
+    
+    def get_queryset(self, request):
+        # The grade form's autocomplete labels enrollments by __str__ too
+        return super().get_queryset(request).select_related('student', 'course')
+    
+    def get_search_results(self, request, queryset, search_term):
+        return search_related(queryset, search_term, 'student', 'course'), False
 
 @admin.register(Grade)
-class GradeAdmin(admin.ModelAdmin):
+class GradeAdmin(LargeTableAdmin):
     list_display = ('enrollment', 'marks_obtained', 'total_marks', 'grade', 'exam_date')
     list_filter = ('grade', 'exam_date')
+    # Describes the search box; get_search_results does the matching
     search_fields = ('enrollment__student__student_id', 'enrollment__student__first_name')
-    raw_id_fields = ('enrollment',)
+    autocomplete_fields = ('enrollment',)
+    list_select_related = ('enrollment__student', 'enrollment__course')
     ordering = ('-exam_date',)
     readonly_fields = ('created_at', 'updated_at')
     list_per_page = 20
+    
+    def get_search_results(self, request, queryset, search_term):
+        return search_related(queryset, search_term, 'enrollment__student', 'enrollment__course'), False
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'attempts', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    raw_id_fields = ('created_by',)
+    readonly_fields = ('locked_by', 'locked_at', 'started_at', 'finished_at', 'created_at')
+    list_per_page = 20
 
 # Optional: Customize admin site
 admin.site.site_header = 'Student Management System Admin'
@@ -0,0 +1,202 @@
+import json
+from functools import wraps
+
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from .instrumentation import query_budget
+from .models import Course, Enrollment, Student
+from .search import search_related, search_students
+
+
+MAX_BULK_IDS = 5000
+AUTOCOMPLETE_PAGE_SIZE = 20
+
+
+class BadRequest(Exception):
+    pass
+
+
+def api_login_required(view):
+    """Like login_required, but answers 401 JSON instead of redirecting to the login page"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'success': False, 'error': 'Authentication required.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def read_json(request):
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        raise BadRequest('Request body must be JSON.')
+    if not isinstance(payload, dict):
+        raise BadRequest('Request body must be a JSON object.')
+    return payload
+
+
+def read_ids(payload):
+    ids = payload.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise BadRequest('ids must be a non-empty list.')
+    if len(ids) > MAX_BULK_IDS:
+        raise BadRequest(f'At most {MAX_BULK_IDS} ids per request.')
+    try:
+        return {int(pk) for pk in ids}
+    except (TypeError, ValueError):
+        raise BadRequest('ids must be integers.')
+
+
+def read_student_status(payload):
+    status = payload.get('status')
+    if status not in dict(Student.STATUS_CHOICES):
+        raise BadRequest('status must be one of %s.' % ', '.join(dict(Student.STATUS_CHOICES)))
+    return status
+
+
+def read_is_active(payload):
+    is_active = payload.get('is_active')
+    if not isinstance(is_active, bool):
+        raise BadRequest('is_active must be true or false.')
+    return is_active
+
+
+def set_field(queryset, field, value):
+    """
+    Set ``field`` on every row of ``queryset`` in a single UPDATE.
+
+    Rows that already hold the value are excluded in SQL, so the returned
+    count is the number of rows that actually changed.
+    """
+    return queryset.exclude(**{field: value}).update(**{field: value})
+
+
+def json_endpoint(view):
+    """Turn BadRequest into a 400 JSON response"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=400)
+    return wrapper
+
+
+@require_http_methods(['PATCH'])
+@api_login_required
+@json_endpoint
+def student_status(request, pk):
+    """Change one student's status"""
+    status = read_student_status(read_json(request))
+    if not Student.objects.filter(pk=pk).exists():
+        return JsonResponse({'success': False, 'error': 'Student not found.'}, status=404)
+    changed = set_field(Student.objects.filter(pk=pk), 'status', status)
+    return JsonResponse({'success': True, 'id': pk, 'changed': {'status': status} if changed else {}})
+
+
+@require_http_methods(['PATCH'])
+@api_login_required
+@json_endpoint
+def student_status_bulk(request):
+    """Change the status of many students in one UPDATE"""
+    payload = read_json(request)
+    ids = read_ids(payload)
+    status = read_student_status(payload)
+    updated = set_field(Student.objects.filter(pk__in=ids), 'status', status)
+    return JsonResponse({'success': True, 'updated': updated, 'changed': {'status': status}})
+
+
+@require_http_methods(['PATCH'])
+@api_login_required
+@json_endpoint
+def enrollment_status(request, pk):
+    """Activate or deactivate one enrollment"""
+    is_active = read_is_active(read_json(request))
+    if not Enrollment.objects.filter(pk=pk).exists():
+        return JsonResponse({'success': False, 'error': 'Enrollment not found.'}, status=404)
+    changed = set_field(Enrollment.objects.filter(pk=pk), 'is_active', is_active)
+    return JsonResponse({'success': True, 'id': pk, 'changed': {'is_active': is_active} if changed else {}})
+
+
+@require_http_methods(['PATCH'])
+@api_login_required
+@json_endpoint
+def enrollment_status_bulk(request):
+    """Activate or deactivate many enrollments in one UPDATE"""
+    payload = read_json(request)
+    ids = read_ids(payload)
+    is_active = read_is_active(payload)
+    updated = set_field(Enrollment.objects.filter(pk__in=ids), 'is_active', is_active)
+    return JsonResponse({'success': True, 'updated': updated, 'changed': {'is_active': is_active}})
+
+
+def autocomplete_response(request, queryset, extra):
+    """
+    One page of autocomplete results, in the shape main.js (and Select2)
+    expect. ``extra`` maps an object to data attributes for its option.
+    The page is read with one row of lookahead instead of a COUNT.
+    """
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        raise BadRequest('page must be an integer.')
+    start = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+    rows = list(queryset[start:start + AUTOCOMPLETE_PAGE_SIZE + 1])
+    return JsonResponse({
+        'results': [
+            {'id': obj.pk, 'text': str(obj), 'data': extra(obj)}
+            for obj in rows[:AUTOCOMPLETE_PAGE_SIZE]
+        ],
+        'more': len(rows) > AUTOCOMPLETE_PAGE_SIZE,
+    })
+
+
+@query_budget(3)
+@require_http_methods(['GET'])
+@api_login_required
+@json_endpoint
+def student_autocomplete(request):
+    """Students whose name, ID or email words start with the words of ?q="""
+    students = Student.objects.only('id', 'student_id', 'first_name', 'last_name', 'email')
+    students = search_students(students, request.GET.get('q', ''))
+    return autocomplete_response(request, students, lambda student: {'email': student.email})
+
+
+@query_budget(3)
+@require_http_methods(['GET'])
+@api_login_required
+@json_endpoint
+def course_autocomplete(request):
+    """Courses whose code or name starts with ?q="""
+    courses = Course.objects.only('id', 'course_code', 'course_name', 'duration_months', 'fee').order_by('course_code')
+    query = request.GET.get('q', '').strip()
+    if query:
+        courses = courses.filter(Q(course_code__istartswith=query) | Q(course_name__istartswith=query))
+    return autocomplete_response(request, courses, lambda course: {
+        'duration': course.duration_months,
+        'fee': str(course.fee),
+    })
+
+
+@query_budget(3)
+@require_http_methods(['GET'])
+@api_login_required
+@json_endpoint
+def enrollment_autocomplete(request):
+    """Enrollments whose student matches ?q= through the search index, or whose course code starts with it"""
+    enrollments = Enrollment.objects.select_related('student', 'course').only(
+        'id', 'semester', 'academic_year',
+        'student__student_id', 'student__first_name', 'student__last_name',
+        'course__course_code', 'course__course_name',
+    ).order_by('-enrollment_date', '-id')
+    enrollments = search_related(enrollments, request.GET.get('q', ''), 'student', 'course')
+    return autocomplete_response(request, enrollments, lambda enrollment: {
+        'student': enrollment.student.full_name(),
+        'course': enrollment.course.course_name,
+        'semester': enrollment.get_semester_display(),
+        'year': enrollment.academic_year,
+    })
+
@@ -0,0 +1,17 @@
+from django.urls import path
+from . import api
+
+urlpatterns = [
+    # Students
+    path('students/status/', api.student_status_bulk, name='api_student_status_bulk'),
+    path('students/<int:pk>/status/', api.student_status, name='api_student_status'),
+    
+    # Enrollments
+    path('enrollments/status/', api.enrollment_status_bulk, name='api_enrollment_status_bulk'),
+    path('enrollments/<int:pk>/status/', api.enrollment_status, name='api_enrollment_status'),
+    
+    # Autocomplete for the enrollment and grade forms
+    path('students/autocomplete/', api.student_autocomplete, name='api_student_autocomplete'),
+    path('courses/autocomplete/', api.course_autocomplete, name='api_course_autocomplete'),
+    path('enrollments/autocomplete/', api.enrollment_autocomplete, name='api_enrollment_autocomplete'),
+]
@@ -0,0 +1,127 @@
+"""
+Static files built once by collectstatic and served cheaply afterwards.
+
+PrecompressedManifestStaticFilesStorage gives every file a content-hashed
+name, recorded in staticfiles.json, and writes compressed copies of the text
+files next to them. serve_static hands out those copies to clients that
+accept them and lets browsers keep hashed files for a year: a changed file
+gets a new name, so repeat page loads only fetch the HTML.
+"""
+import gzip
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip copies are written
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.json', '.map', '.svg', '.txt', '.html', '.xml'}
+# Below this the compressed copy saves less than its own headers cost
+MIN_COMPRESS_SIZE = 256
+
+# Content-Encoding and file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+ACCEPT_ENCODING = {encoding: re.compile(rf'\b{encoding}\b') for encoding, _ in ENCODINGS}
+
+# The 12 hex digits ManifestStaticFilesStorage puts before the extension
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}(?=\.[^./]+$|$)')
+HASHED_MAX_AGE = 365 * 24 * 60 * 60
+# Unhashed names can change in place, so caches must check back soon
+UNHASHED_MAX_AGE = 60
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also saves each text file gzipped
+    (``.gz``) and, with the brotli package installed, brotli-compressed
+    (``.br``), both at the highest level since it happens once per deploy.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in {*paths, *self.hashed_files.values()}:
+            self.compress(name)
+
+    def compress(self, name):
+        path = Path(self.path(name))
+        if path.suffix not in COMPRESSIBLE_EXTENSIONS or not path.is_file():
+            return
+        data = path.read_bytes()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data, quality=11)))
+        for suffix, compressed in variants:
+            target = path.with_name(path.name + suffix)
+            if len(compressed) < len(data):
+                target.write_bytes(compressed)
+            else:
+                target.unlink(missing_ok=True)
+
+
+def is_hashed(path):
+    """Whether ``path`` is the manifest's current hashed name for a file"""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if not hashed_files:
+        return False
+    return hashed_files.get(HASHED_NAME.sub('', path, count=1)) == path
+
+
+@require_safe
+def serve_static(request, path):
+    """
+    Serve a file from STATIC_ROOT, or its precompressed copy when the client
+    accepts the encoding, with far-future cache headers for hashed names.
+    """
+    try:
+        fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not fullpath.is_file():
+        raise Http404
+
+    filename = fullpath.name
+    content_type, _ = mimetypes.guess_type(filename)
+    accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    encoding = None
+    for name, suffix in ENCODINGS:
+        variant = fullpath.with_name(fullpath.name + suffix)
+        if ACCEPT_ENCODING[name].search(accepted) and variant.is_file():
+            fullpath, encoding = variant, name
+            break
+
+    stat = fullpath.stat()
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            fullpath.open('rb'),
+            filename=filename,
+            content_type=content_type or 'application/octet-stream',
+        )
+        response.headers['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if is_hashed(path):
+        patch_cache_control(response, public=True, max_age=HASHED_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=UNHASHED_MAX_AGE)
+    return response
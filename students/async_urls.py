@@ -0,0 +1,9 @@
+from django.urls import path
+from . import async_views
+
+# Async versions of the read-heavy pages, for ASGI deployments
+urlpatterns = [
+    path('dashboard/', async_views.dashboard, name='async_dashboard'),
+    path('students/', async_views.student_list, name='async_student_list'),
+    path('grades/', async_views.grade_list, name='async_grade_list'),
+]
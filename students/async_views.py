@@ -0,0 +1,186 @@
+"""
+Async versions of the dashboard and the read-only list views, mounted under
+/async/ when STUDENTS_ASYNC_VIEWS is on.
+
+Django 4.2's async ORM methods run on a single shared thread, so awaiting
+them one after another is no faster than the sync views. Where a page has
+independent queries heavy enough to overlap, like the grade list's summary
+and page, they are handed to a bounded thread pool and run at the same
+time. Each pool thread keeps its own database connection across queries.
+Cheap queries run together in one sync_to_async call instead, since a trip
+through the pool costs more than they take.
+
+Measured with benchmark_async on SQLite (3000 students, 15000 grades,
+concurrency 8), every async page is slower than its sync view at the
+median and in throughput, and only the grade list wins, on p95 and max
+latency. That is why they are off by default.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.db import connections
+from django.shortcuts import render
+
+from . import views
+from .forms import GradeFilterForm, SearchForm
+from .instrumentation import query_budget, recording_queries
+from .models import Grade, Student
+from .pagination import KeysetPaginator, cached_count
+from .routers import read_from_replica
+from .stats import get_stats
+
+
+_executor = None
+_executor_workers = 0
+
+
+def _get_executor():
+    global _executor, _executor_workers
+    if _executor is None:
+        _executor_workers = settings.STUDENTS_ASYNC_QUERY_WORKERS
+        _executor = ThreadPoolExecutor(max_workers=_executor_workers, thread_name_prefix='students-queries')
+    return _executor
+
+
+def shutdown_query_pool():
+    """
+    Close the query pool's database connections and stop its threads. The
+    next async view to query starts a new pool. The threads otherwise live,
+    connections open, until the process exits.
+    """
+    global _executor
+    if _executor is None:
+        return
+    executor, _executor = _executor, None
+    barrier = threading.Barrier(_executor_workers)
+
+    def close_connections():
+        # A connection can only be closed by its own thread. Holding each
+        # worker here until all have taken one of these calls makes every
+        # thread run exactly one.
+        try:
+            barrier.wait(timeout=10)
+        finally:
+            connections.close_all()
+
+    for _ in range(_executor_workers):
+        executor.submit(close_connections)
+    executor.shutdown(wait=True)
+
+
+def _close_expired_connections():
+    # Pool threads see no request_finished signal. Their connections serve
+    # query after query for the thread's lifetime instead, and are closed
+    # early only once older than a positive CONN_MAX_AGE; reopening one for
+    # every query would cost more than the concurrency saves.
+    for conn in connections.all(initialized_only=True):
+        if conn.settings_dict['CONN_MAX_AGE'] and conn.close_at is not None and time.monotonic() >= conn.close_at:
+            conn.close()
+
+
+def _run_query(func):
+    with recording_queries():
+        try:
+            result = func()
+        except Exception:
+            # A failed query can leave its connection unusable
+            connections.close_all()
+            raise
+    _close_expired_connections()
+    return result
+
+
+async def gather_queries(*funcs):
+    """
+    Run blocking ORM callables concurrently in the query pool and return
+    their results in order. Each callable must evaluate its queryset.
+
+    With STUDENTS_ASYNC_QUERY_WORKERS set to 0 they run one after another
+    on the request's own connection instead, which is what tests that wrap
+    each case in a transaction need.
+    """
+    if not settings.STUDENTS_ASYNC_QUERY_WORKERS:
+        return [await sync_to_async(func)() for func in funcs]
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    # run_in_executor does not carry context variables over; the replica
+    # routing and the request metrics live in them
+    return await asyncio.gather(*(
+        loop.run_in_executor(executor, contextvars.copy_context().run, _run_query, func)
+        for func in funcs
+    ))
+
+
+def async_login_required(view_func):
+    """login_required for async views; Django 4.2's decorator only wraps sync ones"""
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        # request.user is loaded lazily from the session, which queries
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+async def _render(request, template_name, context):
+    # Template rendering can still touch lazy objects such as request.user
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@query_budget(6)
+@async_login_required
+@read_from_replica
+async def dashboard(request):
+    """Dashboard view with statistics"""
+    # Three small indexed queries: handing them to the pool costs more than
+    # running them together saves
+    stats, recent, popular = await sync_to_async(
+        lambda: (get_stats(), views.recent_enrollments(), views.popular_courses())
+    )()
+    context = views.dashboard_context(stats, recent, popular)
+    return await _render(request, 'students/dashboard.html', context)
+
+
+@query_budget(5)
+@async_login_required
+async def student_list(request):
+    """List students"""
+    search_form = SearchForm(request.GET)
+    students = await sync_to_async(search_form.filter_queryset)(Student.objects.for_list())
+    paginator = KeysetPaginator(students, views.STUDENTS_PER_PAGE, ordering=('created_at', 'id'))
+
+    def fetch_page():
+        # The total is usually a cache hit, so there is nothing to overlap
+        page_obj = paginator.get_page(request.GET.get('cursor'))
+        page_obj.total = cached_count(students)
+        return page_obj
+
+    page_obj = await sync_to_async(fetch_page)()
+    context = views.student_list_context(request, search_form, page_obj)
+    return await _render(request, 'students/student_list.html', context)
+
+
+@query_budget(7)
+@async_login_required
+@read_from_replica
+async def grade_list(request):
+    """List grades, running the summary aggregate and the page query concurrently"""
+    filter_form = GradeFilterForm(request.GET)
+    # Validating the course choice queries
+    grades = await sync_to_async(filter_form.filter_queryset)(Grade.objects.all())
+
+    summary, page_obj = await gather_queries(
+        lambda: views.grade_summary(grades),
+        lambda: views.grade_page(request, grades),
+    )
+    context = views.grade_list_context(request, filter_form, summary, page_obj)
+    return await _render(request, 'students/grade_list.html', context)
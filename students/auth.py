@@ -0,0 +1,74 @@
+"""
+An authentication backend that keeps logged-in users in a per-process
+cache, so a request no longer loads its User row from the database.
+
+Entries live for STUDENTS_USER_CACHE_SECONDS (0 turns the cache off). Saving
+or deleting a user - a new password, deactivation, the staff or superuser
+flag - drops it from this process's cache straight away through the
+handler in signals.py; other processes pick the change up when their entry
+expires. Group and per-user permissions are not cached: each request gets a
+fresh copy of the user, and ModelBackend loads them for it as before.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+
+# Users kept per process; the least recently used go first
+USER_CACHE_SIZE = 10000
+
+_users = OrderedDict()
+_lock = threading.Lock()
+
+
+def invalidate_user(user_id):
+    with _lock:
+        _users.pop(user_id, None)
+
+
+def invalidate_all_users():
+    with _lock:
+        _users.clear()
+
+
+def _cached_user(user_id):
+    with _lock:
+        entry = _users.get(user_id)
+        if entry is None:
+            return None
+        expires, user = entry
+        if expires <= time.monotonic():
+            del _users[user_id]
+            return None
+        _users.move_to_end(user_id)
+    return user
+
+
+def _cache_user(user, timeout):
+    with _lock:
+        _users[user.pk] = (time.monotonic() + timeout, user)
+        _users.move_to_end(user.pk)
+        while len(_users) > USER_CACHE_SIZE:
+            _users.popitem(last=False)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, with get_user() served from the per-process user cache"""
+
+    def get_user(self, user_id):
+        timeout = settings.STUDENTS_USER_CACHE_SECONDS
+        if not timeout:
+            return super().get_user(user_id)
+        user = _cached_user(user_id)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            _cache_user(user, timeout)
+        # Every request gets its own instance: permission caches and other
+        # attributes set on request.user must not leak between requests
+        return copy.deepcopy(user)
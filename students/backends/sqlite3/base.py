@@ -0,0 +1,34 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The SQLite backend with the two OPTIONS Django 5.1 adds:
+
+    * ``init_command``: SQL run on every new connection, e.g. PRAGMAs.
+    * ``transaction_mode``: e.g. 'IMMEDIATE', which takes the write lock at
+      BEGIN. A deferred transaction that reads and then writes cannot wait
+      for the lock and fails at once with "database is locked"; an immediate
+      one waits for up to the busy timeout instead.
+    """
+
+    EXTRA_OPTIONS = ('init_command', 'transaction_mode')
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for option in self.EXTRA_OPTIONS:
+            params.pop(option, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        init_command = self.settings_dict['OPTIONS'].get('init_command')
+        if init_command:
+            for statement in init_command.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
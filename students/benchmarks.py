@@ -0,0 +1,356 @@
+import asyncio
+import datetime
+import platform
+import threading
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http.request import validate_host
+from django.test import AsyncClient, Client, override_settings
+from django.urls import URLPattern, reverse
+
+from . import async_views, urls as student_urls
+from .auth import invalidate_all_users
+from .models import Course, Enrollment, Grade, Student
+
+
+BENCH_USERNAME = 'benchmark-runner'
+
+
+def _sample_kwargs():
+    """URL kwargs for the detail pages, pointing at an existing student"""
+    pk = Student.objects.order_by().values_list('pk', flat=True).first()
+    return {'pk': pk} if pk is not None else None
+
+
+def _section_params():
+    enrollment = Enrollment.objects.order_by().values('course_id', 'semester', 'academic_year').first()
+    if enrollment is None:
+        return None
+    return {
+        'course': enrollment['course_id'],
+        'semester': enrollment['semester'],
+        'academic_year': enrollment['academic_year'],
+        'exam_date': '2024-01-01',
+        'total_marks': '100',
+    }
+
+
+# Benchmarked on top of every URL in students/urls.py: the filtered variants
+# and the views mounted outside that module
+EXTRA_CASES = [
+    ('student_list?status', 'student_list', {}, {'status': 'A'}),
+    ('student_list?query', 'student_list', {}, {'query': 'ma'}),
+    ('enrollment_list?status', 'enrollment_list', {}, {'status': 'active'}),
+    ('grade_list?grade', 'grade_list', {}, {'grade': 'A'}),
+    ('gradebook?section', 'gradebook', {}, _section_params),
+    ('export_data:grades', 'export_data', {'export_type': 'grades'}, {'format': 'csv'}),
+]
+
+
+# Pages of per-user objects the sample kwargs cannot point at
+SKIPPED_URLS = {'job_detail', 'job_status', 'job_download'}
+
+
+def default_cases():
+    """(name, url) for every GET-able URL in students/urls.py, plus EXTRA_CASES"""
+    cases = []
+    detail_kwargs = _sample_kwargs()
+    for pattern in student_urls.urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name or pattern.name in SKIPPED_URLS:
+            continue
+        if pattern.pattern.converters:
+            if detail_kwargs is None:
+                continue
+            url = reverse(pattern.name, kwargs=detail_kwargs)
+        else:
+            url = reverse(pattern.name)
+        cases.append((pattern.name, url))
+    for name, url_name, kwargs, params in EXTRA_CASES:
+        params = params() if callable(params) else params
+        if params is None:
+            continue
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        cases.append((name, f'{reverse(url_name, kwargs=kwargs)}?{query}'))
+    return cases
+
+
+class QueryTimer:
+    """An execute_wrapper counting queries and the time spent in them"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+def _fetch(client, url):
+    response = client.get(url)
+    if getattr(response, 'streaming', False):
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    return response.status_code, size
+
+
+def benchmark_url(client, url, repeat=5, warmup=1):
+    """Time one URL; query counts and peak memory come from separate, untimed runs"""
+    for _ in range(warmup):
+        _fetch(client, url)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        status, size = _fetch(client, url)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # The test client closes the connection after every request, which would
+    # empty connection.queries before CaptureQueriesContext could read it
+    queries = QueryTimer()
+    with connection.execute_wrapper(queries):
+        _fetch(client, url)
+
+    tracemalloc.start()
+    try:
+        _fetch(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'url': url,
+        'status': status,
+        'bytes': size,
+        'queries': queries.count,
+        'query_ms': round(queries.seconds * 1000, 2),
+        'wall_ms': {
+            'min': round(min(timings), 2),
+            'median': round(statistics.median(timings), 2),
+            'mean': round(statistics.mean(timings), 2),
+            'max': round(max(timings), 2),
+        },
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def environment():
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'debug': settings.DEBUG,
+        'rows': {
+            'students': Student.objects.count(),
+            'courses': Course.objects.count(),
+            'enrollments': Enrollment.objects.count(),
+            'grades': Grade.objects.count(),
+        },
+    }
+
+
+def benchmark_host():
+    """
+    A Host header ALLOWED_HOSTS accepts: its first entry naming a host, with
+    the subdomain wildcard's leading dot dropped, or localhost for '*'.
+    """
+    for pattern in settings.ALLOWED_HOSTS:
+        host = pattern.lstrip('.')
+        if host and host != '*' and validate_host(host, settings.ALLOWED_HOSTS):
+            return host
+    return 'localhost'
+
+
+def benchmark_client():
+    """A test client logged in as a throwaway superuser; delete the user when done"""
+    user, _ = User.objects.get_or_create(
+        username=BENCH_USERNAME,
+        defaults={'is_staff': True, 'is_superuser': True},
+    )
+    client = Client(HTTP_HOST=benchmark_host())
+    client.force_login(user)
+    return client, user
+
+
+def run(cases=None, repeat=5, warmup=1, only=None):
+    """Benchmark every case and return the JSON-ready report"""
+    client, user = benchmark_client()
+    try:
+        cases = cases if cases is not None else default_cases()
+        results = {}
+        for name, url in cases:
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            results[name] = benchmark_url(client, url, repeat=repeat, warmup=warmup)
+        return {'environment': environment(), 'results': results}
+    finally:
+        user.delete()
+
+
+def compare(baseline, current):
+    """
+    Yield (name, metric, before, after) for each shared result whose median
+    time, query count or peak memory changed.
+    """
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if before is None:
+            continue
+        for metric, old, new in [
+            ('queries', before['queries'], result['queries']),
+            ('median ms', before['wall_ms']['median'], result['wall_ms']['median']),
+            ('peak kb', before['peak_memory_kb'], result['peak_memory_kb']),
+        ]:
+            if old != new:
+                yield name, metric, old, new
+
+
+# Each sync view against its async version in students/async_urls.py
+ASYNC_CASES = [
+    ('dashboard', 'dashboard', 'async_dashboard'),
+    ('student_list', 'student_list', 'async_student_list'),
+    ('grade_list', 'grade_list', 'async_grade_list'),
+]
+
+
+def _latency_summary(timings, elapsed):
+    timings = sorted(timings)
+    return {
+        'requests': len(timings),
+        'requests_per_second': round(len(timings) / elapsed, 1),
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1 if len(timings) > 1 else 0], 2),
+        'max_ms': round(timings[-1], 2),
+    }
+
+
+def _run_sync(url, cookies, host, concurrency, requests):
+    # The test client is not thread-safe: one per worker thread, sharing the session
+    local = threading.local()
+
+    def fetch(_):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client(HTTP_HOST=host)
+            client.cookies.update(cookies)
+        started = time.perf_counter()
+        status, _ = _fetch(client, url)
+        return status, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, range(requests)))
+    return results, time.perf_counter() - started
+
+
+async def _run_async(url, cookies, concurrency, requests):
+    client = AsyncClient()
+    client.cookies.update(cookies)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch():
+        async with slots:
+            started = time.perf_counter()
+            response = await client.get(url)
+            return response.status_code, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(fetch() for _ in range(requests)))
+    return results, time.perf_counter() - started
+
+
+def run_concurrent(cases=None, concurrency=8, requests=80):
+    """
+    Load each sync view and its async version with ``concurrency`` requests
+    in flight and report throughput and latency percentiles for both. Runs
+    in-process through the test clients, so it compares the views and the
+    handlers rather than a WSGI and an ASGI server.
+    """
+    client, user = benchmark_client()
+    host = client.defaults['HTTP_HOST']
+    try:
+        results = {}
+        for name, sync_name, async_name in cases or ASYNC_CASES:
+            sync_url, async_url = reverse(sync_name), reverse(async_name)
+            # Warm the caches and connections both sides rely on
+            _fetch(client, sync_url)
+            _fetch(client, async_url)
+
+            sync_results, sync_elapsed = _run_sync(sync_url, client.cookies, host, concurrency, requests)
+            # AsyncClient always sends Host: testserver
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                async_results, async_elapsed = asyncio.run(
+                    _run_async(async_url, client.cookies, concurrency, requests)
+                )
+            results[name] = {
+                'sync': dict(
+                    _latency_summary([ms for _, ms in sync_results], sync_elapsed),
+                    errors=sum(status != 200 for status, _ in sync_results),
+                ),
+                'async': dict(
+                    _latency_summary([ms for _, ms in async_results], async_elapsed),
+                    errors=sum(status != 200 for status, _ in async_results),
+                ),
+            }
+        return {
+            'environment': environment(),
+            'concurrency': concurrency,
+            'async_query_workers': settings.STUDENTS_ASYNC_QUERY_WORKERS,
+            'results': results,
+        }
+    finally:
+        user.delete()
+        async_views.shutdown_query_pool()
+
+
+# The session and user lookups as stock Django makes them, against the
+# caches in students.sessions and students.auth
+AUTH_CACHE_MODES = {
+    'uncached': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'STUDENTS_USER_CACHE_SECONDS': 0,
+    },
+    'cached': {
+        'SESSION_ENGINE': 'students.sessions',
+        'SESSION_CACHE_ALIAS': 'sessions',
+        'STUDENTS_USER_CACHE_SECONDS': 60,
+    },
+}
+
+
+def run_auth_comparison(cases=None, repeat=5, warmup=1, only=None):
+    """
+    Benchmark every case with the session and user caches off and then on,
+    and report the query count and median time of each side, with the
+    queries the caches saved.
+    """
+    reports = {}
+    for mode, overrides in AUTH_CACHE_MODES.items():
+        invalidate_all_users()
+        with override_settings(**overrides):
+            reports[mode] = run(cases, repeat=repeat, warmup=warmup, only=only)
+
+    results = {}
+    for name, cached in reports['cached']['results'].items():
+        uncached = reports['uncached']['results'][name]
+        results[name] = {
+            'url': cached['url'],
+            'status': cached['status'],
+            'queries': {'uncached': uncached['queries'], 'cached': cached['queries']},
+            'median_ms': {'uncached': uncached['wall_ms']['median'], 'cached': cached['wall_ms']['median']},
+            'saved_queries': uncached['queries'] - cached['queries'],
+        }
+    return {'environment': reports['cached']['environment'], 'results': results}
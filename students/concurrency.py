@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import OperationalError, connection, connections, transaction
+
+from .models import Student
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _write_worker(student_pks, writes, seed, start_at):
+    """
+    One client: read-modify-write transactions against random students,
+    the way a profile edit saves. Returns (latencies, lock errors, finish time).
+    """
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    # Start every worker together so they really contend
+    time.sleep(max(0, start_at - time.time()))
+    for _ in range(writes):
+        pk = rng.choice(student_pks)
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                student = Student.objects.get(pk=pk)
+                student.phone = f'555{rng.randrange(10 ** 7):07d}'
+                student.save(update_fields=['phone', 'updated_at'])
+        except OperationalError:
+            errors += 1
+        else:
+            latencies.append((time.perf_counter() - started) * 1000)
+    finished = time.time()
+    connections.close_all()
+    return latencies, errors, finished
+
+
+def database_profile():
+    """The connection settings in effect, for labelling results"""
+    profile = {
+        'vendor': connection.vendor,
+        'engine': connection.settings_dict['ENGINE'],
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+    }
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {pragma}')
+                profile[pragma] = cursor.fetchone()[0]
+    return profile
+
+
+def run_write_benchmark(workers=8, writes=200, seed=42):
+    """
+    Run ``workers`` processes, each making ``writes`` write transactions at
+    the same time, and report throughput, latency and how many failed with
+    lock errors.
+    """
+    student_pks = list(Student.objects.order_by().values_list('pk', flat=True)[:10000])
+    if not student_pks:
+        raise ValueError('There are no students to update; run seed_bench first.')
+    profile = database_profile()
+
+    # Children must not inherit an open connection
+    connections.close_all()
+    start_at = time.time() + 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        futures = [
+            pool.submit(_write_worker, student_pks, writes, seed + worker, start_at)
+            for worker in range(workers)
+        ]
+        results = [future.result() for future in futures]
+
+    latencies = [latency for worker_latencies, _, _ in results for latency in worker_latencies]
+    errors = sum(worker_errors for _, worker_errors, _ in results)
+    elapsed = max(finished for _, _, finished in results) - start_at
+    report = {
+        'database': profile,
+        'workers': workers,
+        'writes_per_worker': writes,
+        'committed': len(latencies),
+        'lock_errors': errors,
+        'elapsed_s': round(elapsed, 2),
+        'writes_per_s': round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+    }
+    if latencies:
+        report['latency_ms'] = {
+            'median': round(statistics.median(latencies), 2),
+            'p95': round(_percentile(latencies, 0.95), 2),
+            'max': round(max(latencies), 2),
+        }
+    return report
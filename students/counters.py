@@ -0,0 +1,61 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .managers import deferred_bookkeeping
+from .models import Course, Enrollment
+
+
+def _count_subquery(**filters):
+    counts = (
+        Enrollment.objects.filter(course=OuterRef('pk'), **filters)
+        .order_by()
+        .values('course')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def adjust_course_counters(course_id, total=0, active=0):
+    """Apply a +/- change to one course's enrollment counters in a single UPDATE"""
+    pending = deferred_bookkeeping()
+    if pending is not None:
+        if total or active:
+            pending.course_ids.add(course_id)
+        return
+    changes = {}
+    if total:
+        changes['enrollment_count'] = F('enrollment_count') + total
+    if active:
+        changes['active_enrollment_count'] = F('active_enrollment_count') + active
+    if changes:
+        Course.objects.filter(pk=course_id).update(**changes)
+
+
+def recount_courses(course_ids=None):
+    """Recompute enrollment counters from the Enrollment table (all courses if ids is None)"""
+    courses = Course.objects.all()
+    if course_ids is not None:
+        course_ids = {pk for pk in course_ids if pk is not None}
+        if not course_ids:
+            return 0
+        courses = courses.filter(pk__in=course_ids)
+    return courses.update(
+        enrollment_count=_count_subquery(),
+        active_enrollment_count=_count_subquery(is_active=True),
+    )
+
+
+def find_counter_drift():
+    """Return courses whose stored counters disagree with the Enrollment table"""
+    return (
+        Course.objects.annotate(
+            actual_enrollments=Count('enrollments'),
+            actual_active_enrollments=Count('enrollments', filter=Q(enrollments__is_active=True)),
+        )
+        .exclude(
+            enrollment_count=F('actual_enrollments'),
+            active_enrollment_count=F('actual_active_enrollments'),
+        )
+        .order_by('course_code')
+    )
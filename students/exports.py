@@ -0,0 +1,150 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .forms import EnrollmentFilterForm, GradeFilterForm, SearchForm
+from .models import Enrollment, Grade, Student
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+# Spreadsheets run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """A file-like object whose write() just hands the line back to csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+class Export:
+    """
+    A flat projection of one listing.
+
+    ``columns`` pairs each output header with the field path passed to
+    values_list(), so rows are read as tuples without building model
+    instances and only the exported columns are fetched.
+    """
+
+    filter_form = None
+    columns = ()
+    ordering = ()
+
+    def __init__(self, params):
+        self.form = self.filter_form(params)
+
+    def base_queryset(self):
+        raise NotImplementedError
+
+    def queryset(self):
+        queryset = self.form.filter_queryset(self.base_queryset())
+        return queryset.order_by(*self.ordering).values_list(*(path for _, path in self.columns))
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    def rows(self):
+        return self.queryset().iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+class StudentExport(Export):
+    filter_form = SearchForm
+    columns = (
+        ('student_id', 'student_id'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+        ('email', 'email'),
+        ('phone', 'phone'),
+        ('date_of_birth', 'date_of_birth'),
+        ('gender', 'gender'),
+        ('status', 'status'),
+        ('address', 'address'),
+        ('emergency_contact_name', 'emergency_contact_name'),
+        ('emergency_contact_phone', 'emergency_contact_phone'),
+        ('created_at', 'created_at'),
+    )
+    ordering = ('-created_at', '-id')
+
+    def base_queryset(self):
+        return Student.objects.all()
+
+
+class EnrollmentExport(Export):
+    filter_form = EnrollmentFilterForm
+    columns = (
+        ('student_id', 'student__student_id'),
+        ('first_name', 'student__first_name'),
+        ('last_name', 'student__last_name'),
+        ('course_code', 'course__course_code'),
+        ('course_name', 'course__course_name'),
+        ('semester', 'semester'),
+        ('academic_year', 'academic_year'),
+        ('enrollment_date', 'enrollment_date'),
+        ('is_active', 'is_active'),
+    )
+    ordering = ('-enrollment_date', '-id')
+
+    def base_queryset(self):
+        return Enrollment.objects.all()
+
+
+class GradeExport(Export):
+    filter_form = GradeFilterForm
+    columns = (
+        ('student_id', 'enrollment__student__student_id'),
+        ('first_name', 'enrollment__student__first_name'),
+        ('last_name', 'enrollment__student__last_name'),
+        ('course_code', 'enrollment__course__course_code'),
+        ('semester', 'enrollment__semester'),
+        ('academic_year', 'enrollment__academic_year'),
+        ('exam_date', 'exam_date'),
+        ('marks_obtained', 'marks_obtained'),
+        ('total_marks', 'total_marks'),
+        ('percentage', 'percentage_score'),
+        ('grade', 'grade'),
+        ('remarks', 'remarks'),
+    )
+    ordering = ('-exam_date', '-id')
+
+    def base_queryset(self):
+        return Grade.objects.annotate(percentage_score=Grade.percentage_expression())
+
+
+EXPORTS = {
+    'students': StudentExport,
+    'enrollments': EnrollmentExport,
+    'grades': GradeExport,
+}
+
+
+def neutralise_formula(value):
+    """Quote text a spreadsheet would run as a formula, e.g. a name of "=HYPERLINK(...)" """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(export):
+    writer = csv.writer(Echo())
+    yield writer.writerow(export.headers)
+    for row in export.rows():
+        yield writer.writerow([neutralise_formula(value) for value in row])
+
+
+def stream_jsonl(export):
+    headers = export.headers
+    for row in export.rows():
+        yield json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+STREAMERS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+}
@@ -1,7 +1,11 @@
+import copy
+
 from django import forms
+from django.urls import reverse
 from .models import Student, Course, Enrollment, Grade
 from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import AuthenticationForm
+from .search import search_students
 
 
 class LoginForm(AuthenticationForm):
@@ -17,10 +21,40 @@ class LoginForm(AuthenticationForm):
 # ... rest of your forms ...
 
 
+class AutocompleteSelect(forms.Select):
+    """
+    A select for a ModelChoiceField over a large table. Only the selected
+    option is rendered; main.js fetches the others from the JSON endpoint
+    ``url_name`` as the user types. ``select_related`` lists the relations
+    the option label (the model's __str__) reads.
+    """
+    
+    def __init__(self, url_name, select_related=(), attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+        self.select_related = select_related
+    
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(self.url_name)
+        return context
+    
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = [v for v in value if str(v).isdigit()]
+        objects = field.queryset.filter(pk__in=selected).select_related(*self.select_related) if selected else []
+        # Render from a copy: the widget keeps its ModelChoiceIterator for the next render
+        widget = copy.copy(self)
+        widget.choices = [('', field.empty_label or '')] + [
+            (field.prepare_value(obj), field.label_from_instance(obj)) for obj in objects
+        ]
+        return forms.Select.optgroups(widget, name, value, attrs)
+
 class StudentForm(forms.ModelForm):
     class Meta:
         model = Student
-        fields = '__all__'
+        # Kept by the thumbnail generator, not edited
+        exclude = ['has_thumbnails']
         widgets = {
             'date_of_birth': forms.DateInput(attrs={'type': 'date'}),
             'address': forms.Textarea(attrs={'rows': 3}),
@@ -55,6 +89,8 @@ class EnrollmentForm(forms.ModelForm):
         model = Enrollment
         fields = '__all__'
         widgets = {
+            'student': AutocompleteSelect('api_student_autocomplete'),
+            'course': AutocompleteSelect('api_course_autocomplete'),
             'enrollment_date': forms.DateInput(attrs={'type': 'date'}),
         }
 
@@ -63,10 +99,16 @@ class GradeForm(forms.ModelForm):
         model = Grade
         fields = '__all__'
         widgets = {
+            'enrollment': AutocompleteSelect('api_enrollment_autocomplete', select_related=('student', 'course')),
             'exam_date': forms.DateInput(attrs={'type': 'date'}),
             'remarks': forms.Textarea(attrs={'rows': 3}),
         }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['grade'].required = False
+        self.fields['grade'].help_text = 'Leave blank to derive the grade from the marks.'
+    
     def clean_marks_obtained(self):
         marks = self.cleaned_data.get('marks_obtained')
         total_marks = self.cleaned_data.get('total_marks', 100)
@@ -75,6 +117,14 @@ class GradeForm(forms.ModelForm):
             raise ValidationError(f'Marks obtained cannot exceed total marks ({total_marks}).')
         
         return marks
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        marks = cleaned_data.get('marks_obtained')
+        total_marks = cleaned_data.get('total_marks')
+        if not cleaned_data.get('grade') and marks is not None and total_marks:
+            cleaned_data['grade'] = Grade.letter_for_percentage(marks / total_marks * 100)
+        return cleaned_data
 
 class LoginForm(AuthenticationForm):
     username = forms.CharField(widget=forms.TextInput(attrs={
@@ -98,4 +148,170 @@ class SearchForm(forms.Form):
         required=False,
         choices=[('', 'All Status')] + Student.STATUS_CHOICES,
         widget=forms.Select(attrs={'class': 'form-control'})
-    )
\ No newline at end of file
+    )
+    
+    def filter_queryset(self, queryset):
+        """Apply the submitted search and status filters to a Student queryset"""
+        if not self.is_valid():
+            return queryset
+        
+        query = self.cleaned_data.get('query')
+        status = self.cleaned_data.get('status')
+        
+        if query:
+            queryset = search_students(queryset, query)
+        if status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+class GradeFilterForm(forms.Form):
+    course = forms.ModelChoiceField(
+        required=False,
+        queryset=Course.objects.only('id', 'course_code', 'course_name').order_by('course_code'),
+        empty_label='All Courses',
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    semester = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All Semesters')] + Enrollment.SEMESTER_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    academic_year = forms.CharField(
+        required=False,
+        max_length=9,
+        widget=forms.TextInput(attrs={
+            'placeholder': 'Academic Year',
+            'class': 'form-control'
+        })
+    )
+    grade = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All Grades')] + [(letter, letter) for letter, _ in Grade.GRADE_CHOICES],
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    def filter_queryset(self, queryset):
+        """Apply the submitted filters to a Grade queryset"""
+        if not self.is_valid():
+            return queryset
+        
+        course = self.cleaned_data.get('course')
+        semester = self.cleaned_data.get('semester')
+        academic_year = self.cleaned_data.get('academic_year')
+        grade_letter = self.cleaned_data.get('grade')
+        
+        if course:
+            queryset = queryset.filter(enrollment__course=course)
+        if semester:
+            queryset = queryset.filter(enrollment__semester=semester)
+        if academic_year:
+            queryset = queryset.filter(enrollment__academic_year=academic_year)
+        if grade_letter:
+            queryset = queryset.filter(grade=grade_letter)
+        return queryset
+
+
+class EnrollmentFilterForm(forms.Form):
+    semester = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All Semesters')] + Enrollment.SEMESTER_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    academic_year = forms.CharField(
+        required=False,
+        max_length=9,
+        widget=forms.TextInput(attrs={
+            'placeholder': 'Academic Year (e.g., 2023-2024)',
+            'class': 'form-control'
+        })
+    )
+    status = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All Status'), ('active', 'Active'), ('inactive', 'Inactive')],
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    def filter_queryset(self, queryset):
+        """Apply the submitted filters to an Enrollment queryset"""
+        if not self.is_valid():
+            return queryset
+        
+        semester = self.cleaned_data.get('semester')
+        academic_year = self.cleaned_data.get('academic_year')
+        status = self.cleaned_data.get('status')
+        
+        if semester:
+            queryset = queryset.filter(semester=semester)
+        if academic_year:
+            queryset = queryset.filter(academic_year=academic_year)
+        if status:
+            queryset = queryset.filter(is_active=(status == 'active'))
+        return queryset
+
+
+class GradebookSectionForm(forms.Form):
+    course = forms.ModelChoiceField(
+        queryset=Course.objects.only('id', 'course_code', 'course_name').order_by('course_code'),
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    semester = forms.ChoiceField(
+        choices=Enrollment.SEMESTER_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    academic_year = forms.CharField(
+        max_length=9,
+        widget=forms.TextInput(attrs={
+            'placeholder': 'Academic Year (e.g., 2023-2024)',
+            'class': 'form-control'
+        })
+    )
+    exam_date = forms.DateField(
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'})
+    )
+    total_marks = forms.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        min_value=1,
+        max_value=100,
+        initial=100,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'})
+    )
+
+
+class GradebookForm(forms.Form):
+    """One marks field and one remarks field per enrollment of a section"""
+    
+    def __init__(self, *args, enrollments, total_marks, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enrollments = enrollments
+        self.total_marks = total_marks
+        for enrollment in enrollments:
+            self.fields[f'marks_{enrollment.pk}'] = forms.DecimalField(
+                required=False,
+                max_digits=5,
+                decimal_places=2,
+                min_value=0,
+                max_value=total_marks,
+                widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'step': '0.01'})
+            )
+            self.fields[f'remarks_{enrollment.pk}'] = forms.CharField(
+                required=False,
+                widget=forms.TextInput(attrs={'class': 'form-control form-control-sm'})
+            )
+    
+    def rows(self):
+        """(enrollment, marks field, remarks field) for each row of the grid"""
+        return [
+            (enrollment, self[f'marks_{enrollment.pk}'], self[f'remarks_{enrollment.pk}'])
+            for enrollment in self.enrollments
+        ]
+    
+    def entered_marks(self):
+        return {
+            enrollment.pk: self.cleaned_data[f'marks_{enrollment.pk}']
+            for enrollment in self.enrollments
+            if self.cleaned_data.get(f'marks_{enrollment.pk}') is not None
+        }
+    
+    def entered_remarks(self):
+        return {pk: self.cleaned_data[f'remarks_{pk}'] for pk in self.entered_marks()}
@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Enrollment, Grade
+
+
+def derive_letters(marks, total_marks):
+    """
+    Letters for a list of Decimal marks out of ``total_marks``, worked out
+    exactly as GradeForm and the importer do, so a boundary mark such as
+    97/194 gets the same letter whichever way it is entered.
+    """
+    return [Grade.letter_for_percentage(mark / total_marks * 100) for mark in marks]
+
+
+def section_enrollments(course, semester, academic_year):
+    """Every enrollment in one course section, with its student, in one query"""
+    return list(
+        Enrollment.objects.filter(course=course, semester=semester, academic_year=academic_year)
+        .select_related('student')
+        .order_by('student__last_name', 'student__first_name', 'pk')
+    )
+
+
+def existing_grades(enrollments, exam_date):
+    """The grade already recorded for each enrollment on this exam date, by enrollment id"""
+    grades = Grade.objects.filter(
+        enrollment__in=[enrollment.pk for enrollment in enrollments],
+        exam_date=exam_date,
+    ).order_by('pk')
+    return {grade.enrollment_id: grade for grade in grades}
+
+
+def save_grades(enrollments, exam_date, total_marks, marks, remarks=None):
+    """
+    Record one exam for a section.
+
+    ``marks`` maps enrollment ids to marks obtained; enrollments missing from
+    it are left alone. Grades already recorded for that exam date are
+    updated, the rest are created, all in one transaction. Returns
+    (created, updated).
+    """
+    remarks = remarks or {}
+    enrollment_ids = [enrollment.pk for enrollment in enrollments if enrollment.pk in marks]
+    letters = derive_letters([marks[pk] for pk in enrollment_ids], total_marks)
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = existing_grades(enrollments, exam_date)
+        to_create, to_update = [], []
+        for enrollment_id, letter in zip(enrollment_ids, letters):
+            grade = existing.get(enrollment_id)
+            if grade is None:
+                grade = Grade(enrollment_id=enrollment_id, exam_date=exam_date)
+                to_create.append(grade)
+            else:
+                # bulk_update() does not apply auto_now
+                grade.updated_at = now
+                to_update.append(grade)
+            grade.marks_obtained = marks[enrollment_id]
+            grade.total_marks = total_marks
+            grade.grade = letter
+            if enrollment_id in remarks:
+                grade.remarks = remarks[enrollment_id]
+
+        Grade.objects.bulk_create(to_create, batch_size=500)
+        Grade.objects.bulk_update(
+            to_update, ['marks_obtained', 'total_marks', 'grade', 'remarks', 'updated_at'], batch_size=500
+        )
+    return len(to_create), len(to_update)
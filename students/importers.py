@@ -0,0 +1,297 @@
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .models import Course, Enrollment, Grade, Student
+
+
+def read_records(stream, fmt):
+    """Yield (line_number, record) pairs from a CSV or JSON Lines stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_number, ValidationError(f'Invalid JSON: {exc}')
+                continue
+            if not isinstance(record, dict):
+                yield line_number, ValidationError('Each line must be a JSON object.')
+                continue
+            yield line_number, record
+    else:
+        raise ValueError(f'Unsupported format: {fmt}')
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in ('', None) else value
+
+
+def _text(record, name):
+    """A natural-key value from a record, as the string stored in the database"""
+    value = _clean(record.get(name))
+    return None if value is None else str(value)
+
+
+class Importer:
+    """
+    Validate and insert one batch of records at a time.
+
+    Subclasses name the model, the plain fields a record may set, and how to
+    resolve lookups and uniqueness for a whole batch in a few set-based
+    queries (instead of one exists() per record as the forms do).
+    """
+
+    model = None
+    fields = ()
+    exclude_from_clean = ()
+
+    def build(self, record):
+        """Return (instance, fields that failed to convert, messages)"""
+        obj, failed, messages = self.model(), [], []
+        for name in self.fields:
+            value = _clean(record.get(name))
+            if value is None:
+                continue
+            field = self.model._meta.get_field(name)
+            try:
+                setattr(obj, field.attname, field.to_python(value))
+            except ValidationError as exc:
+                failed.append(name)
+                messages += [f'{name}: {message}' for message in exc.messages]
+        return obj, failed, messages
+
+    def resolve(self, batch):
+        """Run the batch's lookup queries; called once before check()"""
+
+    def check(self, record, obj):
+        """Return a list of error messages for lookups and uniqueness"""
+        return []
+
+    def reserve(self, obj):
+        """Claim a valid row's unique values, so later rows of the batch cannot reuse them"""
+
+    def validate(self, batch):
+        """Return ([(line, record, obj)] to insert, [(line, record, messages)])"""
+        self.resolve(batch)
+        valid, errors = [], []
+        for line_number, record in batch:
+            if isinstance(record, ValidationError):
+                errors.append((line_number, {}, record.messages))
+                continue
+            obj, failed, messages = self.build(record)
+            messages += self.check(record, obj)
+            try:
+                obj.full_clean(
+                    exclude=list(self.exclude_from_clean) + failed,
+                    validate_unique=False,
+                    validate_constraints=False,
+                )
+            except ValidationError as exc:
+                messages += [
+                    f'{field}: {message}'
+                    for field, field_messages in exc.message_dict.items()
+                    for message in field_messages
+                ]
+            if messages:
+                errors.append((line_number, record, messages))
+            else:
+                # Only rows that will be inserted claim their unique values
+                self.reserve(obj)
+                valid.append((line_number, record, obj))
+        return valid, errors
+
+    def insert(self, objs):
+        with transaction.atomic():
+            self.model.objects.bulk_create(objs)
+
+
+class StudentImporter(Importer):
+    model = Student
+    fields = (
+        'student_id', 'first_name', 'last_name', 'email', 'phone', 'address',
+        'date_of_birth', 'gender', 'status', 'emergency_contact_name',
+        'emergency_contact_phone',
+    )
+    exclude_from_clean = ('profile_picture',)
+
+    def resolve(self, batch):
+        records = [record for _, record in batch if isinstance(record, dict)]
+        student_ids = {_text(record, 'student_id') for record in records}
+        emails = {_text(record, 'email') for record in records}
+        existing = list(Student.objects.filter(
+            Q(student_id__in=student_ids) | Q(email__in=emails)
+        ).values_list('student_id', 'email'))
+        self.taken_ids = {student_id for student_id, _ in existing}
+        self.taken_emails = {email for _, email in existing}
+
+    def check(self, record, obj):
+        errors = []
+        if obj.student_id in self.taken_ids:
+            errors.append('student_id: Student ID already exists.')
+        if obj.email in self.taken_emails:
+            errors.append('email: Email already exists.')
+        return errors
+
+    def reserve(self, obj):
+        if obj.student_id:
+            self.taken_ids.add(obj.student_id)
+        if obj.email:
+            self.taken_emails.add(obj.email)
+
+
+class CourseImporter(Importer):
+    model = Course
+    fields = (
+        'course_code', 'course_name', 'description', 'credits', 'level',
+        'duration_months', 'fee', 'is_active',
+    )
+
+    def resolve(self, batch):
+        codes = {_text(record, 'course_code') for _, record in batch if isinstance(record, dict)}
+        self.taken_codes = set(Course.objects.filter(course_code__in=codes).values_list('course_code', flat=True))
+
+    def check(self, record, obj):
+        errors = []
+        if obj.course_code in self.taken_codes:
+            errors.append('course_code: Course code already exists.')
+        return errors
+
+    def reserve(self, obj):
+        if obj.course_code:
+            self.taken_codes.add(obj.course_code)
+
+
+class EnrollmentImporter(Importer):
+    """Enrollments refer to students and courses by student_id and course_code"""
+
+    model = Enrollment
+    fields = ('semester', 'academic_year', 'is_active')
+    exclude_from_clean = ('student', 'course')
+
+    def resolve(self, batch):
+        records = [record for _, record in batch if isinstance(record, dict)]
+        self.students = dict(Student.objects.filter(
+            student_id__in={_text(record, 'student_id') for record in records}
+        ).values_list('student_id', 'pk'))
+        self.courses = dict(Course.objects.filter(
+            course_code__in={_text(record, 'course_code') for record in records}
+        ).values_list('course_code', 'pk'))
+        self.taken = set(Enrollment.objects.filter(
+            student_id__in=self.students.values(),
+            course_id__in=self.courses.values(),
+        ).values_list('student_id', 'course_id', 'semester', 'academic_year'))
+
+    def check(self, record, obj):
+        errors = []
+        student_id = _text(record, 'student_id')
+        course_code = _text(record, 'course_code')
+        if student_id not in self.students:
+            errors.append(f'student_id: No student with ID {student_id!r}.')
+        if course_code not in self.courses:
+            errors.append(f'course_code: No course with code {course_code!r}.')
+        if errors:
+            return errors
+
+        obj.student_id = self.students[student_id]
+        obj.course_id = self.courses[course_code]
+        key = (obj.student_id, obj.course_id, obj.semester, obj.academic_year)
+        if key in self.taken:
+            errors.append('This student is already enrolled in this course for that semester and year.')
+        return errors
+
+    def reserve(self, obj):
+        self.taken.add((obj.student_id, obj.course_id, obj.semester, obj.academic_year))
+
+
+class GradeImporter(Importer):
+    """
+    Grades refer to their enrollment by student_id, course_code, semester and
+    academic_year. A missing grade letter is derived from the marks.
+    """
+
+    model = Grade
+    fields = ('marks_obtained', 'total_marks', 'grade', 'remarks', 'exam_date')
+    exclude_from_clean = ('enrollment',)
+    key_fields = ('student_id', 'course_code', 'semester', 'academic_year')
+
+    def _key(self, record):
+        return tuple(_text(record, field) for field in self.key_fields)
+
+    def resolve(self, batch):
+        keys = {self._key(record) for _, record in batch if isinstance(record, dict)}
+        enrollments = Enrollment.objects.filter(
+            student__student_id__in={key[0] for key in keys},
+            course__course_code__in={key[1] for key in keys},
+            semester__in={key[2] for key in keys},
+            academic_year__in={key[3] for key in keys},
+        ).values_list('pk', 'student__student_id', 'course__course_code', 'semester', 'academic_year')
+        self.enrollments = {tuple(row[1:]): row[0] for row in enrollments}
+
+    def check(self, record, obj):
+        key = self._key(record)
+        if key not in self.enrollments:
+            return ['No enrollment for %s in %s (%s %s).' % key]
+        obj.enrollment_id = self.enrollments[key]
+        marks, total = obj.marks_obtained, obj.total_marks
+        if marks is None or not total:
+            return []
+        if marks > total:
+            return [f'marks_obtained: Marks obtained cannot exceed total marks ({total}).']
+        if not obj.grade:
+            obj.grade = Grade.letter_for_percentage(marks / total * 100)
+        return []
+
+
+IMPORTERS = {
+    'students': StudentImporter,
+    'courses': CourseImporter,
+    'enrollments': EnrollmentImporter,
+    'grades': GradeImporter,
+}
+
+
+def import_records(records, importer, batch_size=1000, error_writer=None, dry_run=False):
+    """
+    Validate and insert records batch by batch. Returns (inserted, failed).
+
+    Only one batch is held in memory at a time; each batch is inserted in
+    its own transaction, so a failure never rolls back earlier batches.
+    """
+    inserted = failed = 0
+    for batch in batched(records, batch_size):
+        valid, errors = importer.validate(batch)
+        if valid and not dry_run:
+            try:
+                importer.insert([obj for _, _, obj in valid])
+            except IntegrityError as exc:
+                # Lost a race with a concurrent writer; nothing from this batch was saved
+                errors += [(line_number, record, [f'Batch rejected: {exc}']) for line_number, record, _ in valid]
+                valid = []
+        inserted += len(valid)
+        failed += len(errors)
+        if error_writer is not None:
+            for line_number, record, messages in errors:
+                error_writer.writerow([line_number, '; '.join(messages), json.dumps(record, default=str)])
+    return inserted, failed
@@ -0,0 +1,287 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a view makes more queries than its budget"""
+
+
+class Histogram:
+    """Observation counts per bucket, in the layout Prometheus expects"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        # A value equal to a bound belongs to that bound's bucket (le="bound")
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """(upper bound, observations at or below it), ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    """
+    Process-wide metrics. Histograms are cumulative, as Prometheus expects:
+    windows and rates are computed at query time with rate() and
+    histogram_quantile(). Every worker process keeps its own registry.
+    """
+
+    HISTOGRAMS = {
+        'students_request_duration_seconds': ('Time spent handling the request.', LATENCY_BUCKETS),
+        'students_request_db_seconds': ('Time spent in SQL queries.', LATENCY_BUCKETS),
+        'students_request_template_seconds': ('Time spent rendering templates.', LATENCY_BUCKETS),
+        'students_request_queries': ('SQL queries made by the request.', QUERY_BUCKETS),
+    }
+    COUNTERS = {
+        'students_requests_total': 'Requests handled, by view and status code.',
+        'students_query_budget_exceeded_total': 'Requests that made more queries than their view allows.',
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {name: {} for name in self.HISTOGRAMS}
+            self.counters = {name: {} for name in self.COUNTERS}
+
+    def observe(self, name, labels, value):
+        with self.lock:
+            histograms = self.histograms[name]
+            if labels not in histograms:
+                histograms[labels] = Histogram(self.HISTOGRAMS[name][1])
+            histograms[labels].observe(value)
+
+    def increment(self, name, labels):
+        with self.lock:
+            counter = self.counters[name]
+            counter[labels] = counter.get(labels, 0) + 1
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for labels, histogram in sorted(self.histograms[name].items()):
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{_labels(labels + (("le", bound),))} {total}')
+                    lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+                    lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+            for name, help_text in self.COUNTERS.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for labels, value in sorted(self.counters[name].items()):
+                    lines.append(f'{name}{_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    def escape(value):
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels) + '}'
+
+
+registry = Registry()
+
+
+class RequestMetrics:
+    """What one request has spent so far"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0
+        self.template_seconds = 0
+        self.budget = None
+        # Async views run some of their queries in worker threads
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed as an execute_wrapper on every database connection.
+        # Concurrent async requests can share a worker thread and so a
+        # connection; each only counts the queries made in its own context.
+        if _current.get() is not self:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.db_seconds += elapsed
+                self.queries += 1
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+@contextmanager
+def recording_queries():
+    """
+    Count the queries made on this thread's connections towards the current
+    request, e.g. in a worker thread running part of an async view.
+    """
+    metrics = _current.get()
+    with ExitStack() as stack:
+        if metrics is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+        yield
+
+
+def query_budget(max_queries):
+    """
+    Declare the most queries a view may make, counting the session and user
+    lookups as if their caches were cold or off. Going over logs a warning,
+    or raises QueryBudgetExceeded when STUDENTS_QUERY_BUDGET_STRICT is on.
+    """
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
+
+
+class InstrumentationMiddleware:
+    """
+    Record query count, DB time, template time and latency for every
+    request, labelled by view, and enforce query budgets.
+
+    Keep it first in MIDDLEWARE so the session and authentication queries
+    are counted. Queries made while a streaming response is consumed happen
+    after the middleware returns and are not counted. It runs natively
+    under both WSGI and ASGI, so async views are not adapted to sync.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with recording_queries():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        # The session, the user and the async views' sync_to_async calls all
+        # query from the request's thread-sensitive worker thread, so count
+        # the queries made there rather than on the event loop's thread
+        queries = ExitStack()
+        try:
+            await sync_to_async(queries.enter_context)(recording_queries())
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(queries.close)()
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, metrics, elapsed):
+        view = _view_label(request)
+        labels = (('view', view),)
+        registry.observe('students_request_duration_seconds', labels, elapsed)
+        registry.observe('students_request_db_seconds', labels, metrics.db_seconds)
+        registry.observe('students_request_template_seconds', labels, metrics.template_seconds)
+        registry.observe('students_request_queries', labels, metrics.queries)
+        registry.increment('students_requests_total', labels + (('status', response.status_code),))
+
+        if metrics.budget is not None and metrics.queries > metrics.budget:
+            registry.increment('students_query_budget_exceeded_total', labels)
+            message = '%s made %d queries, over its budget of %d' % (view, metrics.queries, metrics.budget)
+            if getattr(settings, 'STUDENTS_QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.budget = getattr(view_func, 'query_budget', None)
+
+
+def _view_label(request):
+    # Label by route name rather than path so the number of series stays bounded
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics = _current.get()
+            if metrics is not None:
+                with metrics.lock:
+                    metrics.template_seconds += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, timing each top-level render for
+    InstrumentationMiddleware. Included templates are part of their
+    parent's render and are not counted twice.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, only answered for STUDENTS_METRICS_ALLOWED_IPS"""
+    if request.META.get('REMOTE_ADDR') not in settings.STUDENTS_METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,274 @@
+"""
+Background jobs without a broker. Job rows are the queue: the web process
+enqueues them and `manage.py run_workers` claims and runs them in a pool of
+threads or processes. Failed attempts are retried with exponential backoff,
+and a job can leave a result file behind for the user to download.
+"""
+import logging
+import os
+import signal
+import socket
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image
+
+from .exports import EXPORT_FORMATS, EXPORTS, STREAMERS
+from .models import Job, Student
+from .thumbnails import make_thumbnails
+from .transcripts import compute_all_transcripts, write_transcript_report
+
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+# Queued jobs looked at per claim attempt; another worker may win any of them
+CLAIM_CANDIDATES = 5
+# Seconds between each worker's sweeps for jobs abandoned by a dead worker
+REQUEUE_INTERVAL = 60
+
+
+class UnknownJobKind(Exception):
+    """Raised when enqueuing a kind no handler is registered for"""
+
+
+def job_handler(kind):
+    """
+    Register ``func(job)`` as the handler for jobs of ``kind``. It returns a
+    JSON-serializable summary stored on Job.result, and may attach a file
+    with attach_result_file().
+    """
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, params=None, user=None, max_attempts=None):
+    if kind not in HANDLERS:
+        raise UnknownJobKind(kind)
+    return Job.objects.create(
+        kind=kind,
+        params=params or {},
+        created_by=user,
+        max_attempts=max_attempts or settings.STUDENTS_JOB_MAX_ATTEMPTS,
+    )
+
+
+def attach_result_file(job, filename, content):
+    """Store ``content`` (a file object) as the job's downloadable result"""
+    job.result_file.save(filename, File(content), save=False)
+
+
+def claim_job(worker_id):
+    """
+    Mark the oldest due job as running for this worker and return it, or
+    None when there is nothing to do.
+
+    Claiming is a conditional UPDATE, so two workers racing for the same row
+    cannot both win, on any database.
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status=Job.QUEUED, run_after__lte=now)
+        .order_by('run_after', 'id')
+        .values_list('pk', flat=True)[:CLAIM_CANDIDATES]
+    )
+    for pk in candidates:
+        claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _finish(job, **fields):
+    # Only the worker still holding the lock may record the outcome: a job
+    # requeued as stale may already be running elsewhere
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        locked_by='', locked_at=None, **fields,
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.STUDENTS_JOB_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def run_job(job):
+    """Run one claimed job and record whether it succeeded"""
+    handler = HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise UnknownJobKind(job.kind)
+        result = handler(job)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            logger.warning('Job %s failed on attempt %d of %d, retrying', job, job.attempts, job.max_attempts)
+            _finish(job, status=Job.QUEUED, run_after=now + retry_delay(job.attempts), error=error)
+        else:
+            logger.error('Job %s failed on its last attempt', job)
+            _finish(job, status=Job.FAILED, finished_at=now, error=error)
+        return False
+
+    _finish(
+        job,
+        status=Job.SUCCEEDED,
+        result=result,
+        result_file=job.result_file.name or '',
+        error='',
+        finished_at=timezone.now(),
+    )
+    return True
+
+
+def requeue_stale_jobs(timeout=None):
+    """
+    Put back jobs whose worker died mid-run: running for longer than
+    STUDENTS_JOB_TIMEOUT seconds. Those out of attempts are failed instead.
+    """
+    timeout = settings.STUDENTS_JOB_TIMEOUT if timeout is None else timeout
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, locked_by='', locked_at=None, finished_at=now, error='Worker stopped responding.',
+    )
+    requeued = stale.update(status=Job.QUEUED, locked_by='', locked_at=None, run_after=now)
+    return requeued, failed
+
+
+def work(worker_id, stop, poll_interval=1.0, burst=False):
+    """
+    Claim and run jobs until ``stop`` is set, or with ``burst`` until the
+    queue is empty. Returns the number of jobs run.
+    """
+    processed = 0
+    next_requeue = time.monotonic() + REQUEUE_INTERVAL
+    while not stop.is_set():
+        if time.monotonic() >= next_requeue:
+            # A worker that died mid-job leaves it RUNNING until someone sweeps
+            requeue_stale_jobs()
+            next_requeue = time.monotonic() + REQUEUE_INTERVAL
+        job = claim_job(worker_id)
+        if job is None:
+            close_old_connections()
+            if burst:
+                break
+            stop.wait(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+        # Workers see no request_finished signal; retire connections here
+        close_old_connections()
+    return processed
+
+
+def _worker_id(number):
+    return f'{socket.gethostname()}:{os.getpid()}:{number}'
+
+
+def _thread_worker(number, stop, poll_interval, burst):
+    try:
+        return work(_worker_id(number), stop, poll_interval, burst)
+    finally:
+        connections.close_all()
+
+
+_process_stop = None
+
+
+def _init_process(stop):
+    global _process_stop
+    django.setup()
+    _process_stop = stop
+    # The parent handles Ctrl-C and sets ``stop``, so a job is never cut off halfway
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _process_worker(number, poll_interval, burst):
+    return _thread_worker(number, _process_stop, poll_interval, burst)
+
+
+def run_workers(stop, workers=2, mode='thread', poll_interval=1.0, burst=False):
+    """
+    Run ``workers`` job loops in threads or processes until ``stop`` is set,
+    and return the number of jobs run. ``stop`` must be a
+    multiprocessing.Event in process mode.
+    """
+    requeue_stale_jobs()
+    if mode == 'process':
+        # Children must open their own connections, not share the parent's
+        connections.close_all()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_process, initargs=(stop,))
+        futures = [pool.submit(_process_worker, number, poll_interval, burst) for number in range(workers)]
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='students-jobs')
+        futures = [pool.submit(_thread_worker, number, stop, poll_interval, burst) for number in range(workers)]
+    with pool:
+        return sum(future.result() for future in futures)
+
+
+@job_handler('export')
+def export_job(job):
+    """A full export to a file, for listings too large to stream in a request"""
+    export_type, fmt = job.params['export_type'], job.params.get('format', 'csv')
+    if export_type not in EXPORTS or fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown export {export_type}.{fmt}')
+    export = EXPORTS[export_type](job.params.get('filters', {}))
+
+    with tempfile.TemporaryFile('w+b') as f:
+        for line in STREAMERS[fmt](export):
+            f.write(line.encode('utf-8'))
+        size = f.tell()
+        f.seek(0)
+        attach_result_file(job, f'{export_type}-{timezone.localdate():%Y%m%d}.{fmt}', f)
+    return {'bytes': size}
+
+
+@job_handler('transcripts')
+def transcripts_job(job):
+    """Recompute and store every transcript, optionally writing the GPA report"""
+    chunk_size = job.params.get('chunk_size', 5000)
+    if not job.params.get('report'):
+        return {'transcripts': compute_all_transcripts(chunk_size=chunk_size)}
+
+    with tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as f:
+        count = write_transcript_report(f, chunk_size=chunk_size)
+        f.seek(0)
+        attach_result_file(job, f'transcripts-{timezone.localdate():%Y%m%d}.csv', f)
+    return {'transcripts': count}
+
+
+@job_handler('thumbnails')
+def thumbnails_job(job):
+    """Rebuild profile picture thumbnails, by default only the missing ones"""
+    students = Student.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+    if job.params.get('missing_only', True):
+        students = students.filter(has_thumbnails=False)
+    names = list(students.order_by().values_list('profile_picture', flat=True).distinct())
+    regenerated, errors = 0, {}
+    for name in names:
+        try:
+            make_thumbnails(name)
+        except (OSError, Image.DecompressionBombError) as exc:
+            errors[name] = str(exc)
+        else:
+            regenerated += 1
+        Student.objects.filter(profile_picture=name).update(has_thumbnails=name not in errors)
+    return {'regenerated': regenerated, 'errors': errors}
@@ -0,0 +1,41 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from students import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput and latency of the sync views and their async versions under concurrent load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once (default: 8).')
+        parser.add_argument('--requests', type=int, default=80, help='Requests per view and side (default: 80).')
+        parser.add_argument('--output', help='Write the JSON report to this path.')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be at least 1.')
+        if not settings.STUDENTS_ASYNC_VIEWS:
+            raise CommandError('The async views are not mounted; set STUDENTS_ASYNC_VIEWS=True.')
+
+        report = benchmarks.run_concurrent(concurrency=options['concurrency'], requests=options['requests'])
+
+        rows = report['environment']['rows']
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in rows.items()))
+        self.stdout.write(
+            f'concurrency {report["concurrency"]}, {report["async_query_workers"]} async query workers'
+        )
+        self.stdout.write(f'{"case":<16} {"side":<6} {"req/s":>7} {"p50 ms":>9} {"p95 ms":>9} {"max ms":>9} {"errors":>6}')
+        for name, sides in report['results'].items():
+            for side, result in sides.items():
+                self.stdout.write(
+                    f'{name:<16} {side:<6} {result["requests_per_second"]:>7} {result["p50_ms"]:>9} '
+                    f'{result["p95_ms"]:>9} {result["max_ms"]:>9} {result["errors"]:>6}'
+                )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}.'))
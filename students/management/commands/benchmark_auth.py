@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Compare every students URL with the session and user caches off and on'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per URL and side (default: 5).')
+        parser.add_argument('--warmup', type=int, default=1, help='Untimed requests per URL first (default: 1).')
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            metavar='NAME',
+            help='Only benchmark cases whose name starts with one of these.',
+        )
+        parser.add_argument('--output', help='Write the JSON report to this path.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+
+        report = benchmarks.run_auth_comparison(
+            repeat=options['repeat'], warmup=options['warmup'], only=options['only'],
+        )
+
+        rows = report['environment']['rows']
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in rows.items()))
+        self.stdout.write(
+            f'{"case":<28} {"status":>6} {"queries":>7} {"cached":>7} {"saved":>6} {"median ms":>10} {"cached":>8}'
+        )
+        for name, result in report['results'].items():
+            queries, median = result['queries'], result['median_ms']
+            self.stdout.write(
+                f'{name:<28} {result["status"]:>6} {queries["uncached"]:>7} {queries["cached"]:>7} '
+                f'{result["saved_queries"]:>6} {median["uncached"]:>10} {median["cached"]:>8}'
+            )
+
+        saved = [result['saved_queries'] for result in report['results'].values()]
+        if saved:
+            self.stdout.write(f'Saved {min(saved)} to {max(saved)} queries per page.')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}.'))
@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.concurrency import run_write_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Measure write throughput and lock errors under parallel clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Parallel client processes (default: 8).')
+        parser.add_argument('--writes', type=int, default=200, help='Write transactions per client (default: 200).')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42).')
+        parser.add_argument('--output', help='Write the JSON report to this path.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['writes'] < 1:
+            raise CommandError('--workers and --writes must be at least 1.')
+        try:
+            report = run_write_benchmark(options['workers'], options['writes'], options['seed'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        database = report['database']
+        self.stdout.write(', '.join(f'{key}={value}' for key, value in database.items()))
+        self.stdout.write(
+            f'{report["workers"]} workers x {report["writes_per_worker"]} writes: '
+            f'{report["committed"]} committed, {report["lock_errors"]} lock errors '
+            f'in {report["elapsed_s"]}s ({report["writes_per_s"]} writes/s)'
+        )
+        if 'latency_ms' in report:
+            latency = report['latency_ms']
+            self.stdout.write(f'latency ms: median {latency["median"]}, p95 {latency["p95"]}, max {latency["max"]}')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}.'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from students.query_plans import check_views
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on every query the main views make and fail on full table or index scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--show-plans',
+            action='store_true',
+            help='Print the plan of every query, not just the failing ones.',
+        )
+
+    def handle(self, *args, **options):
+        failures = 0
+        for label, sql, plan, scans in check_views():
+            if sql is None:
+                self.stdout.write(self.style.WARNING(f'{label}: skipped (no data to check against)'))
+                continue
+            if scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'{label}: full scan of {", ".join(scans)}'))
+            elif not options['show_plans']:
+                continue
+            else:
+                self.stdout.write(f'{label}:')
+            self.stdout.write(f'    {sql}')
+            for line in plan:
+                self.stdout.write(f'    | {line}')
+
+        if failures:
+            raise CommandError(f'{failures} quer{"y" if failures == 1 else "ies"} read a whole table or index without a LIMIT.')
+        self.stdout.write(self.style.SUCCESS('Every checked query uses an index.'))
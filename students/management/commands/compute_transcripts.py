@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from students.transcripts import compute_all_transcripts, write_transcript_report
+
+
+class Command(BaseCommand):
+    help = 'Compute credit-weighted GPAs for all students and store their transcripts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows fetched, and transcripts stored, per round trip (default: 5000).',
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write a CSV of student ID, GPA and credits per semester to this path.',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        chunk_size = options['chunk_size']
+
+        if options['output']:
+            count = self.write_report(options['output'], chunk_size)
+        else:
+            count = compute_all_transcripts(chunk_size=chunk_size)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Computed {count} transcripts in {elapsed:.1f}s.'))
+
+    def write_report(self, path, chunk_size):
+        with open(path, 'w', newline='', encoding='utf-8') as report:
+            return write_transcript_report(report, chunk_size=chunk_size)
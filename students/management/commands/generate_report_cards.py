@@ -0,0 +1,57 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.models import Enrollment
+from students.report_cards import generate_report_cards, report_card_dir
+
+
+ACADEMIC_YEAR_RE = re.compile(r'^\d{4}-\d{4}$')
+
+
+class Command(BaseCommand):
+    help = "Render every enrolled student's report card for one term to MEDIA_ROOT, resuming an interrupted run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--semester',
+            required=True,
+            choices=[code for code, _ in Enrollment.SEMESTER_CHOICES],
+        )
+        parser.add_argument('--academic-year', required=True, help='e.g. 2024-2025')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes (default: one per CPU).',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Render every card again instead of skipping those already in the manifest.',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] is not None and options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+        if not ACADEMIC_YEAR_RE.match(options['academic_year']):
+            raise CommandError('--academic-year must look like 2024-2025.')
+
+        started = time.monotonic()
+        written = 0
+        for _ in generate_report_cards(
+            options['semester'],
+            options['academic_year'],
+            workers=options['workers'],
+            force=options['force'],
+        ):
+            written += 1
+            if written % 500 == 0:
+                self.stdout.write(f'{written} report cards written...')
+
+        elapsed = time.monotonic() - started
+        directory = report_card_dir(options['semester'], options['academic_year'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} report cards to {directory} in {elapsed:.1f}s.'
+        ))
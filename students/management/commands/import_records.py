@@ -0,0 +1,73 @@
+import csv
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.importers import IMPORTERS, import_records, read_records
+
+
+class Command(BaseCommand):
+    help = 'Bulk import students, courses, enrollments or grades from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file to import.')
+        parser.add_argument(
+            '--model',
+            required=True,
+            choices=sorted(IMPORTERS),
+            help='What the file contains.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='File format (default: from the file extension).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Records validated and inserted per transaction (default: 1000).',
+        )
+        parser.add_argument(
+            '--errors',
+            help='Where to write the error report (default: <path>.errors.csv).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate only; do not write anything.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        fmt = options['format']
+        if fmt is None:
+            extension = os.path.splitext(path)[1].lower()
+            fmt = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension)
+            if fmt is None:
+                raise CommandError('Cannot tell the format from the extension; pass --format.')
+
+        error_path = options['errors'] or f'{path}.errors.csv'
+        importer = IMPORTERS[options['model']]()
+
+        with open(path, newline='', encoding='utf-8-sig') as source, \
+                open(error_path, 'w', newline='', encoding='utf-8') as report:
+            error_writer = csv.writer(report)
+            error_writer.writerow(['line', 'errors', 'record'])
+            inserted, failed = import_records(
+                read_records(source, fmt),
+                importer,
+                batch_size=options['batch_size'],
+                error_writer=error_writer,
+                dry_run=options['dry_run'],
+            )
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {inserted} {options["model"]}.'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} record(s) rejected; see {error_path}.'))
+        else:
+            os.remove(error_path)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from students.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed dashboard statistics from the source tables'
+
+    def handle(self, *args, **options):
+        stats = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt dashboard stats: {stats.total_students} students, '
+            f'{stats.active_courses} active courses, {stats.active_enrollments} active enrollments.'
+        ))
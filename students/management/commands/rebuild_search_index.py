@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from students.models import Student
+from students.search import SEARCH_FIELDS, index_students
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the student search index from the Student table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Number of students to index per batch (default: 2000).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        students = Student.objects.only('pk', *SEARCH_FIELDS).order_by('pk')
+        batch, indexed, terms = [], 0, 0
+
+        for student in students.iterator(chunk_size=batch_size):
+            batch.append(student)
+            if len(batch) >= batch_size:
+                terms += index_students(batch)
+                indexed += len(batch)
+                batch = []
+        terms += index_students(batch)
+        indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} students ({terms} search terms).'))
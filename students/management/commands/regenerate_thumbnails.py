@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.models import Student
+from students.thumbnails import regenerate_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Regenerate profile picture thumbnails for existing media'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes (default: one per CPU).',
+        )
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Skip pictures whose thumbnails were already generated.',
+        )
+
+    def handle(self, *args, **options):
+        if options['workers'] is not None and options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+
+        students = Student.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        if options['missing_only']:
+            students = students.filter(has_thumbnails=False)
+        names = list(students.order_by().values_list('profile_picture', flat=True).distinct())
+
+        started = time.monotonic()
+        done = failed = 0
+        for name, error in regenerate_thumbnails(names, workers=options['workers']):
+            if error:
+                failed += 1
+                self.stderr.write(f'{name}: {error}')
+            else:
+                done += 1
+            # Pages link the thumbnails only once they are known to exist
+            Student.objects.filter(profile_picture=name).update(has_thumbnails=error is None)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Regenerated thumbnails for {done} pictures in {elapsed:.1f}s ({failed} failed).'
+        ))
@@ -0,0 +1,57 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Time every students URL through the test client and report queries, wall time and peak memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per URL (default: 5).')
+        parser.add_argument('--warmup', type=int, default=1, help='Untimed requests per URL first (default: 1).')
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            metavar='NAME',
+            help='Only benchmark cases whose name starts with one of these.',
+        )
+        parser.add_argument('--output', help='Write the JSON report to this path.')
+        parser.add_argument('--compare', metavar='PATH', help='An earlier JSON report to diff against.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be at least 1.')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Cannot read {options["compare"]}: {exc}')
+
+        report = benchmarks.run(repeat=options['repeat'], warmup=options['warmup'], only=options['only'])
+
+        rows = report['environment']['rows']
+        self.stdout.write(', '.join(f'{count} {name}' for name, count in rows.items()))
+        self.stdout.write(f'{"case":<28} {"status":>6} {"queries":>7} {"db ms":>8} {"median ms":>10} {"peak kb":>9}')
+        for name, result in report['results'].items():
+            self.stdout.write(
+                f'{name:<28} {result["status"]:>6} {result["queries"]:>7} {result["query_ms"]:>8} '
+                f'{result["wall_ms"]["median"]:>10} {result["peak_memory_kb"]:>9}'
+            )
+
+        if baseline is not None:
+            self.stdout.write('')
+            changes = list(benchmarks.compare(baseline, report))
+            for name, metric, before, after in changes:
+                self.stdout.write(f'{name}: {metric} {before} -> {after}')
+            if not changes:
+                self.stdout.write('No changes against the baseline.')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}.'))
@@ -0,0 +1,50 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs in a pool of worker threads or processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Jobs run at once (default: 2).')
+        parser.add_argument(
+            '--mode',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Run workers as threads, or as processes for CPU-bound jobs (default: thread).',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds an idle worker waits before checking the queue again (default: 1).',
+        )
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1.')
+
+        stop = multiprocessing.Event() if options['mode'] == 'process' else threading.Event()
+
+        def shut_down(signum, frame):
+            self.stdout.write('Finishing running jobs, then stopping...')
+            stop.set()
+
+        signal.signal(signal.SIGINT, shut_down)
+        signal.signal(signal.SIGTERM, shut_down)
+
+        self.stdout.write(f'Starting {options["workers"]} {options["mode"]} workers.')
+        processed = jobs.run_workers(
+            stop,
+            workers=options['workers'],
+            mode=options['mode'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Ran {processed} jobs.'))
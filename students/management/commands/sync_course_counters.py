@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from students.counters import find_counter_drift, recount_courses
+
+
+class Command(BaseCommand):
+    help = 'Verify the denormalized Course enrollment counters and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drift; exit with an error if any is found.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(find_counter_drift())
+
+        for course in drifted:
+            self.stdout.write(
+                f'{course.course_code}: stored {course.enrollment_count}/{course.active_enrollment_count}, '
+                f'actual {course.actual_enrollments}/{course.actual_active_enrollments} (total/active)'
+            )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All course enrollment counters are correct.'))
+            return
+
+        if options['check']:
+            raise CommandError(f'{len(drifted)} course(s) have drifted enrollment counters.')
+
+        recount_courses(course.pk for course in drifted)
+        self.stdout.write(self.style.SUCCESS(f'Repaired counters for {len(drifted)} course(s).'))
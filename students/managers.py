@@ -0,0 +1,421 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models, transaction
+from django.db.models import Count
+from django.db.models.functions import Substr
+from django.utils import timezone
+
+
+# QuerySet.bulk_update() is implemented with update(); while it runs, the
+# bookkeeping is done once by bulk_update itself rather than by update().
+_inside_bulk_update = ContextVar('inside_bulk_update', default=False)
+
+
+@contextmanager
+def _bulk_update_scope():
+    token = _inside_bulk_update.set(True)
+    try:
+        yield
+    finally:
+        _inside_bulk_update.reset(token)
+
+
+# While a delete cascades, the per-row signal handlers queue their counter
+# and stats changes here instead of writing them one row at a time.
+_deferred_bookkeeping = ContextVar('deferred_bookkeeping', default=None)
+
+
+class DeferredBookkeeping:
+    def __init__(self):
+        self.stats = Counter()
+        self.course_ids = set()
+        self.transcript_student_ids = set()
+
+
+def deferred_bookkeeping():
+    """The changes queued by the batched delete in progress, or None outside one"""
+    return _deferred_bookkeeping.get()
+
+
+@contextmanager
+def batched_bookkeeping(using):
+    """
+    Queue the course counter, stats and transcript changes that signal
+    handlers make row by row, e.g. for every enrollment a student's delete
+    cascades to, and apply them with one query each at the end.
+    """
+    if _deferred_bookkeeping.get() is not None:
+        yield
+        return
+
+    from .counters import recount_courses
+    from .stats import adjust_stats
+    from .transcripts import invalidate_transcripts
+
+    pending = DeferredBookkeeping()
+    with transaction.atomic(using=using):
+        token = _deferred_bookkeeping.set(pending)
+        try:
+            yield
+        finally:
+            _deferred_bookkeeping.reset(token)
+        recount_courses(pending.course_ids)
+        adjust_stats(pending.stats)
+        invalidate_transcripts(pending.transcript_student_ids)
+
+
+def _scaled(deltas, factor):
+    return Counter({field: delta * factor for field, delta in deltas.items()})
+
+
+def _related(prefix, fields):
+    return ['%s__%s' % (prefix, field) for field in fields]
+
+
+class TouchOnUpdateMixin:
+    """
+    Bump updated_at on QuerySet.update(), which skips auto_now. The list
+    pages key their cached row fragments on it, so a bulk change must move it.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
+
+
+class StatsQuerySet(models.QuerySet):
+    """
+    Base for querysets whose rows feed the DashboardStats row.
+
+    Single-row saves and deletes are handled by students.signals; the bulk
+    paths below skip signals, so they apply the stats changes themselves.
+    delete() does send signals, one row at a time, so it batches what they
+    write.
+    Subclasses list the attnames that matter in ``stats_fields`` and map a
+    row's values to stats changes in ``stats_deltas``.
+    """
+
+    stats_fields = ()
+
+    @staticmethod
+    def stats_deltas(values, sign):
+        raise NotImplementedError
+
+    def _object_values(self, obj):
+        return {field: getattr(obj, field) for field in self.stats_fields}
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .stats import adjust_stats, rebuild_stats
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+            # We can't tell which rows were really inserted
+            rebuild_stats()
+        else:
+            deltas = Counter()
+            for obj in objs:
+                deltas.update(self.stats_deltas(self._object_values(obj), 1))
+            adjust_stats(deltas)
+        for obj in objs:
+            obj.remember_loaded_values()
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from .stats import adjust_stats, rebuild_stats
+
+        objs = list(objs)
+        tracked = set(self.stats_fields).intersection(
+            self.model._meta.get_field(name).attname for name in fields
+        )
+        known = all(obj.has_loaded_value(field) for obj in objs for field in self.stats_fields)
+        deltas = Counter()
+        if tracked and known:
+            for obj in objs:
+                old_values = {field: obj.loaded_value(field) for field in self.stats_fields}
+                deltas.update(self.stats_deltas(old_values, -1))
+                deltas.update(self.stats_deltas(self._object_values(obj), 1))
+
+        with _bulk_update_scope():
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if tracked and known:
+            adjust_stats(deltas)
+        elif tracked:
+            rebuild_stats()
+        for obj in objs:
+            obj.remember_loaded_values()
+        return rows
+
+    def update(self, **kwargs):
+        from .stats import adjust_stats, rebuild_stats
+
+        tracked = set(self.stats_fields).intersection(
+            self.model._meta.get_field(name).attname for name in kwargs
+        )
+        if not tracked or _inside_bulk_update.get():
+            return super().update(**kwargs)
+        if any(hasattr(value, 'resolve_expression') for value in kwargs.values()):
+            rows = super().update(**kwargs)
+            rebuild_stats()
+            return rows
+
+        new_values = {
+            self.model._meta.get_field(name).attname: getattr(value, 'pk', value)
+            for name, value in kwargs.items()
+        }
+        with transaction.atomic(using=self.db):
+            groups = self.order_by().values(*self.stats_fields).annotate(rows=Count('pk'))
+            deltas = Counter()
+            for group in groups:
+                count = group.pop('rows')
+                deltas.update(_scaled(self.stats_deltas(group, -1), count))
+                group.update((field, new_values[field]) for field in tracked)
+                deltas.update(_scaled(self.stats_deltas(group, 1), count))
+            rows = super().update(**kwargs)
+            adjust_stats(deltas)
+        return rows
+
+    def delete(self):
+        with batched_bookkeeping(self.db):
+            return super().delete()
+
+
+class StudentQuerySet(TouchOnUpdateMixin, StatsQuerySet):
+    """Student queries that also keep the search index in step on bulk paths"""
+
+    stats_fields = ('status', 'gender')
+    search_fields = {'first_name', 'last_name', 'student_id', 'email'}
+    # Columns student_list renders; created_at is its keyset
+    LIST_FIELDS = (
+        'student_id', 'first_name', 'last_name', 'email', 'phone', 'date_of_birth',
+        'status', 'profile_picture', 'has_thumbnails', 'enrollment_date', 'created_at',
+    )
+    # Columns of the avatar and name cell in the enrollment and grade lists,
+    # and updated_at for their cached row fragments
+    CELL_FIELDS = ('student_id', 'first_name', 'last_name', 'profile_picture', 'has_thumbnails', 'updated_at')
+
+    @staticmethod
+    def stats_deltas(values, sign):
+        from .stats import student_deltas
+
+        return student_deltas(values['status'], values['gender'], sign)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .search import index_students
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        index_students(objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from .search import index_students
+
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if self.search_fields.intersection(fields):
+            index_students(objs)
+        return rows
+
+    def update(self, **kwargs):
+        from .search import reindex_student_ids
+
+        if not self.search_fields.intersection(kwargs) or _inside_bulk_update.get():
+            return super().update(**kwargs)
+
+        student_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        reindex_student_ids(student_ids)
+        return rows
+
+    def for_list(self):
+        """Students with only the columns student_list shows"""
+        return self.only(*self.LIST_FIELDS)
+
+
+class CourseQuerySet(StatsQuerySet):
+    stats_fields = ('is_active',)
+    TRANSCRIPT_FIELDS = {'credits'}
+    COUNTER_FIELDS = {'enrollment_count', 'active_enrollment_count'}
+    LIST_FIELDS = ('course_code', 'course_name', 'credits', 'level', 'duration_months', 'fee', 'is_active')
+    CELL_FIELDS = ('course_code', 'course_name', 'updated_at')
+    # course_list truncates descriptions to 100 characters; one more tells
+    # truncatechars the text went on
+    DESCRIPTION_EXCERPT_LENGTH = 101
+
+    @staticmethod
+    def stats_deltas(values, sign):
+        from .stats import course_deltas
+
+        return course_deltas(values['is_active'], sign)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from .transcripts import invalidate_all_transcripts
+
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if self.TRANSCRIPT_FIELDS.intersection(fields):
+            invalidate_all_transcripts()
+        return rows
+
+    def update(self, **kwargs):
+        from .transcripts import invalidate_all_transcripts
+
+        # Like TouchOnUpdateMixin, except for the enrollment counters: they
+        # move with every enrollment change and no cached row shows them
+        if not self.COUNTER_FIELDS.issuperset(kwargs):
+            kwargs.setdefault('updated_at', timezone.now())
+        rows = super().update(**kwargs)
+        if self.TRANSCRIPT_FIELDS.intersection(kwargs) and not _inside_bulk_update.get():
+            invalidate_all_transcripts()
+        return rows
+
+    def for_list(self):
+        """
+        Courses with only the columns course_list shows, and the start of the
+        description as ``description_excerpt`` instead of the whole text.
+        """
+        return self.only(*self.LIST_FIELDS).annotate(
+            description_excerpt=Substr('description', 1, self.DESCRIPTION_EXCERPT_LENGTH),
+        )
+
+
+class EnrollmentQuerySet(TouchOnUpdateMixin, StatsQuerySet):
+    """
+    Enrollment queries that keep dashboard stats and Course enrollment
+    counters in step, including on the bulk paths.
+    """
+
+    stats_fields = ('is_active',)
+    COUNTED_FIELDS = {'course', 'course_id', 'is_active'}
+    TRANSCRIPT_FIELDS = {'student', 'student_id', 'course', 'course_id', 'semester', 'academic_year'}
+    LIST_FIELDS = ('student', 'course', 'semester', 'academic_year', 'enrollment_date', 'is_active', 'updated_at')
+
+    @staticmethod
+    def stats_deltas(values, sign):
+        from .stats import enrollment_deltas
+
+        return enrollment_deltas(values['is_active'], sign)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .counters import adjust_course_counters, recount_courses
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+            recount_courses({obj.course_id for obj in objs})
+            return objs
+
+        totals, actives = Counter(), Counter()
+        for obj in objs:
+            totals[obj.course_id] += 1
+            actives[obj.course_id] += int(bool(obj.is_active))
+        for course_id, total in totals.items():
+            adjust_course_counters(course_id, total=total, active=actives[course_id])
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from .counters import recount_courses
+        from .transcripts import invalidate_transcripts
+
+        objs = list(objs)
+        course_ids = {obj.course_id for obj in objs}
+        course_ids.update(obj.loaded_value('course_id') for obj in objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if self.COUNTED_FIELDS.intersection(fields):
+            recount_courses(course_ids)
+        if self.TRANSCRIPT_FIELDS.intersection(fields):
+            student_ids = {obj.student_id for obj in objs}
+            student_ids.update(obj.loaded_value('student_id') for obj in objs if obj.has_loaded_value('student_id'))
+            invalidate_transcripts(student_ids)
+        return rows
+
+    def update(self, **kwargs):
+        from .counters import recount_courses
+        from .transcripts import invalidate_transcripts
+
+        counted = self.COUNTED_FIELDS.intersection(kwargs)
+        transcribed = self.TRANSCRIPT_FIELDS.intersection(kwargs)
+        if not (counted or transcribed) or _inside_bulk_update.get():
+            return super().update(**kwargs)
+
+        affected = set(self.order_by().values_list('course_id', 'student_id').distinct())
+        rows = super().update(**kwargs)
+        if counted:
+            course_ids = {course_id for course_id, _ in affected}
+            new_course = kwargs.get('course', kwargs.get('course_id'))
+            if new_course is not None:
+                course_ids.add(getattr(new_course, 'pk', new_course))
+            recount_courses(course_ids)
+        if transcribed:
+            student_ids = {student_id for _, student_id in affected}
+            new_student = kwargs.get('student', kwargs.get('student_id'))
+            if new_student is not None:
+                student_ids.add(getattr(new_student, 'pk', new_student))
+            invalidate_transcripts(student_ids)
+        return rows
+
+    def for_list(self):
+        """Enrollments with their student and course, only the columns enrollment_list shows"""
+        return self.select_related('student', 'course').only(
+            *self.LIST_FIELDS,
+            *_related('student', StudentQuerySet.CELL_FIELDS),
+            *_related('course', CourseQuerySet.CELL_FIELDS),
+        )
+
+
+class GradeQuerySet(TouchOnUpdateMixin, models.QuerySet):
+    """
+    Grade queries that drop the affected students' stored transcripts on the
+    bulk paths; single saves and deletes are handled by students.signals.
+    """
+
+    LIST_FIELDS = ('enrollment', 'marks_obtained', 'total_marks', 'grade', 'exam_date', 'updated_at')
+
+    def _invalidate_enrollments(self, enrollment_ids):
+        from .models import Enrollment
+        from .transcripts import invalidate_transcripts
+
+        invalidate_transcripts(
+            Enrollment.objects.filter(pk__in=set(enrollment_ids)).order_by().values_list('student_id', flat=True)
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._invalidate_enrollments(obj.enrollment_id for obj in objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        with _bulk_update_scope():
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._invalidate_enrollments(obj.enrollment_id for obj in objs)
+        return rows
+
+    def update(self, **kwargs):
+        from .transcripts import invalidate_transcripts
+
+        if _inside_bulk_update.get():
+            return super().update(**kwargs)
+        student_ids = set(self.order_by().values_list('enrollment__student_id', flat=True).distinct())
+        rows = super().update(**kwargs)
+        new_enrollment = kwargs.get('enrollment', kwargs.get('enrollment_id'))
+        if new_enrollment is not None:
+            self._invalidate_enrollments([getattr(new_enrollment, 'pk', new_enrollment)])
+        invalidate_transcripts(student_ids)
+        return rows
+
+    def delete(self):
+        from .transcripts import invalidate_transcripts
+
+        student_ids = set(self.order_by().values_list('enrollment__student_id', flat=True).distinct())
+        result = super().delete()
+        invalidate_transcripts(student_ids)
+        return result
+
+    def for_list(self):
+        """Grades with their enrollment, student and course, only the columns grade_list shows"""
+        return self.select_related('enrollment__student', 'enrollment__course').only(
+            *self.LIST_FIELDS,
+            'enrollment__semester', 'enrollment__updated_at', 'enrollment__student', 'enrollment__course',
+            *_related('enrollment__student', StudentQuerySet.CELL_FIELDS),
+            *_related('enrollment__course', CourseQuerySet.CELL_FIELDS),
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:30
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model('students', 'Course')
+    Enrollment = apps.get_model('students', 'Enrollment')
+
+    def count_of(**filters):
+        counts = (
+            Enrollment.objects.filter(course=OuterRef('pk'), **filters)
+            .order_by()
+            .values('course')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    Course.objects.update(
+        enrollment_count=count_of(),
+        active_enrollment_count=count_of(is_active=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='active_enrollment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
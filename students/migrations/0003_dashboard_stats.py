@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:32
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_stats(apps, schema_editor):
+    Student = apps.get_model('students', 'Student')
+    Course = apps.get_model('students', 'Course')
+    Enrollment = apps.get_model('students', 'Enrollment')
+    DashboardStats = apps.get_model('students', 'DashboardStats')
+
+    students = Student.objects.aggregate(
+        total_students=Count('pk'),
+        active_students=Count('pk', filter=Q(status='A')),
+        male_students=Count('pk', filter=Q(gender='M')),
+        female_students=Count('pk', filter=Q(gender='F')),
+        other_students=Count('pk', filter=Q(gender='O')),
+    )
+    DashboardStats.objects.update_or_create(
+        pk=1,
+        defaults=dict(
+            students,
+            active_courses=Course.objects.filter(is_active=True).count(),
+            active_enrollments=Enrollment.objects.filter(is_active=True).count(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_course_enrollment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_students', models.IntegerField(default=0)),
+                ('active_students', models.IntegerField(default=0)),
+                ('male_students', models.IntegerField(default=0)),
+                ('female_students', models.IntegerField(default=0)),
+                ('other_students', models.IntegerField(default=0)),
+                ('active_courses', models.IntegerField(default=0)),
+                ('active_enrollments', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard stats',
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:34
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_search_index(apps, schema_editor):
+    Student = apps.get_model('students', 'Student')
+    StudentSearchTerm = apps.get_model('students', 'StudentSearchTerm')
+    word = re.compile(r'\w+')
+
+    batch = []
+    fields = ('first_name', 'last_name', 'student_id', 'email')
+    for student in Student.objects.only('pk', *fields).iterator(chunk_size=2000):
+        terms = set()
+        for field in fields:
+            terms.update(term[:100] for term in word.findall((getattr(student, field) or '').lower()))
+        batch.extend(StudentSearchTerm(student_id=student.pk, term=term) for term in terms)
+        if len(batch) >= 5000:
+            StudentSearchTerm.objects.bulk_create(batch)
+            batch = []
+    StudentSearchTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_dashboard_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='students.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'student'], name='student_search_term_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_job'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollment_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollment_active_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['enrollment_date', 'id'], name='enrollment_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-enrollment_date', '-id'], name='enrollment_active_date_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0008_enrollment_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComputedTranscript',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='computed_transcript', serialize=False, to='students.student')),
+                ('courses', models.JSONField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
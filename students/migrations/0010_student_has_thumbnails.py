@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0009_computed_transcript'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='has_thumbnails',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,8 +1,87 @@
-from django.db import models
+import logging
+
+from django.conf import settings
+from django.db import models, router
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Cast
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .managers import StudentQuerySet, CourseQuerySet, EnrollmentQuerySet, GradeQuerySet, batched_bookkeeping
+from .thumbnails import thumbnail_url
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoadedValuesMixin:
+    """
+    Remember the column values an instance was loaded (or last saved) with.
+
+    Signal handlers compare against them to work out what a save changed
+    without re-reading the row.
+    """
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def remember_loaded_values(self):
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
+    
+    def loaded_value(self, attname, default=None):
+        return getattr(self, '_loaded_values', {}).get(attname, default)
+    
+    def has_loaded_value(self, attname):
+        return attname in getattr(self, '_loaded_values', {})
+
+class DeferredFieldAccess(Exception):
+    """Raised when a deferred field is loaded and STUDENTS_DEFERRED_FIELD_GUARD is 'raise'"""
+
+class DeferredFieldGuardMixin:
+    """
+    Flag reads of fields left out by only()/defer(). Each one costs an extra
+    query per instance, which on a list page means one per row.
+
+    Django loads a deferred field through refresh_from_db(fields=[...]);
+    with STUDENTS_DEFERRED_FIELD_GUARD set to 'warn' that is logged, and
+    with 'raise' it fails, so tests catch a projection that is missing a
+    column the template uses.
+    """
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        mode = getattr(settings, 'STUDENTS_DEFERRED_FIELD_GUARD', '')
+        if mode and fields is not None:
+            deferred = self.get_deferred_fields().intersection(fields)
+            if deferred:
+                message = 'Loaded deferred field(s) %s of %s %s' % (
+                    ', '.join(sorted(deferred)), self._meta.label, self.pk,
+                )
+                if mode == 'raise':
+                    raise DeferredFieldAccess(message)
+                logger.warning(message)
+        return super().refresh_from_db(using=using, fields=fields, **kwargs)
 
-class Student(models.Model):
+class BatchedDeleteMixin:
+    """
+    Delete in one go what the row's delete cascades to: the enrollment
+    signals queue their counter and stats changes and they are applied once,
+    instead of two UPDATEs per enrollment.
+    """
+    
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(type(self), instance=self)
+        with batched_bookkeeping(using):
+            return super().delete(using=using, keep_parents=keep_parents)
+
+class Student(LoadedValuesMixin, DeferredFieldGuardMixin, BatchedDeleteMixin, models.Model):
     GENDER_CHOICES = [
         ('M', 'Male'),
         ('F', 'Female'),
@@ -27,6 +106,8 @@ class Student(models.Model):
     enrollment_date = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=1, choices=STATUS_CHOICES, default='A')
     profile_picture = models.ImageField(upload_to='student_profiles/', null=True, blank=True)
+    # Set once the picture's thumbnails are written; until then pages show the picture itself
+    has_thumbnails = models.BooleanField(default=False)
     
     # Emergency Contact
     emergency_contact_name = models.CharField(max_length=100)
@@ -35,8 +116,17 @@ class Student(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = StudentQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-enrollment_date', 'last_name']
+        indexes = [
+            # Default ordering, used by every query that doesn't set its own
+            models.Index(fields=['-enrollment_date', 'last_name'], name='student_default_order_idx'),
+            # student_list keyset pages, unfiltered and by status
+            models.Index(fields=['created_at', 'id'], name='student_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='student_status_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student_id} - {self.first_name} {self.last_name}"
@@ -44,12 +134,38 @@ class Student(models.Model):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
     
+    def avatar_url(self):
+        """Small square thumbnail of the profile picture, for list rows"""
+        return thumbnail_url(self.profile_picture.name, 'avatar', self.has_thumbnails)
+    
+    def detail_picture_url(self):
+        """Larger square thumbnail of the profile picture, for the detail pages"""
+        return thumbnail_url(self.profile_picture.name, 'detail', self.has_thumbnails)
+    
     def age(self):
         from datetime import date
         today = date.today()
         return today.year - self.date_of_birth.year - ((today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day))
 
-class Course(models.Model):
+class StudentSearchTerm(models.Model):
+    """
+    One lowercase word from a student's name, ID or email.
+
+    Maintained by students.search; searched with indexed prefix range scans
+    instead of LIKE '%x%' over every student row.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=100)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'student'], name='student_search_term_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} -> {self.student_id}"
+
+class Course(LoadedValuesMixin, DeferredFieldGuardMixin, BatchedDeleteMixin, models.Model):
     LEVEL_CHOICES = [
         ('UG', 'Undergraduate'),
         ('PG', 'Postgraduate'),
@@ -66,13 +182,27 @@ class Course(models.Model):
     fee = models.DecimalField(max_digits=10, decimal_places=2)
     is_active = models.BooleanField(default=True)
     
+    # Denormalized from Enrollment; kept in sync by students.signals and
+    # EnrollmentQuerySet, checked with `manage.py sync_course_counters`.
+    enrollment_count = models.IntegerField(default=0, editable=False)
+    active_enrollment_count = models.IntegerField(default=0, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CourseQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='course_created_idx'),
+            # Dashboard "most popular courses"
+            models.Index(fields=['enrollment_count'], name='course_enrollment_count_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.course_code} - {self.course_name}"
 
-class Enrollment(models.Model):
+class Enrollment(LoadedValuesMixin, DeferredFieldGuardMixin, models.Model):
     SEMESTER_CHOICES = [
         ('S1', 'Semester 1'),
         ('S2', 'Semester 2'),
@@ -90,15 +220,30 @@ class Enrollment(models.Model):
     semester = models.CharField(max_length=2, choices=SEMESTER_CHOICES)
     academic_year = models.CharField(max_length=9)  # Format: 2023-2024
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = EnrollmentQuerySet.as_manager()
     
     class Meta:
         unique_together = ['student', 'course', 'semester', 'academic_year']
         ordering = ['-enrollment_date']
+        indexes = [
+            # enrollment_list keyset pages, unfiltered and active only;
+            # inactive rows stay out of the second one
+            models.Index(fields=['enrollment_date', 'id'], name='enrollment_date_idx'),
+            models.Index(
+                fields=['-enrollment_date', '-id'],
+                condition=Q(is_active=True),
+                name='enrollment_active_date_idx',
+            ),
+            # One course section, as loaded by the gradebook
+            models.Index(fields=['course', 'academic_year', 'semester'], name='enrollment_section_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student} - {self.course} ({self.semester} {self.academic_year})"
 
-class Grade(models.Model):
+class Grade(LoadedValuesMixin, DeferredFieldGuardMixin, models.Model):
     GRADE_CHOICES = [
         ('A', 'A (90-100)'),
         ('B', 'B (80-89)'),
@@ -108,6 +253,26 @@ class Grade(models.Model):
         ('F', 'F (Below 50)'),
     ]
     
+    # Lowest percentage for each letter, best first; anything lower is an F
+    GRADE_BANDS = [
+        (90, 'A'),
+        (80, 'B'),
+        (70, 'C'),
+        (60, 'D'),
+        (50, 'E'),
+    ]
+    
+    PASSING_GRADES = ['A', 'B', 'C', 'D', 'E']
+    
+    GRADE_POINTS = {
+        'A': 4.0,
+        'B': 3.0,
+        'C': 2.0,
+        'D': 1.0,
+        'E': 0.5,
+        'F': 0.0,
+    }
+    
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE, related_name='grades')
     marks_obtained = models.DecimalField(max_digits=5, decimal_places=2, validators=[MinValueValidator(0), MaxValueValidator(100)])
     total_marks = models.DecimalField(max_digits=5, decimal_places=2, default=100)
@@ -118,11 +283,148 @@ class Grade(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = GradeQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-exam_date']
+        indexes = [
+            # grade_list keyset pages, unfiltered and by letter
+            models.Index(fields=['exam_date', 'id'], name='grade_exam_date_idx'),
+            models.Index(fields=['grade', 'exam_date', 'id'], name='grade_letter_exam_date_idx'),
+            # Covers the grade_list summary aggregate without reading the table
+            models.Index(fields=['grade', 'marks_obtained', 'total_marks'], name='grade_letter_marks_idx'),
+            # An enrollment's grades by exam: gradebook and transcripts
+            models.Index(fields=['enrollment', 'exam_date'], name='grade_enrollment_exam_idx'),
+        ]
     
     def __str__(self):
         return f"{self.enrollment} - {self.grade}"
     
     def percentage(self):
-        return (self.marks_obtained / self.total_marks) * 100
\ No newline at end of file
+        return (self.marks_obtained / self.total_marks) * 100
+    
+    @staticmethod
+    def percentage_expression():
+        """SQL equivalent of percentage(), for annotations and aggregates"""
+        return Cast('marks_obtained', FloatField()) * 100 / Cast('total_marks', FloatField())
+    
+    @classmethod
+    def points_expression(cls):
+        """The grade points for a row's letter, as an SQL expression"""
+        return Case(
+            *[When(grade=letter, then=Value(points)) for letter, points in cls.GRADE_POINTS.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    
+    @classmethod
+    def letter_for_percentage(cls, percentage):
+        for lower_bound, letter in cls.GRADE_BANDS:
+            if percentage >= lower_bound:
+                return letter
+        return 'F'
+
+
+class DashboardStats(models.Model):
+    """
+    Precomputed dashboard numbers, stored in a single row.
+
+    Kept current incrementally by students.signals and the bulk paths in
+    students.managers; `manage.py rebuild_dashboard_stats` recomputes it.
+    """
+    total_students = models.IntegerField(default=0)
+    active_students = models.IntegerField(default=0)
+    male_students = models.IntegerField(default=0)
+    female_students = models.IntegerField(default=0)
+    other_students = models.IntegerField(default=0)
+    active_courses = models.IntegerField(default=0)
+    active_enrollments = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    GENDER_FIELDS = {
+        'M': 'male_students',
+        'F': 'female_students',
+        'O': 'other_students',
+    }
+    
+    class Meta:
+        verbose_name_plural = 'dashboard stats'
+    
+    def __str__(self):
+        return f"Dashboard stats (updated {self.updated_at:%Y-%m-%d %H:%M})"
+    
+    def gender_distribution(self):
+        return [
+            {'gender': code, 'label': label, 'count': getattr(self, self.GENDER_FIELDS[code])}
+            for code, label in Student.GENDER_CHOICES
+        ]
+
+
+class ComputedTranscript(models.Model):
+    """
+    A student's graded courses as students.transcripts last aggregated them.
+
+    Every worker process reads the same rows, and a grade, enrollment or
+    credit change deletes the rows it affects, so no process can keep
+    serving a GPA from before the change.
+    """
+    student = models.OneToOneField(
+        Student, on_delete=models.CASCADE, primary_key=True, related_name='computed_transcript'
+    )
+    courses = models.JSONField()
+    computed_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"Transcript of student {self.student_id} (computed {self.computed_at:%Y-%m-%d %H:%M})"
+
+
+class Job(models.Model):
+    """
+    A unit of background work, queued by the web process and run by
+    `manage.py run_workers`. See students.jobs.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    # Not picked up before this time; pushed back when a failed attempt is retried
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    
+    result = models.JSONField(null=True, blank=True)
+    result_file = models.FileField(upload_to='jobs/%Y/%m/%d/', blank=True)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The workers' claim query: the oldest due job still queued
+            models.Index(fields=['status', 'run_after', 'id'], name='job_claim_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
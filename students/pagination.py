@@ -0,0 +1,207 @@
+import hashlib
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+CURSOR_SALT = 'students.pagination.cursor'
+
+
+class InvalidCursor(Exception):
+    """Raised when a pagination token cannot be decoded"""
+
+
+def encode_cursor(values, direction):
+    """Turn the key of a boundary row into an opaque, signed token"""
+    payload = [direction] + [
+        value.isoformat() if hasattr(value, 'isoformat') else value
+        for value in values
+    ]
+    return signing.dumps(payload, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    """Return (direction, values) for a token produced by encode_cursor"""
+    try:
+        payload = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise InvalidCursor(token)
+    if not isinstance(payload, list) or len(payload) < 2 or payload[0] not in ('next', 'prev'):
+        raise InvalidCursor(token)
+    return payload[0], payload[1:]
+
+
+def cached_count(queryset, timeout=60):
+    """
+    Count a queryset, caching the result for a short time.
+
+    The total shown above a listing only needs to be approximately right,
+    so repeated requests for the same filters share one COUNT.
+    """
+    sql = str(queryset.query).encode('utf-8')
+    key = 'count:%s:%s' % (queryset.model._meta.label_lower, hashlib.md5(sql).hexdigest())
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, timeout)
+    return total
+
+
+def estimated_count(queryset):
+    """
+    The row count of an unfiltered queryset's table, estimated from the
+    statistics the database keeps for its planner without scanning it, or
+    None when it cannot tell (e.g. the queryset is filtered, or the table was
+    never analyzed). The estimate is as old as the last ANALYZE, so it can
+    be off in either direction after large inserts or deletes.
+    """
+    if queryset.query.where or queryset.query.distinct or queryset.query.is_sliced:
+        return None
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Kept up to date by autovacuum's ANALYZE; -1 until the first one
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [table])
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor == 'sqlite':
+            # sqlite_stat1 only exists once ANALYZE has run; each of its rows
+            # for the table starts with the table's row count
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+            row = cursor.fetchone()
+            return int(row[0].split()[0]) if row else None
+    return None
+
+
+def refresh_table_stats(using='default'):
+    """Run ANALYZE, refreshing planner statistics and with them estimated_count()"""
+    connection = connections[using]
+    if connection.vendor in ('postgresql', 'sqlite'):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    A Paginator for listings of very large tables, such as admin changelists.
+
+    Unfiltered, the count is estimated_count() instead of a COUNT(*) over
+    the whole table; filtered, it is an exact count shared for a short time
+    through cached_count(). Tables smaller than ``exact_below`` rows are
+    always counted exactly, and so are those an estimate puts within
+    ``estimate_margin`` times of it, in case the estimate predates a large
+    delete.
+    """
+
+    exact_below = 10000
+    estimate_margin = 2
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate >= self.exact_below * self.estimate_margin:
+            return estimate
+        return cached_count(self.object_list)
+
+
+class KeysetPage:
+    """One page of a keyset-paginated listing"""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, total=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row seen instead of OFFSET.
+
+    Rows are ordered newest first on ``ordering`` (a tuple of field names whose
+    combination is unique, e.g. ``('created_at', 'id')``). Fetching any page
+    costs one indexed range scan of ``per_page + 1`` rows, however deep it is.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('created_at', 'id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    def _seek(self, values, direction):
+        # Expand (a, b) < (x, y) into a < x OR (a = x AND b < y) so that it
+        # works on every backend, not only those with row-value comparisons.
+        lookup = 'lt' if direction == 'next' else 'gt'
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            term = Q(**{'%s__%s' % (field, lookup): values[index]})
+            for prior_field, prior_value in zip(self.ordering[:index], values[:index]):
+                term &= Q(**{prior_field: prior_value})
+            condition |= term
+        return condition
+
+    def _parse(self, values):
+        opts = self.queryset.model._meta
+        return [
+            opts.get_field(field).to_python(value)
+            for field, value in zip(self.ordering, values)
+        ]
+
+    def _key(self, obj):
+        return [getattr(obj, field) for field in self.ordering]
+
+    def get_page(self, cursor=None, total=None):
+        """Return the page after/before ``cursor``, or the first page if it is missing or invalid"""
+        direction, values = 'next', None
+        if cursor:
+            try:
+                direction, values = decode_cursor(cursor)
+                if len(values) != len(self.ordering):
+                    raise InvalidCursor(cursor)
+                values = self._parse(values)
+            except (InvalidCursor, ValidationError):
+                direction, values = 'next', None
+
+        descending = ['-%s' % field for field in self.ordering]
+        ascending = list(self.ordering)
+        queryset = self.queryset.order_by(*(descending if direction == 'next' else ascending))
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, direction))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'prev':
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        next_cursor = encode_cursor(self._key(rows[-1]), 'next') if rows and has_next else None
+        previous_cursor = encode_cursor(self._key(rows[0]), 'prev') if rows and has_previous else None
+        return KeysetPage(rows, next_cursor, previous_cursor, total)
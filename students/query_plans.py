@@ -0,0 +1,159 @@
+import re
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from .models import Course, Enrollment, Student
+
+
+def _first_pk(model):
+    return model.objects.order_by().values_list('pk', flat=True).first()
+
+
+def _section():
+    enrollment = Enrollment.objects.order_by().values('course_id', 'semester', 'academic_year').first()
+    if enrollment is None:
+        return None
+    return {
+        'course': enrollment['course_id'],
+        'semester': enrollment['semester'],
+        'academic_year': enrollment['academic_year'],
+        'exam_date': '2024-01-01',
+        'total_marks': '100',
+    }
+
+
+# (label, url name, url args, GET parameters) for every page whose queries
+# are checked. Callables are evaluated against the current database, and a
+# check is skipped when one of them has nothing to point at.
+VIEW_CHECKS = [
+    ('dashboard', 'dashboard', (), {}),
+    ('student list', 'student_list', (), {}),
+    ('student list by status', 'student_list', (), {'status': 'A'}),
+    ('student search', 'student_list', (), {'query': 'a'}),
+    ('student detail', 'student_detail', (lambda: _first_pk(Student),), {}),
+    ('course list', 'course_list', (), {}),
+    ('enrollment list', 'enrollment_list', (), {}),
+    ('enrollment list filtered', 'enrollment_list', (), {'status': 'active', 'semester': 'S1'}),
+    ('enrollment list by status', 'enrollment_list', (), {'status': 'inactive'}),
+    ('grade list', 'grade_list', (), {}),
+    ('grade list by letter', 'grade_list', (), {'grade': 'A'}),
+    ('grade list by course', 'grade_list', (), lambda: {'course': _first_pk(Course)}),
+    ('gradebook', 'gradebook', (), _section),
+    ('grade export', 'export_data', ('grades',), {'format': 'csv'}),
+]
+
+
+# Small reference tables whose whole index may be walked, e.g. for the
+# course choices of a filter form
+LOOKUP_TABLES = {'students_course'}
+
+# Checks whose view reads every row in order on purpose
+FULL_READS = {'grade export'}
+
+# Totals and summaries: one pass over an index is the least they can read
+AGGREGATE_QUERY = re.compile(r'^SELECT\s+(?:COUNT|SUM|AVG|MIN|MAX)\(', re.IGNORECASE)
+
+
+class QueryRecorder:
+    """An execute_wrapper that keeps the SQL and parameters of every query"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def _resolve(value):
+    return value() if callable(value) else value
+
+
+def _run_view(factory, user, url_name, args, params):
+    url = reverse(url_name, args=args)
+    request = factory.get(url, params)
+    request.user = user
+    match = resolve(url)
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = match.func(request, *match.args, **match.kwargs)
+        if getattr(response, 'streaming', False):
+            for _ in response.streaming_content:
+                pass
+    return recorder.queries
+
+
+def explain(sql, params):
+    """The query plan, one line per step"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+        if connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN ' + sql, params)
+            return [row[0] for row in cursor.fetchall()]
+    raise NotImplementedError(f'Query plans are not supported on {connection.vendor}')
+
+
+def _app_tables():
+    return {model._meta.db_table for model in apps.get_app_config('students').get_models()}
+
+
+def full_scans(plan, tables, bounded=False):
+    """
+    The app tables a plan reads in full rather than searching an index.
+
+    Walking a whole index in order counts too, unless the query is
+    ``bounded``: a LIMITed page stops early, and an aggregate or a
+    deliberate full read has nothing better to use.
+    """
+    if connection.vendor == 'sqlite':
+        pattern = re.compile(r'^SCAN (\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?$')
+    else:
+        pattern = re.compile(r'Seq Scan on (\w+)')
+    scanned = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if not match or match.group(1) not in tables:
+            continue
+        walks_index = connection.vendor == 'sqlite' and match.group(2)
+        if walks_index and (bounded or match.group(1) in LOOKUP_TABLES):
+            continue
+        scanned.append(match.group(1))
+    return scanned
+
+
+def is_bounded(sql):
+    """Whether the outer query is LIMITed or only computes aggregates"""
+    sql = sql.strip()
+    if re.search(r'\bLIMIT\s+\S+(?:\s+OFFSET\s+\S+)?$', sql, re.IGNORECASE):
+        return True
+    return bool(AGGREGATE_QUERY.match(sql)) and not re.search(r'\bGROUP BY\b', sql, re.IGNORECASE)
+
+
+def check_views(checks=VIEW_CHECKS):
+    """
+    Run every checked view against the current database and yield
+    (label, sql, plan, full scans) for each query it makes.
+    """
+    factory = RequestFactory()
+    # Never saved: login_required only looks at is_authenticated
+    user = User(username='query-plan-check', is_staff=True, is_superuser=True)
+    tables = _app_tables()
+
+    for label, url_name, args, params in checks:
+        args = tuple(_resolve(arg) for arg in args)
+        params = _resolve(params)
+        if params is None or None in args or None in params.values():
+            yield label, None, [], []
+            continue
+        for sql, sql_params in _run_view(factory, user, url_name, args, params):
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            plan = explain(sql, sql_params)
+            bounded = label in FULL_READS or is_bounded(sql)
+            yield label, sql, plan, full_scans(plan, tables, bounded=bounded)
@@ -0,0 +1,186 @@
+"""
+End-of-term report cards, one HTML file per student, rendered in bulk.
+
+The whole cohort is loaded in three set-based queries, flattened into plain
+dicts and rendered across a process pool. Files go under MEDIA_ROOT with a
+manifest of the students already done, so a rerun after a crash picks up
+where the last one stopped.
+"""
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Enrollment, Grade
+from .transcripts import SEMESTER_LABELS, build_transcripts
+
+
+REPORT_CARD_DIR = 'report_cards'
+MANIFEST_NAME = 'manifest.json'
+# Completed cards recorded between manifest writes
+MANIFEST_FLUSH_EVERY = 50
+
+
+def report_card_dir(semester, academic_year):
+    return Path(settings.MEDIA_ROOT) / REPORT_CARD_DIR / academic_year / semester
+
+
+def _term(term):
+    if term is None:
+        return None
+    return {'gpa': term.gpa, 'credits': term.credits, 'earned_credits': term.earned_credits}
+
+
+def cohort_report_cards(semester, academic_year):
+    """
+    Yield the context of every report card for one term, one per enrolled
+    student, ordered by student ID. Makes three queries in all.
+    """
+    enrollments = (
+        Enrollment.objects.filter(semester=semester, academic_year=academic_year)
+        .select_related('student', 'course')
+        .only(
+            'id', 'is_active',
+            'student__id', 'student__student_id', 'student__first_name', 'student__last_name',
+            'student__email', 'student__status',
+            'course__course_code', 'course__course_name', 'course__credits',
+        )
+        .order_by('student__student_id', 'course__course_code')
+    )
+    exams = defaultdict(list)
+    grades = (
+        Grade.objects.filter(enrollment__semester=semester, enrollment__academic_year=academic_year)
+        .order_by('enrollment_id', 'exam_date', 'id')
+        .values_list('enrollment_id', 'exam_date', 'marks_obtained', 'total_marks', 'grade', 'remarks')
+    )
+    for enrollment_id, exam_date, marks, total, letter, remarks in grades.iterator():
+        exams[enrollment_id].append({
+            'exam_date': exam_date,
+            'marks_obtained': marks,
+            'total_marks': total,
+            'grade': letter,
+            'remarks': remarks,
+        })
+
+    cohort = Enrollment.objects.filter(semester=semester, academic_year=academic_year).values('student_id')
+    transcripts = {transcript.student_id: transcript for transcript in build_transcripts(cohort)}
+
+    generated_on = timezone.localdate()
+    card = None
+    for enrollment in enrollments.iterator():
+        student = enrollment.student
+        if card is None or card['student']['pk'] != student.pk:
+            if card is not None:
+                yield card
+            transcript = transcripts.get(student.pk)
+            term = None
+            if transcript is not None:
+                term = next(
+                    (t for t in transcript.semesters if (t.academic_year, t.semester) == (academic_year, semester)),
+                    None,
+                )
+            results = {course['course_code']: course for course in term.courses} if term else {}
+            card = {
+                'student': {
+                    'pk': student.pk,
+                    'student_id': student.student_id,
+                    'full_name': student.full_name(),
+                    'email': student.email,
+                    'status': student.get_status_display(),
+                },
+                'semester': semester,
+                'semester_label': SEMESTER_LABELS.get(semester, semester),
+                'academic_year': academic_year,
+                'courses': [],
+                'term': _term(term),
+                'cumulative': _term(transcript.cumulative if transcript else None),
+                'generated_on': generated_on,
+            }
+        course = enrollment.course
+        result = results.get(course.course_code, {})
+        card['courses'].append({
+            'course_code': course.course_code,
+            'course_name': course.course_name,
+            'credits': course.credits,
+            'is_active': enrollment.is_active,
+            'exams': exams.get(enrollment.pk, []),
+            'percentage': result.get('percentage'),
+            'grade_points': result.get('grade_points'),
+            'passed': result.get('passed'),
+        })
+    if card is not None:
+        yield card
+
+
+def _write_atomically(path, content):
+    # A crash mid-write must never leave a truncated file that looks finished
+    temporary = path.with_name(f'.{path.name}.tmp')
+    temporary.write_text(content, encoding='utf-8')
+    os.replace(temporary, path)
+
+
+def render_report_card(card, directory):
+    """Render one card to ``<student_id>.html`` in ``directory``; returns (student_id, file name)"""
+    filename = f'{card["student"]["student_id"]}.html'
+    _write_atomically(Path(directory) / filename, render_to_string('students/report_card.html', card))
+    return card['student']['student_id'], filename
+
+
+def _render_one(args):
+    return render_report_card(*args)
+
+
+def read_manifest(directory):
+    try:
+        with open(Path(directory) / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(directory, manifest):
+    _write_atomically(Path(directory) / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def generate_report_cards(semester, academic_year, workers=None, force=False, chunk_size=16):
+    """
+    Render the term's report cards across a process pool, skipping students
+    the manifest records as done unless ``force``. Yields (student_id,
+    file name) as each card is written.
+    """
+    directory = report_card_dir(semester, academic_year)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest = None if force else read_manifest(directory)
+    if manifest is None:
+        manifest = {'semester': semester, 'academic_year': academic_year, 'cards': {}}
+    done = {
+        student_id for student_id, filename in manifest['cards'].items()
+        if (directory / filename).exists()
+    }
+    manifest['cards'] = {student_id: manifest['cards'][student_id] for student_id in done}
+
+    cards = (
+        (card, directory) for card in cohort_report_cards(semester, academic_year)
+        if card['student']['student_id'] not in done
+    )
+    pending = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            for student_id, filename in pool.map(_render_one, cards, chunksize=chunk_size):
+                manifest['cards'][student_id] = filename
+                pending += 1
+                if pending >= MANIFEST_FLUSH_EVERY:
+                    _write_manifest(directory, manifest)
+                    pending = 0
+                yield student_id, filename
+    finally:
+        # Record what finished even when the run dies part way
+        manifest['updated_at'] = timezone.now().isoformat(timespec='seconds')
+        _write_manifest(directory, manifest)
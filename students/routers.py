@@ -0,0 +1,132 @@
+import asyncio
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+STICKY_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# The alias reads go to while a replica view runs; None leaves it to Django
+_read_alias = ContextVar('read_alias', default=None)
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica while a view decorated with
+    read_from_replica is running, and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+def replica_enabled():
+    return REPLICA in settings.DATABASES
+
+
+def _read_on(alias, iterator):
+    # Streaming responses are consumed after the view returns, so route the
+    # reads made while producing each chunk
+    iterator = iter(iterator)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+def _reads_from_replica(request):
+    return (
+        replica_enabled()
+        and request.method in SAFE_METHODS
+        and STICKY_COOKIE not in request.COOKIES
+    )
+
+
+def read_from_replica(view_func):
+    """
+    Run a read-only view, sync or async, against the replica. Requests that
+    write, and requests from a browser that wrote within the last
+    STUDENTS_REPLICA_STICKY_SECONDS, stay on the primary so users always
+    see their own changes.
+    """
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not _reads_from_replica(request):
+                return await view_func(request, *args, **kwargs)
+            # Worker threads started by the view copy this context
+            token = _read_alias.set(REPLICA)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _reads_from_replica(request):
+            return view_func(request, *args, **kwargs)
+
+        token = _read_alias.set(REPLICA)
+        try:
+            response = view_func(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+        if response.streaming:
+            response.streaming_content = _read_on(REPLICA, response.streaming_content)
+        return response
+    return wrapper
+
+
+class PinPrimaryAfterWriteMiddleware:
+    """
+    After a request that may have written, set a short-lived cookie that
+    keeps that browser's reads on the primary until the replica has caught up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.pin(request, await self.get_response(request))
+
+    def pin(self, request, response):
+        if replica_enabled() and request.method not in SAFE_METHODS:
+            response.set_cookie(
+                STICKY_COOKIE,
+                '1',
+                max_age=settings.STUDENTS_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
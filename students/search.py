@@ -0,0 +1,99 @@
+import re
+
+from django.db.models import Count, Q
+
+from .models import Course, Student, StudentSearchTerm
+
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'student_id', 'email')
+MAX_QUERY_TERMS = 8
+TERM_MAX_LENGTH = StudentSearchTerm._meta.get_field('term').max_length
+
+_WORD = re.compile(r'\w+')
+# A single word with a digit in it, like "0042" or "stu004"
+_ID_FRAGMENT = re.compile(r'\w*\d\w*')
+
+# Sorts after every character a term can contain, so [term, term + END)
+# is exactly the set of strings starting with term.
+_PREFIX_END = '\uffff'
+
+
+def tokenize(text):
+    """Split text into the lowercase words the index stores"""
+    return [word[:TERM_MAX_LENGTH] for word in _WORD.findall((text or '').lower())]
+
+
+def student_terms(student):
+    terms = set()
+    for field in SEARCH_FIELDS:
+        terms.update(tokenize(getattr(student, field)))
+    return terms
+
+
+def index_students(students):
+    """(Re)build the search terms for the given students"""
+    students = [student for student in students if student.pk is not None]
+    if not students:
+        return 0
+    StudentSearchTerm.objects.filter(student__in=[student.pk for student in students]).delete()
+    terms = [
+        StudentSearchTerm(student_id=student.pk, term=term)
+        for student in students
+        for term in student_terms(student)
+    ]
+    StudentSearchTerm.objects.bulk_create(terms, batch_size=1000)
+    return len(terms)
+
+
+def reindex_student_ids(student_ids):
+    student_ids = list(student_ids)
+    if student_ids:
+        index_students(Student.objects.filter(pk__in=student_ids).only('pk', *SEARCH_FIELDS))
+
+
+def _prefix_match(term, prefix='term'):
+    return Q(**{'%s__gte' % prefix: term, '%s__lt' % prefix: term + _PREFIX_END})
+
+
+def search_students(queryset, query, ranked=False):
+    """
+    Filter a Student queryset to rows where every word of ``query`` is a
+    prefix of some indexed word. A query that looks like part of a student
+    ID also matches IDs containing it anywhere, so "0042" finds "STU0042".
+    With ``ranked=True`` the results are ordered with exact word matches
+    first.
+    """
+    terms = tokenize(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return queryset
+
+    condition = Q()
+    for term in set(terms):
+        condition &= Q(pk__in=StudentSearchTerm.objects.filter(_prefix_match(term)).values('student_id'))
+    query = query.strip()
+    if _ID_FRAGMENT.fullmatch(query):
+        # A scan of the student table, but only for these short queries
+        condition |= Q(student_id__icontains=query)
+    queryset = queryset.filter(condition)
+
+    if ranked:
+        queryset = queryset.annotate(
+            search_rank=Count('search_terms', filter=Q(search_terms__term__in=terms))
+        ).order_by('-search_rank', 'last_name', 'first_name')
+    return queryset
+
+
+def search_related(queryset, query, student_path, course_path=None):
+    """
+    Filter a queryset of rows belonging to a student (enrollments, grades)
+    to those whose student matches ``query`` through the search index, or
+    whose course code starts with it when ``course_path`` is given.
+    """
+    if not tokenize(query):
+        return queryset
+    condition = Q(**{'%s__in' % student_path: search_students(Student.objects.all(), query).values('pk')})
+    if course_path:
+        courses = Course.objects.filter(course_code__istartswith=query.strip()).values('pk')
+        condition |= Q(**{'%s__in' % course_path: courses})
+    return queryset.filter(condition)
+
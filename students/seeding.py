@@ -0,0 +1,165 @@
+import datetime
+import random
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .gradebook import derive_letters
+from .importers import batched
+from .models import Course, Enrollment, Grade, Student
+
+
+FIRST_NAMES = [
+    'Aarav', 'Aisha', 'Ben', 'Chen', 'Diego', 'Emma', 'Farah', 'Grace', 'Hiro', 'Isla',
+    'Jamal', 'Kavya', 'Liam', 'Maya', 'Noah', 'Olga', 'Priya', 'Quinn', 'Rahul', 'Sara',
+    'Tomas', 'Uma', 'Vikram', 'Wen', 'Xavier', 'Yara', 'Zoe',
+]
+LAST_NAMES = [
+    'Ahmed', 'Brown', 'Chopra', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Hassan', 'Ito',
+    'Jones', 'Kumar', 'Lopez', 'Martin', 'Nguyen', 'Okafor', 'Patel', 'Rossi', 'Singh',
+    'Tanaka', 'Umar', 'Varga', 'Wang', 'Yilmaz', 'Zhang',
+]
+SUBJECTS = [
+    'Algebra', 'Biology', 'Chemistry', 'Databases', 'Economics', 'Film Studies', 'Geography',
+    'History', 'Informatics', 'Journalism', 'Linguistics', 'Marketing', 'Networks', 'Optics',
+    'Physics', 'Statistics',
+]
+ACADEMIC_YEARS = ['2021-2022', '2022-2023', '2023-2024', '2024-2025']
+SEMESTERS = [code for code, _ in Enrollment.SEMESTER_CHOICES]
+
+
+def _random_date(rng, start, days):
+    return start + datetime.timedelta(days=rng.randrange(days))
+
+
+@contextmanager
+def explicit_dates(model, *field_names):
+    """Let bulk_create() keep the values we set on auto_now_add fields"""
+    fields = [model._meta.get_field(name) for name in field_names]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def seed_courses(rng, count, prefix):
+    courses = []
+    for i in range(count):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        courses.append(Course(
+            course_code=f'{prefix}C{i:05d}',
+            course_name=f'{subject} {100 + i}',
+            description=f'Synthetic course covering {subject.lower()}.',
+            credits=rng.choice([2, 3, 3, 4, 4, 5]),
+            level=rng.choice(Course.LEVEL_CHOICES)[0],
+            duration_months=rng.choice([3, 6, 12]),
+            fee=Decimal(rng.randrange(200, 3000)),
+            is_active=rng.random() < 0.9,
+        ))
+    return Course.objects.bulk_create(courses)
+
+
+def seed_students(rng, count, prefix, batch_size):
+    """Insert students in batches; returns their primary keys"""
+    now = timezone.now()
+    pks = []
+    for batch in batched(range(count), batch_size):
+        students = []
+        for i in batch:
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created_at = now - datetime.timedelta(minutes=rng.randrange(60 * 24 * 365 * 4))
+            students.append(Student(
+                student_id=f'{prefix}{i:07d}',
+                first_name=first,
+                last_name=last,
+                email=f'{first}.{last}.{prefix}{i}@example.com'.lower(),
+                phone=f'555{rng.randrange(10 ** 7):07d}',
+                address=f'{rng.randrange(1, 999)} Synthetic Street',
+                date_of_birth=_random_date(rng, datetime.date(1995, 1, 1), 365 * 10),
+                gender=rng.choice('MMFFO'),
+                status=rng.choices('AIGT', weights=[80, 8, 10, 2])[0],
+                emergency_contact_name=f'{rng.choice(FIRST_NAMES)} {last}',
+                emergency_contact_phone=f'555{rng.randrange(10 ** 7):07d}',
+                created_at=created_at,
+                enrollment_date=created_at.date(),
+            ))
+        with transaction.atomic(), explicit_dates(Student, 'created_at', 'enrollment_date'):
+            Student.objects.bulk_create(students)
+        pks.extend(student.pk for student in students)
+    return pks
+
+
+def seed_enrollments(rng, student_pks, courses, per_student, batch_size):
+    """Enroll every student in ``per_student`` distinct courses; returns the enrollment keys"""
+    course_pks = [course.pk for course in courses]
+    per_student = min(per_student, len(course_pks))
+    pks = []
+    for batch in batched(student_pks, max(1, batch_size // max(per_student, 1))):
+        enrollments = []
+        for student_pk in batch:
+            for course_pk in rng.sample(course_pks, per_student):
+                academic_year = rng.choice(ACADEMIC_YEARS)
+                enrollments.append(Enrollment(
+                    student_id=student_pk,
+                    course_id=course_pk,
+                    semester=rng.choice(SEMESTERS),
+                    academic_year=academic_year,
+                    enrollment_date=_random_date(rng, datetime.date(int(academic_year[:4]), 8, 1), 60),
+                    is_active=rng.random() < 0.85,
+                ))
+        with transaction.atomic(), explicit_dates(Enrollment, 'enrollment_date'):
+            Enrollment.objects.bulk_create(enrollments)
+        pks.extend(enrollment.pk for enrollment in enrollments)
+    return pks
+
+
+def seed_grades(rng, enrollment_pks, count, batch_size):
+    """Spread ``count`` grades over the enrollments, letters derived from the marks"""
+    if not enrollment_pks:
+        return 0
+    for batch in batched(range(count), batch_size):
+        marks = [Decimal(min(100, max(0, round(rng.gauss(68, 15))))) for _ in batch]
+        letters = derive_letters(marks, 100)
+        grades = [
+            Grade(
+                enrollment_id=rng.choice(enrollment_pks),
+                marks_obtained=mark,
+                total_marks=Decimal(100),
+                grade=letter,
+                exam_date=_random_date(rng, datetime.date(2021, 9, 1), 365 * 4),
+            )
+            for mark, letter in zip(marks, letters)
+        ]
+        with transaction.atomic():
+            Grade.objects.bulk_create(grades)
+    return count
+
+
+def seed(students, courses, grades, enrollments_per_student=4, seed=42, prefix='BN', batch_size=2000):
+    """
+    Generate a reproducible synthetic dataset: the same arguments always
+    produce the same rows. Returns the number of rows of each kind inserted.
+    """
+    rng = random.Random(seed)
+    course_objs = seed_courses(rng, courses, prefix)
+    student_pks = seed_students(rng, students, prefix, batch_size)
+    enrollment_pks = seed_enrollments(rng, student_pks, course_objs, enrollments_per_student, batch_size)
+    grade_count = seed_grades(rng, enrollment_pks, grades, batch_size)
+    return {
+        'courses': len(course_objs),
+        'students': len(student_pks),
+        'enrollments': len(enrollment_pks),
+        'grades': grade_count,
+    }
+
+
+def flush(prefix='BN'):
+    """Delete everything a previous seed with this prefix created"""
+    students = Student.objects.filter(student_id__startswith=prefix).delete()[0]
+    courses = Course.objects.filter(course_code__startswith=prefix).delete()[0]
+    return students + courses
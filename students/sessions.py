@@ -0,0 +1,37 @@
+"""
+Sessions read from the cache and written through to the database.
+
+Django's cached_db engine keeps a cached session for as long as the session
+itself lives. With a cache local to each process that is too long: a
+logout in one worker would leave the session alive in the others. Here the
+cached copy expires after STUDENTS_SESSION_CACHE_SECONDS, so another
+process honours a logout or a rotated key within that time, and the
+database stays the source of truth.
+"""
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+
+class _ShortLivedCache:
+    """A cache whose entries live no longer than ``timeout`` seconds"""
+
+    def __init__(self, cache, timeout):
+        self._cache = cache
+        self._timeout = timeout
+
+    def set(self, key, value, timeout=None):
+        if timeout is None or timeout > self._timeout:
+            timeout = self._timeout
+        return self._cache.set(key, value, timeout)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+
+class SessionStore(cached_db.SessionStore):
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = _ShortLivedCache(self._cache, settings.STUDENTS_SESSION_CACHE_SECONDS)
@@ -0,0 +1,215 @@
+import logging
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from PIL import Image
+
+from .auth import invalidate_user
+from .counters import adjust_course_counters
+from .models import Course, Enrollment, Grade, Student
+from .search import SEARCH_FIELDS, index_students
+from .stats import adjust_stats, course_deltas, enrollment_deltas, student_deltas
+from .thumbnails import make_thumbnails
+from .transcripts import invalidate_all_transcripts, invalidate_transcripts
+
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_loaded_values(instance, fields):
+    """Make sure we know what an existing row looked like before this save"""
+    if instance._state.adding or all(instance.has_loaded_value(field) for field in fields):
+        return
+    row = type(instance)._base_manager.filter(pk=instance.pk).values(*fields).first()
+    instance._loaded_values = dict(getattr(instance, '_loaded_values', {}), **(row or {}))
+
+
+def refresh_loaded_values(instance, origin, fields):
+    """
+    Re-read a row that is deleted directly, since the instance may be stale.
+
+    Rows reached through a cascade or QuerySet.delete() were just fetched by
+    the deletion collector, so their loaded values are already current.
+    """
+    if origin is not instance:
+        return
+    row = type(instance)._base_manager.filter(pk=instance.pk).values(*fields).first()
+    if row:
+        instance._loaded_values = dict(getattr(instance, '_loaded_values', {}), **row)
+
+
+def saved_deltas(instance, created, fields, deltas_for):
+    """Stats changes for a save: the new values in, the previous values out"""
+    deltas = Counter(deltas_for(*(getattr(instance, field) for field in fields), 1))
+    if not created and all(instance.has_loaded_value(field) for field in fields):
+        deltas.update(deltas_for(*(instance.loaded_value(field) for field in fields), -1))
+    return deltas
+
+
+def deleted_deltas(instance, fields, deltas_for):
+    values = (instance.loaded_value(field, getattr(instance, field)) for field in fields)
+    return deltas_for(*values, -1)
+
+
+STUDENT_STATS_FIELDS = ('status', 'gender')
+STUDENT_FIELDS = STUDENT_STATS_FIELDS + SEARCH_FIELDS + ('profile_picture',)
+COURSE_FIELDS = ('is_active',)
+ENROLLMENT_FIELDS = ('course_id', 'is_active', 'student_id', 'semester', 'academic_year')
+
+
+@receiver(pre_save, sender=Student)
+def load_student_state(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    ensure_loaded_values(instance, STUDENT_FIELDS)
+    if (instance.profile_picture.name or '') != (instance.loaded_value('profile_picture') or ''):
+        # A new picture has no thumbnails until make_profile_thumbnails writes them
+        instance.has_thumbnails = False
+
+
+@receiver(post_save, sender=Student)
+def make_profile_thumbnails(sender, instance, raw, **kwargs):
+    # Runs before update_stats_on_student_save replaces the loaded values
+    name = instance.profile_picture.name
+    if raw or not name or name == instance.loaded_value('profile_picture'):
+        return
+    try:
+        make_thumbnails(name)
+    except (OSError, Image.DecompressionBombError):
+        # Saving the student must not fail over a thumbnail; regenerate_thumbnails can retry
+        logger.exception('Could not make thumbnails for %s', name)
+        return
+    Student.objects.filter(pk=instance.pk).update(has_thumbnails=True)
+    instance.has_thumbnails = True
+
+
+@receiver(post_save, sender=Student)
+def update_stats_on_student_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    adjust_stats(saved_deltas(instance, created, STUDENT_STATS_FIELDS, student_deltas))
+    if created or any(
+        instance.loaded_value(field) != getattr(instance, field) for field in SEARCH_FIELDS
+    ):
+        index_students([instance])
+    instance.remember_loaded_values()
+
+
+@receiver(pre_delete, sender=Student)
+def refresh_student_before_delete(sender, instance, origin=None, **kwargs):
+    refresh_loaded_values(instance, origin, STUDENT_STATS_FIELDS)
+
+
+@receiver(post_delete, sender=Student)
+def update_stats_on_student_delete(sender, instance, **kwargs):
+    adjust_stats(deleted_deltas(instance, STUDENT_STATS_FIELDS, student_deltas))
+
+
+@receiver(pre_save, sender=Course)
+def load_course_state(sender, instance, raw, **kwargs):
+    if not raw:
+        ensure_loaded_values(instance, COURSE_FIELDS + ('credits',))
+
+
+@receiver(post_save, sender=Course)
+def update_stats_on_course_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    adjust_stats(saved_deltas(instance, created, COURSE_FIELDS, course_deltas))
+    if not created and instance.loaded_value('credits') != instance.credits:
+        invalidate_all_transcripts()
+    instance.remember_loaded_values()
+
+
+@receiver(pre_delete, sender=Course)
+def refresh_course_before_delete(sender, instance, origin=None, **kwargs):
+    refresh_loaded_values(instance, origin, COURSE_FIELDS)
+
+
+@receiver(post_delete, sender=Course)
+def update_stats_on_course_delete(sender, instance, **kwargs):
+    adjust_stats(deleted_deltas(instance, COURSE_FIELDS, course_deltas))
+
+
+@receiver(pre_save, sender=Enrollment)
+def load_enrollment_state(sender, instance, raw, **kwargs):
+    if not raw:
+        ensure_loaded_values(instance, ENROLLMENT_FIELDS)
+
+
+@receiver(post_save, sender=Enrollment)
+def update_counters_on_enrollment_save(sender, instance, created, raw, **kwargs):
+    """Keep Course enrollment counters and dashboard stats in step with this enrollment"""
+    if raw:
+        return
+
+    if created or not instance.has_loaded_value('course_id'):
+        adjust_course_counters(instance.course_id, total=1, active=int(instance.is_active))
+    else:
+        old_course_id = instance.loaded_value('course_id')
+        old_active = int(bool(instance.loaded_value('is_active')))
+        new_active = int(bool(instance.is_active))
+        if old_course_id != instance.course_id:
+            adjust_course_counters(old_course_id, total=-1, active=-old_active)
+            adjust_course_counters(instance.course_id, total=1, active=new_active)
+        elif old_active != new_active:
+            adjust_course_counters(instance.course_id, active=new_active - old_active)
+
+    adjust_stats(saved_deltas(instance, created, ('is_active',), enrollment_deltas))
+    if not created:
+        invalidate_transcripts({instance.student_id, instance.loaded_value('student_id', instance.student_id)})
+    instance.remember_loaded_values()
+
+
+@receiver(pre_delete, sender=Enrollment)
+def refresh_enrollment_before_delete(sender, instance, origin=None, **kwargs):
+    refresh_loaded_values(instance, origin, ENROLLMENT_FIELDS)
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_counters_on_enrollment_delete(sender, instance, **kwargs):
+    course_id = instance.loaded_value('course_id', instance.course_id)
+    is_active = instance.loaded_value('is_active', instance.is_active)
+    adjust_course_counters(course_id, total=-1, active=-int(bool(is_active)))
+    adjust_stats(enrollment_deltas(is_active, -1))
+    invalidate_transcripts([instance.loaded_value('student_id', instance.student_id)])
+
+
+@receiver(pre_save, sender=Grade)
+def load_grade_state(sender, instance, raw, **kwargs):
+    if not raw:
+        ensure_loaded_values(instance, ('enrollment_id',))
+
+
+def invalidate_grade_transcripts(instance):
+    """Drop the stored transcript of the student (or students) a grade belongs to"""
+    enrollment_ids = {instance.enrollment_id, instance.loaded_value('enrollment_id', instance.enrollment_id)}
+    invalidate_transcripts(
+        Enrollment.objects.filter(pk__in=enrollment_ids).order_by().values_list('student_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Grade)
+def update_transcript_on_grade_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    invalidate_grade_transcripts(instance)
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Grade)
+def update_transcript_on_grade_delete(sender, instance, origin=None, **kwargs):
+    # Cascades are covered by the enrollment's receiver, QuerySet.delete() by GradeQuerySet
+    if origin is instance:
+        invalidate_grade_transcripts(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    # Password changes, deactivation and the staff and superuser flags all
+    # arrive as saves, as does the last_login update on every login
+    invalidate_user(instance.pk)
+
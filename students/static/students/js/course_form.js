@@ -0,0 +1,34 @@
+// Format currency input
+document.getElementById('id_fee').addEventListener('input', function(e) {
+    let value = e.target.value.replace(/[^0-9.]/g, '');
+    if (value.includes('.')) {
+        let parts = value.split('.');
+        if (parts[1].length > 2) {
+            parts[1] = parts[1].substring(0, 2);
+        }
+        value = parts[0] + '.' + parts[1];
+    }
+    e.target.value = value;
+});
+
+// Auto-generate course code suggestion
+document.getElementById('id_course_name').addEventListener('blur', function(e) {
+    const courseName = e.target.value;
+    const courseCodeField = document.getElementById('id_course_code');
+
+    if (courseName && !courseCodeField.value) {
+        // Generate course code from course name
+        let code = courseName.toUpperCase().substring(0, 3);
+        code += Math.floor(Math.random() * 1000).toString().padStart(3, '0');
+        courseCodeField.value = code;
+    }
+});
+
+// Validate credits
+document.getElementById('id_credits').addEventListener('blur', function(e) {
+    const credits = parseInt(e.target.value);
+    if (credits < 1 || credits > 30) {
+        alert('Credits must be between 1 and 30');
+        e.target.focus();
+    }
+});
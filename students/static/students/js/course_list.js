@@ -0,0 +1,82 @@
+// Toggle between grid and table view
+const toggleView = document.getElementById('toggleView');
+const gridView = document.querySelector('.row.mb-4');
+const tableView = document.querySelector('.table-responsive');
+
+toggleView.addEventListener('change', function() {
+    if (this.checked) {
+        gridView.style.display = 'flex';
+        tableView.parentElement.parentElement.style.display = 'none';
+    } else {
+        gridView.style.display = 'none';
+        tableView.parentElement.parentElement.style.display = 'block';
+    }
+});
+
+// Search functionality
+const searchInput = document.querySelector('input[type="text"]');
+searchInput.addEventListener('input', function() {
+    const searchTerm = this.value.toLowerCase();
+    const cards = document.querySelectorAll('.course-card');
+    const rows = document.querySelectorAll('tbody tr');
+
+    // Search in grid view
+    cards.forEach(card => {
+        const text = card.textContent.toLowerCase();
+        card.parentElement.style.display = text.includes(searchTerm) ? 'block' : 'none';
+    });
+
+    // Search in table view
+    rows.forEach(row => {
+        const text = row.textContent.toLowerCase();
+        row.style.display = text.includes(searchTerm) ? '' : 'none';
+    });
+});
+
+// Filter by level
+document.querySelectorAll('select').forEach(select => {
+    select.addEventListener('change', function() {
+        const level = this.value;
+        const cards = document.querySelectorAll('.course-card');
+        const rows = document.querySelectorAll('tbody tr');
+
+        if (!level) {
+            cards.forEach(card => card.parentElement.style.display = 'block');
+            rows.forEach(row => row.style.display = '');
+            return;
+        }
+
+        // Filter in grid view
+        cards.forEach(card => {
+            const badge = card.querySelector('.badge.bg-info');
+            const cardLevel = badge ? badge.textContent.trim() : '';
+            card.parentElement.style.display = cardLevel.includes(level) ? 'block' : 'none';
+        });
+
+        // Filter in table view
+        rows.forEach(row => {
+            const cells = row.querySelectorAll('td');
+            const rowLevel = cells[3] ? cells[3].textContent.trim() : '';
+            row.style.display = rowLevel.includes(level) ? '' : 'none';
+        });
+    });
+});
+
+// Course status toggle
+document.querySelectorAll('.course-card .btn-outline-warning').forEach(button => {
+    button.addEventListener('click', function(e) {
+        e.preventDefault();
+        const card = this.closest('.course-card');
+        const badge = card.querySelector('.badge');
+        const isActive = badge.classList.contains('bg-success');
+
+        if (confirm(`Are you sure you want to ${isActive ? 'deactivate' : 'activate'} this course?`)) {
+            // In a real application, make an AJAX request here
+            badge.textContent = isActive ? 'Inactive' : 'Active';
+            badge.className = `badge bg-${isActive ? 'danger' : 'success'}`;
+
+            // Show success message
+            alert(`Course ${isActive ? 'deactivated' : 'activated'} successfully!`);
+        }
+    });
+});
@@ -0,0 +1,76 @@
+// Student selection preview
+const studentSelect = document.getElementById('id_student');
+const studentPreview = document.getElementById('student-preview');
+const studentName = document.getElementById('student-name');
+const studentId = document.getElementById('student-id');
+const studentEmail = document.getElementById('student-email');
+const studentAvatar = studentPreview.querySelector('.avatar-placeholder');
+
+studentSelect.addEventListener('change', function() {
+    const selectedOption = this.options[this.selectedIndex];
+    const studentData = selectedOption.text.split(' - ');
+
+    if (studentData.length > 1) {
+        studentName.textContent = studentData[1];
+        studentId.textContent = `ID: ${studentData[0]}`;
+        studentEmail.textContent = `Email: ${selectedOption.dataset.email || '--'}`;
+
+        // Update avatar
+        const initials = studentData[1].split(' ').map(n => n[0]).join('');
+        studentAvatar.textContent = initials;
+
+        studentPreview.style.display = 'block';
+    } else {
+        studentPreview.style.display = 'none';
+    }
+});
+
+// Course selection preview
+const courseSelect = document.getElementById('id_course');
+const coursePreview = document.getElementById('course-preview');
+const courseName = document.getElementById('course-name');
+const courseCode = document.getElementById('course-code');
+const courseDuration = document.getElementById('course-duration');
+const courseFee = document.getElementById('course-fee');
+
+courseSelect.addEventListener('change', function() {
+    const selectedOption = this.options[this.selectedIndex];
+    const courseData = selectedOption.text.split(' - ');
+
+    if (courseData.length > 1) {
+        courseName.textContent = courseData[1];
+        courseCode.textContent = `Code: ${courseData[0]}`;
+        courseDuration.textContent = `Duration: ${selectedOption.dataset.duration || '--'} months`;
+        courseFee.textContent = `Fee: $${selectedOption.dataset.fee || '--'}`;
+
+        coursePreview.style.display = 'block';
+    } else {
+        coursePreview.style.display = 'none';
+    }
+});
+
+// Auto-set academic year
+const academicYearField = document.getElementById('id_academic_year');
+const currentYear = new Date().getFullYear();
+academicYearField.value = `${currentYear}-${currentYear + 1}`;
+
+// Auto-set enrollment date to today
+const enrollmentDateField = document.getElementById('id_enrollment_date');
+if (enrollmentDateField) {
+    const today = new Date().toISOString().split('T')[0];
+    enrollmentDateField.value = today;
+}
+
+// Validation: Check for duplicate enrollment
+document.querySelector('form').addEventListener('submit', function(e) {
+    const student = studentSelect.value;
+    const course = courseSelect.value;
+    const semester = document.getElementById('id_semester').value;
+    const academicYear = academicYearField.value;
+
+    if (student && course && semester && academicYear) {
+        // In a real application, you would make an AJAX call here
+        // to check for duplicate enrollment on the server
+        console.log('Checking for duplicate enrollment...');
+    }
+});
@@ -0,0 +1,33 @@
+// Select all functionality
+document.getElementById('select-all').addEventListener('change', function() {
+    const checkboxes = document.querySelectorAll('.enrollment-checkbox');
+    checkboxes.forEach(checkbox => {
+        checkbox.checked = this.checked;
+    });
+    toggleBatchActions();
+});
+
+// Individual checkbox change
+document.querySelectorAll('.enrollment-checkbox').forEach(checkbox => {
+    checkbox.addEventListener('change', toggleBatchActions);
+});
+
+function toggleBatchActions() {
+    const anyChecked = Array.from(document.querySelectorAll('.enrollment-checkbox'))
+        .some(checkbox => checkbox.checked);
+
+    const batchActions = document.getElementById('batch-actions');
+    if (anyChecked) {
+        batchActions.classList.remove('d-none');
+    } else {
+        batchActions.classList.add('d-none');
+    }
+}
+
+// Show/hide actions
+document.getElementById('show-actions').addEventListener('change', function() {
+    const checkboxes = document.querySelectorAll('.enrollment-checkbox');
+    checkboxes.forEach(checkbox => {
+        checkbox.style.display = this.checked ? 'block' : 'none';
+    });
+});
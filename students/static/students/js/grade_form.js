@@ -0,0 +1,148 @@
+// Grade calculation
+const marksInput = document.getElementById('id_marks_obtained');
+const totalMarksInput = document.getElementById('id_total_marks');
+const gradeSelect = document.getElementById('id_grade');
+const gradePreview = document.getElementById('grade-preview');
+const gradeLetterDisplay = document.getElementById('grade-letter');
+const gradeDescription = document.getElementById('grade-description');
+
+// Calculator inputs
+const marksCalculator = document.getElementById('marks-obtained-input');
+const totalMarksCalculator = document.getElementById('total-marks-input');
+const percentageOutput = document.getElementById('percentage-output');
+
+// Calculate percentage
+function calculatePercentage(marks, total) {
+    if (total > 0) {
+        return (marks / total) * 100;
+    }
+    return 0;
+}
+
+// Determine grade from percentage
+function determineGrade(percentage) {
+    if (percentage >= 90) return 'A';
+    if (percentage >= 80) return 'B';
+    if (percentage >= 70) return 'C';
+    if (percentage >= 60) return 'D';
+    if (percentage >= 50) return 'E';
+    return 'F';
+}
+
+// Get grade description
+function getGradeDescription(grade) {
+    const descriptions = {
+        'A': 'Excellent (90-100%)',
+        'B': 'Good (80-89%)',
+        'C': 'Satisfactory (70-79%)',
+        'D': 'Pass (60-69%)',
+        'E': 'Marginal (50-59%)',
+        'F': 'Fail (Below 50%)'
+    };
+    return descriptions[grade] || 'No grade';
+}
+
+// Update grade display
+function updateGradeDisplay(percentage) {
+    const grade = determineGrade(percentage);
+    const description = getGradeDescription(grade);
+
+    // Update preview
+    gradeLetterDisplay.textContent = grade;
+    gradeDescription.textContent = description;
+
+    // Update select
+    gradeSelect.value = grade;
+
+    // Update preview colors
+    gradePreview.className = 'card mt-3 grade-' + grade.toLowerCase();
+
+    // Update calculator
+    percentageOutput.value = percentage.toFixed(2) + '%';
+}
+
+// Event listeners for auto-calculation
+function setupGradeCalculation() {
+    // Form field listeners
+    [marksInput, totalMarksInput].forEach(input => {
+        input.addEventListener('input', function() {
+            const marks = parseFloat(marksInput.value) || 0;
+            const total = parseFloat(totalMarksInput.value) || 100;
+            const percentage = calculatePercentage(marks, total);
+            updateGradeDisplay(percentage);
+
+            // Sync with calculator
+            marksCalculator.value = marks;
+            totalMarksCalculator.value = total;
+        });
+    });
+
+    // Calculator listeners
+    [marksCalculator, totalMarksCalculator].forEach(input => {
+        input.addEventListener('input', function() {
+            const marks = parseFloat(marksCalculator.value) || 0;
+            const total = parseFloat(totalMarksCalculator.value) || 100;
+            const percentage = calculatePercentage(marks, total);
+
+            // Update form fields
+            marksInput.value = marks;
+            totalMarksInput.value = total;
+
+            updateGradeDisplay(percentage);
+        });
+    });
+
+    // Initialize with current values
+    const marks = parseFloat(marksInput.value) || 0;
+    const total = parseFloat(totalMarksInput.value) || 100;
+    const percentage = calculatePercentage(marks, total);
+    updateGradeDisplay(percentage);
+}
+
+// Enrollment preview
+const enrollmentSelect = document.getElementById('id_enrollment');
+const enrollmentPreview = document.getElementById('enrollment-preview');
+const studentName = document.getElementById('student-name');
+const courseName = document.getElementById('course-name');
+const semesterInfo = document.getElementById('semester-info');
+const academicYear = document.getElementById('academic-year');
+const currentGrade = document.getElementById('current-grade');
+
+enrollmentSelect.addEventListener('change', function() {
+    const selectedOption = this.options[this.selectedIndex];
+
+    // The autocomplete puts the enrollment's details on its option
+    if (selectedOption && selectedOption.value && selectedOption.dataset.student) {
+        studentName.textContent = selectedOption.dataset.student;
+        courseName.textContent = `Course: ${selectedOption.dataset.course}`;
+        semesterInfo.textContent = `Semester: ${selectedOption.dataset.semester}`;
+        academicYear.textContent = `Academic Year: ${selectedOption.dataset.year}`;
+
+        enrollmentPreview.style.display = 'block';
+
+        // Update stats
+        updateStats(selectedOption.value);
+    } else {
+        enrollmentPreview.style.display = 'none';
+    }
+});
+
+// Update statistics
+function updateStats(enrollmentId) {
+    // In a real application, you would fetch this data via AJAX
+    // For now, we'll use dummy data
+    document.getElementById('student-count').textContent = '45';
+    document.getElementById('average-grade').textContent = 'B+';
+    document.getElementById('pass-rate').textContent = '92%';
+    document.getElementById('top-grade').textContent = 'A';
+}
+
+// Auto-set exam date to today
+const examDateField = document.getElementById('id_exam_date');
+if (examDateField) {
+    const today = new Date().toISOString().split('T')[0];
+    examDateField.value = today;
+}
+
+// Initialize on page load
+setupGradeCalculation();
@@ -0,0 +1,113 @@
+// Grade Distribution Chart
+const gradeCtx = document.getElementById('gradeDistributionChart').getContext('2d');
+const gradeChart = new Chart(gradeCtx, {
+    type: 'pie',
+    data: {
+        labels: ['A (90-100%)', 'B (80-89%)', 'C (70-79%)', 'D (60-69%)', 'E (50-59%)', 'F (<50%)'],
+        datasets: [{
+            data: JSON.parse(document.getElementById('grade-distribution-data').textContent),
+            backgroundColor: [
+                '#1cc88a',
+                '#36b9cc',
+                '#4e73df',
+                '#f6c23e',
+                '#fd7e14',
+                '#e74a3b'
+            ],
+            borderWidth: 2,
+            borderColor: '#fff'
+        }]
+    },
+    options: {
+        responsive: true,
+        plugins: {
+            legend: {
+                display: false
+            },
+            tooltip: {
+                callbacks: {
+                    label: function(context) {
+                        return `${context.label}: ${context.raw}`;
+                    }
+                }
+            }
+        }
+    }
+});
+
+// Course Performance Chart
+const courseCtx = document.getElementById('coursePerformanceChart').getContext('2d');
+const courseChart = new Chart(courseCtx, {
+    type: 'bar',
+    data: {
+        labels: ['Math 101', 'Physics 101', 'Chemistry 101', 'Biology 101', 'Computer Science'],
+        datasets: [{
+            label: 'Average Score',
+            data: [85, 78, 92, 88, 95],
+            backgroundColor: '#4e73df',
+            borderColor: '#2e59d9',
+            borderWidth: 1
+        }]
+    },
+    options: {
+        responsive: true,
+        scales: {
+            y: {
+                beginAtZero: true,
+                max: 100,
+                title: {
+                    display: true,
+                    text: 'Percentage (%)'
+                }
+            }
+        },
+        plugins: {
+            legend: {
+                display: false
+            }
+        }
+    }
+});
+
+// Semester Comparison Chart
+const semesterCtx = document.getElementById('semesterComparisonChart').getContext('2d');
+const semesterChart = new Chart(semesterCtx, {
+    type: 'line',
+    data: {
+        labels: ['Sem 1', 'Sem 2', 'Sem 3', 'Sem 4'],
+        datasets: [{
+            label: 'Average Grade',
+            data: [78, 82, 85, 88],
+            borderColor: '#1cc88a',
+            backgroundColor: 'rgba(28, 200, 138, 0.1)',
+            borderWidth: 3,
+            fill: true,
+            tension: 0.4
+        }]
+    },
+    options: {
+        responsive: true,
+        scales: {
+            y: {
+                beginAtZero: true,
+                max: 100,
+                title: {
+                    display: true,
+                    text: 'Percentage (%)'
+                }
+            }
+        }
+    }
+});
+
+// Search within the current page
+const searchInput = document.getElementById('grade-search');
+searchInput.addEventListener('input', function() {
+    const searchTerm = this.value.toLowerCase();
+    const rows = document.querySelectorAll('tbody tr');
+
+    rows.forEach(row => {
+        const text = row.textContent.toLowerCase();
+        row.style.display = text.includes(searchTerm) ? '' : 'none';
+    });
+});
@@ -0,0 +1,37 @@
+// Poll until the job finishes; the page can be closed and reopened meanwhile
+(function() {
+    const card = document.getElementById('job');
+    const badges = { succeeded: 'bg-success', failed: 'bg-danger' };
+
+    function update(data) {
+        const status = document.getElementById('job-status');
+        status.textContent = data.status.charAt(0).toUpperCase() + data.status.slice(1);
+        status.className = 'badge ' + (badges[data.status] || 'bg-secondary');
+        document.getElementById('job-attempts').textContent = data.attempts;
+        if (data.download_url) {
+            const download = document.getElementById('job-download');
+            download.href = data.download_url;
+            download.classList.remove('d-none');
+        }
+        if (data.status === 'failed') {
+            document.getElementById('job-error').classList.remove('d-none');
+        }
+        document.getElementById('job-spinner').classList.toggle('d-none', data.finished);
+    }
+
+    function poll() {
+        fetch(card.dataset.statusUrl, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(data => {
+                update(data);
+                if (!data.finished) {
+                    setTimeout(poll, 2000);
+                }
+            })
+            .catch(() => setTimeout(poll, 5000));
+    }
+
+    if (card.dataset.finished !== 'true') {
+        poll();
+    }
+})();
@@ -0,0 +1,54 @@
+// Auto-focus on username field
+document.getElementById('id_username').focus();
+
+// Show/hide password functionality
+const passwordField = document.getElementById('id_password');
+const togglePassword = document.createElement('span');
+togglePassword.className = 'position-absolute end-0 top-50 translate-middle-y me-3';
+togglePassword.style.cursor = 'pointer';
+togglePassword.innerHTML = '<i class="fas fa-eye"></i>';
+
+togglePassword.addEventListener('click', function() {
+    const type = passwordField.getAttribute('type') === 'password' ? 'text' : 'password';
+    passwordField.setAttribute('type', type);
+    this.innerHTML = type === 'password' ? '<i class="fas fa-eye"></i>' : '<i class="fas fa-eye-slash"></i>';
+});
+
+passwordField.parentNode.style.position = 'relative';
+passwordField.parentNode.appendChild(togglePassword);
+
+// Form validation
+const form = document.querySelector('form');
+form.addEventListener('submit', function(e) {
+    const username = document.getElementById('id_username').value;
+    const password = document.getElementById('id_password').value;
+
+    if (!username || !password) {
+        e.preventDefault();
+        if (!username) {
+            document.getElementById('id_username').classList.add('is-invalid');
+        }
+        if (!password) {
+            document.getElementById('id_password').classList.add('is-invalid');
+        }
+
+        // Show error message
+        const errorDiv = document.createElement('div');
+        errorDiv.className = 'alert alert-danger mt-3';
+        errorDiv.innerHTML = '<i class="fas fa-exclamation-circle"></i> Please fill in all required fields.';
+
+        const existingError = document.querySelector('.alert-danger');
+        if (!existingError) {
+            form.insertBefore(errorDiv, form.firstChild);
+        }
+    }
+});
+
+// Remove invalid class on input
+document.getElementById('id_username').addEventListener('input', function() {
+    this.classList.remove('is-invalid');
+});
+
+document.getElementById('id_password').addEventListener('input', function() {
+    this.classList.remove('is-invalid');
+});
@@ -90,6 +90,24 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // Bulk status updates for the selected rows
+    var bulkStatusButtons = document.querySelectorAll('.bulk-status-btn');
+    bulkStatusButtons.forEach(function(button) {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            var ids = Array.from(document.querySelectorAll(this.dataset.checkboxes + ':checked'))
+                .map(function(checkbox) { return parseInt(checkbox.value, 10); });
+            if (ids.length === 0) {
+                showToast('Select at least one row first', 'warning');
+                return;
+            }
+            var payload = { ids: ids };
+            var value = this.dataset.value;
+            payload[this.dataset.field] = value === 'true' ? true : value === 'false' ? false : value;
+            bulkUpdateStatus(this.dataset.url, payload);
+        });
+    });
+
     // Export data functionality
     var exportButtons = document.querySelectorAll('.export-btn');
     exportButtons.forEach(function(button) {
@@ -101,6 +119,18 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
 
+    // Large exports run as background jobs; follow the job to its page
+    var backgroundExportButtons = document.querySelectorAll('.background-export-btn');
+    backgroundExportButtons.forEach(function(button) {
+        button.addEventListener('click', function(e) {
+            e.preventDefault();
+            exportInBackground(this.dataset.url, this.dataset.format || 'csv');
+        });
+    });
+
+    // Selects over large tables load their options as the user types
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(initAutocomplete);
+
     // Print functionality
     var printButtons = document.querySelectorAll('.print-btn');
     printButtons.forEach(function(button) {
@@ -205,6 +235,30 @@ function updateStudentStatus(studentId, newStatus) {
     });
 }
 
+function bulkUpdateStatus(url, payload) {
+    fetch(url, {
+        method: 'PATCH',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCookie('csrftoken')
+        },
+        body: JSON.stringify(payload)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            showToast(`${data.updated} record(s) updated`, 'success');
+            window.location.reload();
+        } else {
+            showToast(data.error || 'Failed to update records', 'danger');
+        }
+    })
+    .catch(error => {
+        showToast('Error updating records', 'danger');
+        console.error('Error:', error);
+    });
+}
+
 function updateBadgeAppearance(badge, status) {
     var statusMap = {
         'A': { class: 'bg-success', text: 'Active' },
@@ -232,6 +286,113 @@ function exportData(type, format) {
     window.open(url, '_blank');
 }
 
+function exportInBackground(url, format) {
+    // Same filters as exportData, sent to the job endpoint
+    var searchParams = new URLSearchParams(window.location.search);
+    searchParams.set('format', format);
+    
+    fetch(`${url}?${searchParams.toString()}`, {
+        method: 'POST',
+        headers: {
+            'X-CSRFToken': getCookie('csrftoken')
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        window.location.href = data.url;
+    })
+    .catch(error => {
+        showToast('Could not start the export', 'danger');
+        console.error('Error:', error);
+    });
+}
+
+function initAutocomplete(select) {
+    // The select stays in the form and submits the value; a search box and
+    // a result list sit next to it, and picking a result becomes its option.
+    var search = document.createElement('input');
+    search.type = 'search';
+    search.className = 'form-control mb-1';
+    search.placeholder = 'Type to search...';
+    search.autocomplete = 'off';
+    var results = document.createElement('div');
+    results.className = 'list-group autocomplete-results';
+    select.parentNode.insertBefore(search, select);
+    select.parentNode.insertBefore(results, select.nextSibling);
+
+    var timer = null;
+    var request = 0;
+
+    function choose(item) {
+        var option = new Option(item.text, item.id, true, true);
+        Object.keys(item.data || {}).forEach(function(key) {
+            option.dataset[key] = item.data[key];
+        });
+        select.querySelectorAll('option:not([value=""])').forEach(function(old) {
+            old.remove();
+        });
+        select.appendChild(option);
+        select.dispatchEvent(new Event('change'));
+        results.innerHTML = '';
+        search.value = '';
+    }
+
+    function load(query, page) {
+        var current = ++request;
+        var params = new URLSearchParams({ q: query, page: page });
+        fetch(`${select.dataset.autocompleteUrl}?${params.toString()}`, {
+            headers: { 'Accept': 'application/json' }
+        })
+        .then(response => response.json())
+        .then(data => {
+            // Answers to superseded searches arrive late; drop them
+            if (current !== request) return;
+            if (page === 1) results.innerHTML = '';
+            var more = results.querySelector('.autocomplete-more');
+            if (more) more.remove();
+            data.results.forEach(function(item) {
+                var button = document.createElement('button');
+                button.type = 'button';
+                button.className = 'list-group-item list-group-item-action';
+                button.textContent = item.text;
+                button.addEventListener('click', function() {
+                    choose(item);
+                });
+                results.appendChild(button);
+            });
+            if (data.more) {
+                var button = document.createElement('button');
+                button.type = 'button';
+                button.className = 'list-group-item list-group-item-action text-primary autocomplete-more';
+                button.textContent = 'Show more...';
+                button.addEventListener('click', function() {
+                    load(query, page + 1);
+                });
+                results.appendChild(button);
+            }
+            if (!data.results.length && page === 1) {
+                results.innerHTML = '<div class="list-group-item text-muted">No matches</div>';
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+        });
+    }
+
+    search.addEventListener('input', function() {
+        clearTimeout(timer);
+        var query = this.value.trim();
+        if (!query) {
+            request++;
+            results.innerHTML = '';
+            return;
+        }
+        timer = setTimeout(function() {
+            load(query, 1);
+        }, 250);
+    });
+}
+
 function adjustTableResponsiveness() {
     var tables = document.querySelectorAll('.table-responsive table');
     tables.forEach(function(table) {
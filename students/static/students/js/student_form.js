@@ -0,0 +1,21 @@
+// Auto-format phone number
+document.getElementById('id_phone').addEventListener('input', function(e) {
+    let value = e.target.value.replace(/\D/g, '');
+    if (value.length > 3 && value.length <= 6) {
+        value = value.replace(/(\d{3})(\d+)/, '$1-$2');
+    } else if (value.length > 6) {
+        value = value.replace(/(\d{3})(\d{3})(\d+)/, '$1-$2-$3');
+    }
+    e.target.value = value;
+});
+
+// Auto-format emergency contact phone
+document.getElementById('id_emergency_contact_phone').addEventListener('input', function(e) {
+    let value = e.target.value.replace(/\D/g, '');
+    if (value.length > 3 && value.length <= 6) {
+        value = value.replace(/(\d{3})(\d+)/, '$1-$2');
+    } else if (value.length > 6) {
+        value = value.replace(/(\d{3})(\d{3})(\d+)/, '$1-$2-$3');
+    }
+    e.target.value = value;
+});
@@ -0,0 +1,68 @@
+from collections import Counter
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .managers import deferred_bookkeeping
+from .models import Course, DashboardStats, Enrollment, Student
+
+
+STATS_PK = 1
+
+
+def student_deltas(status, gender, sign=1):
+    """Stats changes caused by adding (sign=1) or removing (sign=-1) one student"""
+    deltas = Counter(total_students=sign)
+    if status == 'A':
+        deltas['active_students'] += sign
+    if gender in DashboardStats.GENDER_FIELDS:
+        deltas[DashboardStats.GENDER_FIELDS[gender]] += sign
+    return deltas
+
+
+def course_deltas(is_active, sign=1):
+    return Counter(active_courses=sign if is_active else 0)
+
+
+def enrollment_deltas(is_active, sign=1):
+    return Counter(active_enrollments=sign if is_active else 0)
+
+
+def adjust_stats(deltas):
+    """Apply a Counter of field changes to the stats row in one UPDATE"""
+    pending = deferred_bookkeeping()
+    if pending is not None:
+        pending.stats.update(deltas)
+        return
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+    updated = DashboardStats.objects.filter(pk=STATS_PK).update(updated_at=timezone.now(), **changes)
+    if not updated:
+        rebuild_stats()
+
+
+def rebuild_stats():
+    """Recompute every dashboard number from the source tables"""
+    students = Student.objects.aggregate(
+        total_students=Count('pk'),
+        active_students=Count('pk', filter=Q(status='A')),
+        **{
+            field: Count('pk', filter=Q(gender=gender))
+            for gender, field in DashboardStats.GENDER_FIELDS.items()
+        }
+    )
+    stats, _ = DashboardStats.objects.update_or_create(
+        pk=STATS_PK,
+        defaults=dict(
+            students,
+            active_courses=Course.objects.filter(is_active=True).count(),
+            active_enrollments=Enrollment.objects.filter(is_active=True).count(),
+        ),
+    )
+    return stats
+
+
+def get_stats():
+    """Return the stats row, building it on first use"""
+    return DashboardStats.objects.filter(pk=STATS_PK).first() or rebuild_stats()
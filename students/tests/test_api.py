@@ -0,0 +1,129 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from students.api import MAX_BULK_IDS
+from students.models import Enrollment, Student
+
+from .utils import make_course, make_student
+
+
+class StatusApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('teacher', password='secret')
+        cls.students = [make_student(number) for number in range(1, 4)]
+        course = make_course('CS1')
+        cls.enrollments = [
+            Enrollment.objects.create(student=student, course=course, semester='S1', academic_year='2024-2025')
+            for student in cls.students
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def patch(self, name, payload, args=(), client=None):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return (client or self.client).patch(
+            reverse(name, args=args), body, content_type='application/json'
+        )
+
+    def test_student_status_reports_what_changed(self):
+        student = self.students[0]
+        response = self.patch('api_student_status', {'status': 'G'}, args=[student.pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'success': True, 'id': student.pk, 'changed': {'status': 'G'}})
+        student.refresh_from_db()
+        self.assertEqual(student.status, 'G')
+
+        # Setting the value it already has changes nothing
+        response = self.patch('api_student_status', {'status': 'G'}, args=[student.pk])
+        self.assertEqual(response.json()['changed'], {})
+
+    def test_bulk_student_status_counts_only_changed_rows(self):
+        Student.objects.filter(pk=self.students[0].pk).update(status='I')
+        ids = [student.pk for student in self.students]
+        response = self.patch('api_student_status_bulk', {'ids': ids, 'status': 'I'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'success': True, 'updated': 2, 'changed': {'status': 'I'}})
+        self.assertEqual(Student.objects.filter(status='I').count(), 3)
+
+    def test_bulk_enrollment_status(self):
+        ids = [enrollment.pk for enrollment in self.enrollments[:2]]
+        response = self.patch('api_enrollment_status_bulk', {'ids': ids, 'is_active': False})
+        self.assertEqual(response.json()['updated'], 2)
+        self.assertEqual(
+            set(Enrollment.objects.filter(is_active=False).values_list('pk', flat=True)), set(ids)
+        )
+
+    def test_single_enrollment_status(self):
+        enrollment = self.enrollments[0]
+        response = self.patch('api_enrollment_status', {'is_active': False}, args=[enrollment.pk])
+        self.assertEqual(response.json()['changed'], {'is_active': False})
+        enrollment.refresh_from_db()
+        self.assertFalse(enrollment.is_active)
+
+    def test_invalid_requests_are_rejected_with_400(self):
+        student = self.students[0]
+        cases = [
+            ('api_student_status', 'not json', [student.pk]),
+            ('api_student_status', ['G'], [student.pk]),
+            ('api_student_status', {'status': 'X'}, [student.pk]),
+            ('api_student_status_bulk', {'ids': [], 'status': 'A'}, []),
+            ('api_student_status_bulk', {'ids': ['one'], 'status': 'A'}, []),
+            ('api_student_status_bulk', {'ids': list(range(MAX_BULK_IDS + 1)), 'status': 'A'}, []),
+            ('api_enrollment_status_bulk', {'ids': [1], 'is_active': 'no'}, []),
+        ]
+        for name, payload, args in cases:
+            with self.subTest(name=name, payload=payload if len(str(payload)) < 40 else '...'):
+                response = self.patch(name, payload, args=args)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+        self.assertEqual(Student.objects.filter(status='A').count(), 3)
+
+    def test_unknown_objects_are_404(self):
+        response = self.patch('api_student_status', {'status': 'G'}, args=[0])
+        self.assertEqual(response.status_code, 404)
+        response = self.patch('api_enrollment_status', {'is_active': True}, args=[0])
+        self.assertEqual(response.status_code, 404)
+
+    def test_anonymous_requests_are_401(self):
+        self.client.logout()
+        response = self.patch('api_student_status', {'status': 'G'}, args=[self.students[0].pk])
+        self.assertEqual(response.status_code, 401)
+
+    def test_requests_without_csrf_token_are_403(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = self.patch('api_student_status', {'status': 'G'}, args=[self.students[0].pk], client=client)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Student.objects.get(pk=self.students[0].pk).status, 'A')
+
+    def test_only_patch_is_allowed(self):
+        response = self.client.post(reverse('api_student_status_bulk'))
+        self.assertEqual(response.status_code, 405)
+
+
+class AutocompleteApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('teacher', password='secret')
+        make_course('MATH101', course_name='Algebra')
+        make_course('PHYS101', course_name='Mechanics')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_course_autocomplete_matches_code_or_name_prefix(self):
+        url = reverse('api_course_autocomplete')
+        by_code = self.client.get(url, {'q': 'math'}).json()
+        self.assertEqual([result['text'] for result in by_code['results']], ['MATH101 - Algebra'])
+        by_name = self.client.get(url, {'q': 'mech'}).json()
+        self.assertEqual(by_name['results'][0]['data'], {'duration': 6, 'fee': '100.00'})
+        self.assertFalse(by_name['more'])
+
+    def test_bad_page_is_400(self):
+        response = self.client.get(reverse('api_course_autocomplete'), {'page': 'two'})
+        self.assertEqual(response.status_code, 400)
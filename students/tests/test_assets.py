@@ -0,0 +1,92 @@
+import gzip
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from students.assets import HASHED_MAX_AGE, UNHASHED_MAX_AGE, serve_static
+
+
+STYLESHEET = 'body { color: #333; }\n' * 100
+
+
+class PrecompressedStaticTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        source, cls.static_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, source)
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        Path(source, 'site.css').write_text(STYLESHEET)
+        Path(source, 'tiny.js').write_text('let a = 1;\n')
+        # Random bytes do not compress
+        Path(source, 'noise.txt').write_bytes(os.urandom(2048))
+
+        settings = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'students.assets.PrecompressedManifestStaticFilesStorage'},
+            },
+        )
+        settings.enable()
+        cls.addClassCleanup(settings.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed_css = staticfiles_storage.stored_name('site.css')
+
+    def serve(self, path, **headers):
+        response = serve_static(self.factory.get(f'/static/{path}', **headers), path)
+        self.addCleanup(response.close)
+        return response
+
+    def content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_collectstatic_writes_compressed_copies_worth_having(self):
+        self.assertRegex(self.hashed_css, r'^site\.[0-9a-f]{12}\.css$')
+        root = Path(self.static_root)
+        self.assertEqual(gzip.decompress((root / f'{self.hashed_css}.gz').read_bytes()).decode(), STYLESHEET)
+        self.assertFalse((root / f'{staticfiles_storage.stored_name("tiny.js")}.gz').exists())
+        self.assertFalse((root / f'{staticfiles_storage.stored_name("noise.txt")}.gz').exists())
+
+    def test_clients_accepting_gzip_get_the_compressed_copy(self):
+        response = self.serve(self.hashed_css, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(gzip.decompress(self.content(response)).decode(), STYLESHEET)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_other_clients_get_the_file_itself(self):
+        response = self.serve(self.hashed_css)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(self.content(response).decode(), STYLESHEET)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_hashed_names_are_cached_for_a_year(self):
+        cache_control = self.serve(self.hashed_css)['Cache-Control']
+        self.assertIn(f'max-age={HASHED_MAX_AGE}', cache_control)
+        self.assertIn('immutable', cache_control)
+        self.assertIn(f'max-age={UNHASHED_MAX_AGE}', self.serve('site.css')['Cache-Control'])
+
+    def test_unchanged_files_are_not_sent_again(self):
+        response = self.serve(self.hashed_css, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 304)
+
+    def test_paths_outside_static_root_are_404(self):
+        for path in ('../secret.txt', 'missing.css'):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                self.serve(path)
+
+    def test_only_safe_methods_are_allowed(self):
+        response = serve_static(self.factory.post(f'/static/{self.hashed_css}'), self.hashed_css)
+        self.assertEqual(response.status_code, 405)
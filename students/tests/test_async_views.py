@@ -0,0 +1,24 @@
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from students.async_views import gather_queries, shutdown_query_pool
+
+
+def connection_in_use():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    return connection.connection
+
+
+@override_settings(STUDENTS_ASYNC_QUERY_WORKERS=1)
+class QueryPoolTests(SimpleTestCase):
+    databases = {'default'}
+
+    def tearDown(self):
+        shutdown_query_pool()
+
+    def test_pool_threads_keep_their_connection_between_queries(self):
+        first, second = async_to_sync(gather_queries)(connection_in_use, connection_in_use)
+        self.assertIs(first, second)
+
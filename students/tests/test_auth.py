@@ -0,0 +1,18 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from students.auth import CachedModelBackend, invalidate_all_users
+
+
+class CachedUserTests(TestCase):
+    def test_cached_user_is_dropped_on_save(self):
+        invalidate_all_users()
+        user = User.objects.create_user('teacher', password='secret')
+        backend = CachedModelBackend()
+        with self.settings(STUDENTS_USER_CACHE_SECONDS=60):
+            self.assertTrue(backend.get_user(user.pk).is_active)
+            with self.assertNumQueries(0):
+                backend.get_user(user.pk)
+            user.is_active = False
+            user.save()
+            self.assertIsNone(backend.get_user(user.pk))
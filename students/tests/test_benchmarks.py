@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+
+from students.benchmarks import benchmark_host
+
+
+class BenchmarkHostTests(SimpleTestCase):
+    def test_first_allowed_host_is_used(self):
+        with self.settings(ALLOWED_HOSTS=['school.example.com', 'localhost']):
+            self.assertEqual(benchmark_host(), 'school.example.com')
+
+    def test_wildcards_become_hosts_they_match(self):
+        cases = [
+            (['*'], 'localhost'),
+            (['.example.com'], 'example.com'),
+            (['*', 'school.example.com'], 'school.example.com'),
+            ([], 'localhost'),
+        ]
+        for allowed_hosts, host in cases:
+            with self.subTest(allowed_hosts=allowed_hosts), self.settings(ALLOWED_HOSTS=allowed_hosts):
+                self.assertEqual(benchmark_host(), host)
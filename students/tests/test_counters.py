@@ -0,0 +1,105 @@
+from django.test import TestCase
+
+from students.counters import find_counter_drift, recount_courses
+from students.models import Course, DashboardStats, Enrollment, Student
+from students.stats import STATS_PK, get_stats, rebuild_stats
+
+from .utils import make_course, make_student
+
+
+class CounterAndStatsTests(TestCase):
+    """The stored counters must match the source tables after every kind of write"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.courses = [make_course('MATH101'), make_course('PHYS101', is_active=False)]
+        cls.students = [make_student(number) for number in range(4)]
+
+    def assertNoDrift(self):
+        self.assertEqual(list(find_counter_drift()), [])
+        stored = DashboardStats.objects.get(pk=STATS_PK)
+        DashboardStats.objects.all().delete()
+        rebuilt = rebuild_stats()
+        for field in (
+            'total_students', 'active_students', 'male_students', 'female_students',
+            'other_students', 'active_courses', 'active_enrollments',
+        ):
+            self.assertEqual(getattr(stored, field), getattr(rebuilt, field), field)
+
+    def enroll(self, student, course, **fields):
+        return Enrollment.objects.create(
+            student=student, course=course, semester='S1', academic_year='2024-2025', **fields
+        )
+
+    def test_single_row_saves_and_deletes(self):
+        math, physics = self.courses
+        enrollment = self.enroll(self.students[0], math)
+        self.enroll(self.students[1], math, is_active=False)
+        self.assertNoDrift()
+
+        enrollment.course = physics
+        enrollment.is_active = False
+        enrollment.save()
+        self.assertNoDrift()
+
+        enrollment.delete()
+        self.students[2].status = 'G'
+        self.students[2].save()
+        self.students[3].delete()
+        physics.is_active = True
+        physics.save()
+        self.assertNoDrift()
+
+    def test_stale_instance_is_reread_before_delete(self):
+        enrollment = self.enroll(self.students[0], self.courses[0])
+        Enrollment.objects.filter(pk=enrollment.pk).update(course=self.courses[1])
+        recount_courses()
+        enrollment.delete()
+        self.assertNoDrift()
+
+    def test_bulk_paths(self):
+        math, physics = self.courses
+        Enrollment.objects.bulk_create([
+            Enrollment(student=student, course=math, semester='S2', academic_year='2024-2025')
+            for student in self.students
+        ])
+        self.assertNoDrift()
+
+        Enrollment.objects.filter(student=self.students[0]).update(is_active=False)
+        Enrollment.objects.filter(student=self.students[1]).update(course=physics)
+        Student.objects.filter(pk=self.students[2].pk).update(status='I', gender='O')
+        Course.objects.filter(pk=physics.pk).update(is_active=True)
+        self.assertNoDrift()
+
+        enrollments = list(Enrollment.objects.filter(course=math))
+        for enrollment in enrollments:
+            enrollment.is_active = not enrollment.is_active
+        Enrollment.objects.bulk_update(enrollments, ['is_active'])
+        self.assertNoDrift()
+
+        Enrollment.objects.filter(course=math).delete()
+        Student.objects.filter(pk=self.students[3].pk).delete()
+        self.assertNoDrift()
+
+    def test_cascading_deletes(self):
+        math, physics = self.courses
+        for student in self.students[:3]:
+            self.enroll(student, math)
+            self.enroll(student, physics, is_active=False)
+        self.students[0].delete()
+        self.assertNoDrift()
+
+        Student.objects.filter(pk=self.students[1].pk).delete()
+        math.delete()
+        self.assertNoDrift()
+
+    def test_recount_repairs_drift(self):
+        self.enroll(self.students[0], self.courses[0])
+        Course.objects.filter(pk=self.courses[0].pk).update(enrollment_count=99)
+        self.assertEqual([course.pk for course in find_counter_drift()], [self.courses[0].pk])
+        recount_courses([self.courses[0].pk])
+        self.assertEqual(list(find_counter_drift()), [])
+
+    def test_stats_row_is_built_on_first_use(self):
+        DashboardStats.objects.all().delete()
+        self.assertEqual(get_stats().total_students, len(self.students))
@@ -0,0 +1,78 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from students.exports import neutralise_formula
+from students.models import Enrollment
+
+from .utils import csv_records, make_course, make_grade, make_student
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('teacher', password='secret')
+        cls.active = make_student(1, first_name='Ada')
+        cls.inactive = make_student(2, first_name='Bea', status='I')
+        course = make_course('CS1')
+        fall = Enrollment.objects.create(
+            student=cls.active, course=course, semester='S1', academic_year='2024-2025'
+        )
+        Enrollment.objects.create(
+            student=cls.inactive, course=course, semester='S2', academic_year='2024-2025', is_active=False
+        )
+        make_grade(fall, 45, total=50)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, export_type, **params):
+        response = self.client.get(reverse('export_data', args=[export_type]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_has_headers_and_one_row_per_object(self):
+        response, content = self.export('students')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="students-\d{8}\.csv"')
+        records = [record for _, record in csv_records(content)]
+        self.assertEqual({record['student_id'] for record in records}, {'STU0001', 'STU0002'})
+        self.assertEqual(records[0]['email'].split('@')[1], 'example.com')
+
+    def test_filters_come_from_the_query_string(self):
+        _, content = self.export('students', status='I')
+        self.assertEqual([record['first_name'] for _, record in csv_records(content)], ['Bea'])
+        _, content = self.export('enrollments', semester='S1')
+        self.assertEqual([record['student_id'] for _, record in csv_records(content)], ['STU0001'])
+
+    def test_jsonl_has_one_object_per_line(self):
+        response, content = self.export('grades', format='jsonl')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 1)
+        grade = json.loads(lines[0])
+        self.assertEqual(grade['student_id'], 'STU0001')
+        self.assertEqual(grade['course_code'], 'CS1')
+        self.assertEqual(float(grade['percentage']), 90.0)
+
+    def test_unknown_exports_are_404(self):
+        response = self.client.get(reverse('export_data', args=['teachers']))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('export_data', args=['students']), {'format': 'xlsx'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_formula_cells_are_neutralised(self):
+        make_student(3, first_name='=HYPERLINK("http://example.com")', last_name='@SUM(A1)')
+        _, content = self.export('students')
+        record = next(record for _, record in csv_records(content) if record['student_id'] == 'STU0003')
+        self.assertEqual(record['first_name'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(record['last_name'], "'@SUM(A1)")
+
+    def test_neutralise_formula_leaves_other_values_alone(self):
+        for value in ('Ada', '', 'a=b', -5, None):
+            self.assertEqual(neutralise_formula(value), value)
+        for value in ('+1 555 0100', '-1', '\tcmd'):
+            self.assertEqual(neutralise_formula(value), "'" + value)
@@ -0,0 +1,35 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from students.gradebook import derive_letters, save_grades
+from students.models import Enrollment, Grade
+
+from .utils import make_course, make_student
+
+
+class GradebookTests(TestCase):
+    def test_letters_match_the_form_at_band_boundaries(self):
+        total = Decimal('194')
+        marks = [Decimal('97'), Decimal('96.99'), Decimal('174.6'), Decimal('0')]
+        expected = [Grade.letter_for_percentage(mark / total * 100) for mark in marks]
+        self.assertEqual(derive_letters(marks, total), expected)
+        self.assertEqual(derive_letters(marks, total), ['E', 'F', 'A', 'F'])
+
+    def test_save_grades_creates_then_updates(self):
+        course = make_course('CS1')
+        enrollments = [
+            Enrollment.objects.create(
+                student=make_student(number), course=course, semester='S1', academic_year='2024-2025'
+            )
+            for number in range(3)
+        ]
+        exam_date = date(2024, 5, 1)
+        marks = {enrollments[0].pk: Decimal('95'), enrollments[1].pk: Decimal('40')}
+        self.assertEqual(save_grades(enrollments, exam_date, Decimal('100'), marks), (2, 0))
+
+        marks = {enrollments[1].pk: Decimal('85'), enrollments[2].pk: Decimal('55')}
+        self.assertEqual(save_grades(enrollments, exam_date, Decimal('100'), marks), (1, 1))
+        letters = dict(Grade.objects.values_list('enrollment_id', 'grade'))
+        self.assertEqual(letters, {enrollments[0].pk: 'A', enrollments[1].pk: 'B', enrollments[2].pk: 'E'})
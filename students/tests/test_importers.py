@@ -0,0 +1,68 @@
+import csv
+import io
+
+from django.test import TestCase
+
+from students.importers import CourseImporter, EnrollmentImporter, StudentImporter, import_records
+from students.models import Course, Student
+
+from .utils import csv_records, make_course, make_student
+
+
+class ImporterTests(TestCase):
+    HEADER = (
+        'student_id,first_name,last_name,email,phone,address,date_of_birth,gender,'
+        'emergency_contact_name,emergency_contact_phone\n'
+    )
+
+    def student_row(self, student_id, email, date_of_birth='2005-01-01'):
+        return f'{student_id},Ann,Lee,{email},555,Road,{date_of_birth},F,Bob,556\n'
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        make_student(1)
+        text = self.HEADER + ''.join([
+            self.student_row('NEW1', 'new1@example.com'),
+            self.student_row('STU0001', 'other@example.com'),
+            self.student_row('NEW2', 'new1@example.com'),
+            self.student_row('NEW3', 'new3@example.com', date_of_birth='not a date'),
+        ])
+        errors = io.StringIO()
+        inserted, failed = import_records(csv_records(text), StudentImporter(), error_writer=csv.writer(errors))
+        self.assertEqual((inserted, failed), (1, 3))
+        self.assertTrue(Student.objects.filter(student_id='NEW1').exists())
+        report = errors.getvalue()
+        self.assertIn('Student ID already exists', report)
+        self.assertIn('Email already exists', report)
+        self.assertIn('date_of_birth', report)
+
+    def test_rejected_rows_do_not_reserve_their_keys(self):
+        # The first row fails on its date, so the second may use its ID and email
+        text = self.HEADER + ''.join([
+            self.student_row('NEW1', 'new1@example.com', date_of_birth='not a date'),
+            self.student_row('NEW1', 'new1@example.com'),
+        ])
+        self.assertEqual(import_records(csv_records(text), StudentImporter()), (1, 1))
+
+    def test_blank_emails_are_not_reserved(self):
+        text = self.HEADER + self.student_row('NEW1', '') + self.student_row('NEW2', 'new2@example.com')
+        valid, errors = StudentImporter().validate(list(csv_records(text)))
+        self.assertEqual([record['student_id'] for _, record, _ in valid], ['NEW2'])
+        self.assertEqual(len(errors), 1)
+        self.assertNotIn('Email already exists', '; '.join(errors[0][2]))
+
+    def test_dry_run_inserts_nothing(self):
+        text = 'course_code,course_name,description,credits,level,duration_months,fee\nCS1,CS,d,3,UG,6,10\n'
+        self.assertEqual(import_records(csv_records(text), CourseImporter(), dry_run=True), (1, 0))
+        self.assertFalse(Course.objects.exists())
+
+    def test_enrollments_resolve_natural_keys(self):
+        make_student(1)
+        make_course('CS1')
+        text = (
+            'student_id,course_code,semester,academic_year\n'
+            'STU0001,CS1,S1,2024-2025\n'
+            'STU0001,CS1,S1,2024-2025\n'
+            'STU9999,CS1,S1,2024-2025\n'
+        )
+        self.assertEqual(import_records(csv_records(text), EnrollmentImporter()), (1, 2))
+        self.assertEqual(Course.objects.get(course_code='CS1').enrollment_count, 1)
@@ -0,0 +1,206 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+
+from students import views
+from students.auth import invalidate_all_users
+from students.instrumentation import PROMETHEUS_CONTENT_TYPE, Histogram, registry
+from students.models import Course, Enrollment, Job
+from students.seeding import seed
+
+
+def budgeted_url_names(patterns=None):
+    """The URL names of every view that declares a query budget"""
+    names = set()
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            names |= budgeted_url_names(pattern.url_patterns)
+        elif hasattr(pattern.callback, 'query_budget'):
+            names.add(pattern.name)
+    return names
+
+
+@override_settings(
+    STUDENTS_QUERY_BUDGET_STRICT=True, STUDENTS_ASYNC_QUERY_WORKERS=0, ROOT_URLCONF='students.tests.urls'
+)
+class QueryBudgetTests(TestCase):
+    """
+    Every view with a query budget keeps to it on seeded data. Strict mode
+    turns going over into a QueryBudgetExceeded raised by the test client.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(students=200, courses=8, grades=600)
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'secret')
+        cls.enrollment = Enrollment.objects.select_related('student', 'course').order_by('pk').first()
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root)
+        with override_settings(MEDIA_ROOT=cls.media_root):
+            cls.job = Job.objects.create(kind='export', created_by=cls.user, status=Job.SUCCEEDED)
+            cls.job.result_file.save('students.csv', ContentFile(b'student_id\n'))
+
+    def setUp(self):
+        cache.clear()
+        invalidate_all_users()
+        self.client.force_login(self.user)
+        self.visited = set()
+
+    def request(self, method, name, args=(), data=None, status=200, query=''):
+        """
+        Request one view as its own subtest, so a failure names the view and
+        the remaining views are still checked. Returns None when it failed.
+        """
+        self.visited.add(name)
+        url = reverse(name, args=args) + query
+        response = None
+        with self.subTest(view=name, method=method.upper(), url=url):
+            with self.settings(MEDIA_ROOT=self.media_root):
+                response = getattr(self.client, method)(url, data)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertEqual(response.status_code, status)
+        return response
+
+    def student_data(self, number):
+        return {
+            'student_id': f'NEW{number}',
+            'first_name': 'Ann',
+            'last_name': 'Lee',
+            'email': f'new{number}@example.com',
+            'phone': '5550100',
+            'address': '1 School Road',
+            'date_of_birth': '2005-01-01',
+            'gender': 'F',
+            'status': 'A',
+            'emergency_contact_name': 'Parent',
+            'emergency_contact_phone': '5550101',
+        }
+
+    def test_every_budgeted_view_keeps_to_its_budget(self):
+        student = self.enrollment.student
+        course = self.enrollment.course
+        section = {
+            'course': course.pk,
+            'semester': self.enrollment.semester,
+            'academic_year': self.enrollment.academic_year,
+            'exam_date': '2025-01-15',
+            'total_marks': '100',
+        }
+        section_query = '?' + '&'.join(f'{key}={value}' for key, value in section.items())
+        section_pks = Enrollment.objects.filter(
+            course=course, semester=self.enrollment.semester, academic_year=self.enrollment.academic_year
+        ).values_list('pk', flat=True)
+
+        for name in ('dashboard', 'student_list', 'course_list', 'enrollment_list', 'grade_list',
+                     'async_dashboard', 'async_student_list', 'async_grade_list'):
+            self.request('get', name)
+        first_page = self.request('get', 'student_list')
+        if first_page is not None:
+            self.request('get', 'student_list', query=f'?cursor={first_page.context["page_obj"].next_cursor}')
+        self.request('get', 'student_list', query=f'?query={student.last_name}')
+        self.request('get', 'grade_list', query=f'?course={course.pk}')
+        self.request('get', 'student_detail', args=[student.pk])
+
+        self.request('get', 'student_create')
+        self.request('post', 'student_create', data=self.student_data(1), status=302)
+        self.request('get', 'student_update', args=[student.pk])
+        self.request(
+            'post', 'student_update', args=[student.pk], data=dict(self.student_data(2), address='Moved'), status=302
+        )
+        self.request('get', 'course_create')
+        self.request('post', 'course_create', data={
+            'course_code': 'NEW101', 'course_name': 'New', 'description': 'A course', 'credits': 3,
+            'level': 'UG', 'duration_months': 6, 'fee': '100.00', 'is_active': 'on',
+        }, status=302)
+        self.request('get', 'enrollment_create')
+        self.request('post', 'enrollment_create', data={
+            'student': student.pk, 'course': Course.objects.get(course_code='NEW101').pk,
+            'semester': 'S1', 'academic_year': '2025-2026', 'is_active': 'on',
+        }, status=302)
+        self.request('get', 'grade_create')
+        self.request('post', 'grade_create', data={
+            'enrollment': self.enrollment.pk, 'marks_obtained': '72', 'total_marks': '100',
+            'exam_date': '2025-02-01', 'remarks': '',
+        }, status=302)
+        self.request('get', 'gradebook', query=section_query)
+        self.request('post', 'gradebook', query=section_query, data={
+            f'marks_{pk}': '64' for pk in section_pks
+        }, status=302)
+
+        for name in ('api_student_autocomplete', 'api_course_autocomplete', 'api_enrollment_autocomplete'):
+            self.request('get', name, query='?q=a')
+        self.request('get', 'export_data', args=['grades'])
+        self.request('post', 'export_job', args=['students'], status=202)
+        for name in ('job_detail', 'job_status', 'job_download'):
+            self.request('get', name, args=[self.job.pk])
+
+        self.request('get', 'student_delete', args=[student.pk])
+        self.request('post', 'student_delete', args=[student.pk], status=302)
+
+        self.assertEqual(budgeted_url_names() - self.visited, set())
+
+
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('teacher', password='secret')
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def scrape(self, **extra):
+        return self.client.get(reverse('metrics'), **extra)
+
+    def samples(self):
+        """The scraped samples, keyed by name and labels"""
+        lines = self.scrape().content.decode().splitlines()
+        return dict(line.rsplit(' ', 1) for line in lines if not line.startswith('#'))
+
+    def test_requests_are_recorded_per_view(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('course_list'))
+        self.client.get(reverse('course_list'))
+        self.client.get(reverse('student_detail', args=[0]))
+
+        samples = self.samples()
+        self.assertEqual(samples['students_requests_total{view="course_list",status="200"}'], '2')
+        self.assertEqual(samples['students_requests_total{view="student_detail",status="404"}'], '1')
+        self.assertEqual(samples['students_request_duration_seconds_count{view="course_list"}'], '2')
+        self.assertEqual(samples['students_request_queries_bucket{view="course_list",le="+Inf"}'], '2')
+        self.assertGreater(int(samples['students_request_queries_sum{view="course_list"}']), 0)
+
+    def test_exposition_format(self):
+        response = self.scrape()
+        self.assertEqual(response['Content-Type'], PROMETHEUS_CONTENT_TYPE)
+        content = response.content.decode()
+        self.assertIn('# TYPE students_request_duration_seconds histogram', content)
+        self.assertIn('# TYPE students_requests_total counter', content)
+        self.assertTrue(content.endswith('\n'))
+
+    def test_budget_overruns_are_counted(self):
+        self.client.force_login(self.user)
+        with self.settings(STUDENTS_QUERY_BUDGET_STRICT=False), \
+                self.assertLogs('students.instrumentation', 'WARNING'), \
+                mock.patch.object(views.course_list, 'query_budget', 0):
+            self.client.get(reverse('course_list'))
+        self.assertEqual(self.samples()['students_query_budget_exceeded_total{view="course_list"}'], '1')
+
+    def test_only_allowed_addresses_can_scrape(self):
+        with self.settings(STUDENTS_METRICS_ALLOWED_IPS=['10.0.0.1']):
+            self.assertEqual(self.scrape().status_code, 404)
+            self.assertEqual(self.scrape(REMOTE_ADDR='10.0.0.1').status_code, 200)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5))
+        for value in (1, 3, 7):
+            histogram.observe(value)
+        self.assertEqual(list(histogram.cumulative()), [(1, 1), (5, 2), ('+Inf', 3)])
+        self.assertEqual((histogram.count, histogram.sum), (3, 11))
@@ -0,0 +1,144 @@
+import builtins
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from students import jobs
+from students.models import Job
+
+from .utils import make_student
+
+
+class JobTestCase(TestCase):
+    def setUp(self):
+        handlers = {
+            'succeed': lambda job: {'ran': job.pk},
+            'fail': self.fail_job,
+        }
+        patcher = mock.patch.dict(jobs.HANDLERS, handlers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fail_job(self, job):
+        raise RuntimeError(f'attempt {job.attempts}')
+
+
+class ClaimTests(JobTestCase):
+    def test_oldest_due_job_is_claimed_first(self):
+        later = jobs.enqueue('succeed')
+        first = jobs.enqueue('succeed')
+        Job.objects.filter(pk=first.pk).update(run_after=timezone.now() - timedelta(minutes=1))
+        Job.objects.filter(pk=later.pk).update(run_after=timezone.now() + timedelta(minutes=1))
+
+        claimed = jobs.claim_job('worker-1')
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.locked_by, claimed.attempts), (Job.RUNNING, 'worker-1', 1))
+        # The other one is not due yet
+        self.assertIsNone(jobs.claim_job('worker-1'))
+
+    def test_a_job_taken_by_another_worker_in_between_is_skipped(self):
+        contested, spare = jobs.enqueue('succeed'), jobs.enqueue('succeed')
+
+        def candidates_then_lose_the_race(candidates):
+            pks = builtins.list(candidates)
+            # Another worker claims the first candidate after this one read it
+            Job.objects.filter(pk=pks[0]).update(status=Job.RUNNING, locked_by='worker-2')
+            return pks
+
+        with mock.patch('students.jobs.list', candidates_then_lose_the_race, create=True):
+            claimed = jobs.claim_job('worker-1')
+        self.assertEqual(claimed.pk, spare.pk)
+        self.assertEqual(Job.objects.get(pk=contested.pk).locked_by, 'worker-2')
+
+    def test_unknown_kinds_cannot_be_enqueued(self):
+        with self.assertRaises(jobs.UnknownJobKind):
+            jobs.enqueue('no-such-kind')
+
+
+@override_settings(STUDENTS_JOB_RETRY_DELAY=10)
+class RetryTests(JobTestCase):
+    def run_claimed(self, worker_id='worker-1'):
+        Job.objects.filter(status=Job.QUEUED).update(run_after=timezone.now())
+        job = jobs.claim_job(worker_id)
+        before = timezone.now()
+        with self.assertLogs('students.jobs', 'WARNING'):
+            self.assertFalse(jobs.run_job(job))
+        job.refresh_from_db()
+        return job, job.run_after - before
+
+    def test_failed_attempts_back_off_exponentially_then_fail(self):
+        jobs.enqueue('fail', max_attempts=3)
+
+        job, delay = self.run_claimed()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertAlmostEqual(delay.total_seconds(), 10, delta=1)
+        self.assertIn('attempt 1', job.error)
+
+        job, delay = self.run_claimed()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertAlmostEqual(delay.total_seconds(), 20, delta=1)
+
+        job, _ = self.run_claimed()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.FAILED, 3, ''))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_success_records_the_result(self):
+        job = jobs.enqueue('succeed')
+        self.assertTrue(jobs.run_job(jobs.claim_job('worker-1')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.error), (Job.SUCCEEDED, {'ran': job.pk}, ''))
+
+
+class StaleJobTests(JobTestCase):
+    def test_abandoned_jobs_are_requeued_or_failed(self):
+        stale_at = timezone.now() - timedelta(hours=2)
+        retryable = jobs.enqueue('succeed', max_attempts=3)
+        exhausted = jobs.enqueue('succeed', max_attempts=1)
+        fresh = jobs.enqueue('succeed')
+        Job.objects.update(status=Job.RUNNING, locked_by='dead-worker', attempts=1, locked_at=stale_at)
+        Job.objects.filter(pk=fresh.pk).update(locked_at=timezone.now())
+
+        self.assertEqual(jobs.requeue_stale_jobs(timeout=3600), (1, 1))
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[retryable.pk], Job.QUEUED)
+        self.assertEqual(statuses[exhausted.pk], Job.FAILED)
+        self.assertEqual(statuses[fresh.pk], Job.RUNNING)
+
+    def test_a_requeued_job_ignores_its_old_worker(self):
+        job = jobs.enqueue('succeed')
+        claimed = jobs.claim_job('slow-worker')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        jobs.requeue_stale_jobs(timeout=3600)
+        jobs.claim_job('new-worker')
+
+        # The slow worker finishes after all; the new worker still owns the job
+        jobs.run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.RUNNING, 'new-worker'))
+
+
+class WorkerTests(JobTestCase):
+    def test_burst_runs_until_the_queue_is_empty(self):
+        for _ in range(3):
+            jobs.enqueue('succeed')
+        self.assertEqual(jobs.work('worker-1', threading.Event(), burst=True), 3)
+        self.assertEqual(Job.objects.filter(status=Job.SUCCEEDED).count(), 3)
+
+    def test_export_job_attaches_the_file(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        make_student(1)
+        with self.settings(MEDIA_ROOT=media_root):
+            job = jobs.enqueue('export', {'export_type': 'students', 'format': 'csv'})
+            self.assertTrue(jobs.run_job(jobs.claim_job('worker-1')))
+            job.refresh_from_db()
+            with job.result_file.open('rb') as f:
+                lines = f.read().decode().splitlines()
+        self.assertGreater(job.result['bytes'], 0)
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('STU0001,'))
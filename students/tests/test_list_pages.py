@@ -0,0 +1,101 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from students.models import Course, DeferredFieldAccess, Enrollment, Student
+
+from .utils import make_course, make_grade, make_student
+
+
+@override_settings(STUDENTS_DEFERRED_FIELD_GUARD='raise')
+class DeferredFieldGuardTests(TestCase):
+    """The list pages render from their only() projections without loading a deferred field"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('teacher', password='secret')
+        courses = [make_course('CS1'), make_course('CS2', is_active=False)]
+        for number in range(6):
+            student = make_student(number, status='AIGT'[number % 4])
+            enrollment = Enrollment.objects.create(
+                student=student, course=courses[number % 2], semester='S1',
+                academic_year='2024-2025', is_active=bool(number % 3),
+            )
+            make_grade(enrollment, 45 + number * 10)
+        # Avatars fall back to the picture itself until its thumbnails are generated
+        Student.objects.filter(student_id='STU0000').update(profile_picture='student_profiles/ann.png')
+        cls.course = courses[0]
+
+    def setUp(self):
+        # Cached rows would skip the attribute reads under test
+        cache.clear()
+        caches['template_fragments'].clear()
+        self.client.force_login(self.user)
+
+    def test_guard_raises(self):
+        student = Student.objects.only('student_id').get(student_id='STU0001')
+        with self.assertRaises(DeferredFieldAccess):
+            student.email
+
+    def test_list_pages_stay_within_their_projections(self):
+        pages = [
+            ('student_list', ''),
+            ('student_list', '?status=A'),
+            ('student_list', '?query=Last1'),
+            ('enrollment_list', ''),
+            ('enrollment_list', '?status=inactive&semester=S1'),
+            ('grade_list', ''),
+            ('grade_list', f'?course={self.course.pk}&grade=A'),
+        ]
+        for name, query in pages:
+            with self.subTest(page=name + query):
+                response = self.client.get(reverse(name) + query)
+                self.assertEqual(response.status_code, 200)
+        self.assertContains(self.client.get(reverse('student_list')), 'student_profiles/ann.png')
+
+
+class RowCacheKeyTests(TestCase):
+    """The cached list rows are keyed on updated_at, so bulk updates must move it"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = make_course('CS1')
+
+    def test_bulk_course_updates_touch_updated_at(self):
+        before = Course.objects.get(pk=self.course.pk).updated_at
+        Course.objects.filter(pk=self.course.pk).update(enrollment_count=5)
+        self.assertEqual(Course.objects.get(pk=self.course.pk).updated_at, before)
+        Course.objects.filter(pk=self.course.pk).update(course_name='Renamed')
+        self.assertGreater(Course.objects.get(pk=self.course.pk).updated_at, before)
+
+
+class EnrollmentTotalsTests(TestCase):
+    """The totals above enrollment_list match an exact count for every filter"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('teacher', password='secret')
+        course = make_course('CS1')
+        for number in range(8):
+            Enrollment.objects.create(
+                student=make_student(number), course=course, semester='S1' if number % 2 else 'S2',
+                academic_year='2024-2025', is_active=number % 3 != 0,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_totals(self):
+        for filters in ({}, {'status': 'active'}, {'status': 'inactive'}, {'semester': 'S1'},
+                        {'semester': 'S1', 'status': 'inactive'}, {'academic_year': '2024-2025'}):
+            with self.subTest(filters=filters):
+                response = self.client.get(reverse('enrollment_list'), filters)
+                enrollments = Enrollment.objects.all()
+                if 'status' in filters:
+                    enrollments = enrollments.filter(is_active=filters['status'] == 'active')
+                if 'semester' in filters:
+                    enrollments = enrollments.filter(semester=filters['semester'])
+                self.assertEqual(response.context['page_obj'].total, enrollments.count())
+                self.assertEqual(response.context['active_enrollments'], enrollments.filter(is_active=True).count())
@@ -0,0 +1,95 @@
+from datetime import date
+
+from django.core import signing
+from django.core.cache import cache
+from django.test import TestCase
+
+from students.models import Student
+from students.pagination import (
+    CURSOR_SALT, EstimatedCountPaginator, InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor,
+    estimated_count, refresh_table_stats,
+)
+
+from .utils import make_student
+
+
+class CursorTests(TestCase):
+    def test_round_trip(self):
+        token = encode_cursor([date(2024, 1, 31), 42], 'next')
+        self.assertEqual(decode_cursor(token), ('next', ['2024-01-31', 42]))
+
+    def test_tampered_token_is_rejected(self):
+        token = encode_cursor([date(2024, 1, 31), 42], 'prev')
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(token[:-1] + ('A' if token[-1] != 'A' else 'B'))
+
+    def test_signed_but_malformed_payload_is_rejected(self):
+        for payload in (['sideways', 1], ['next'], {'direction': 'next'}):
+            with self.subTest(payload=payload), self.assertRaises(InvalidCursor):
+                decode_cursor(signing.dumps(payload, salt=CURSOR_SALT))
+
+    def test_other_salts_are_rejected(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(signing.dumps(['next', 1]))
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(number) for number in range(7)]
+
+    def paginator(self):
+        return KeysetPaginator(Student.objects.all(), 3, ordering=('created_at', 'id'))
+
+    def test_walks_every_row_once_in_both_directions(self):
+        paginator = self.paginator()
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+        seen = [student.pk for page in pages for student in page]
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(sorted(seen), sorted(student.pk for student in self.students))
+
+        back = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual(list(back), list(pages[-2]))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = self.paginator()
+        first = paginator.get_page()
+        for cursor in ('garbage', encode_cursor(['not a date', 1], 'next'), encode_cursor([1], 'next')):
+            with self.subTest(cursor=cursor):
+                page = paginator.get_page(cursor)
+                self.assertEqual(list(page), list(first))
+                self.assertFalse(page.has_previous())
+
+
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [make_student(number) for number in range(5)]
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self, exact_below):
+        paginator_class = type('Paginator', (EstimatedCountPaginator,), {'exact_below': exact_below})
+        return paginator_class(Student.objects.all(), 2)
+
+    def test_estimate_comes_from_analyze(self):
+        refresh_table_stats()
+        self.assertEqual(estimated_count(Student.objects.all()), 5)
+        self.assertIsNone(estimated_count(Student.objects.filter(status='A')))
+
+        # Deletes are not seen until the next ANALYZE
+        Student.objects.filter(pk__in=[student.pk for student in self.students[:2]]).delete()
+        self.assertEqual(estimated_count(Student.objects.all()), 5)
+        refresh_table_stats()
+        self.assertEqual(estimated_count(Student.objects.all()), 3)
+
+    def test_estimates_near_the_threshold_are_recounted(self):
+        refresh_table_stats()
+        Student.objects.filter(pk=self.students[0].pk).delete()
+        # 5 is at least twice 2, so the estimate is trusted
+        self.assertEqual(self.paginator(exact_below=2).count, 5)
+        # but not twice 3: count exactly
+        self.assertEqual(self.paginator(exact_below=3).count, 4)
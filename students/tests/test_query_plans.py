@@ -0,0 +1,32 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from students.pagination import refresh_table_stats
+from students.query_plans import check_views
+from students.seeding import seed
+
+
+class QueryPlanTests(TestCase):
+    """check_query_plans against seeded data with planner statistics, as seed_bench leaves it"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(students=600, courses=12, grades=2400)
+        refresh_table_stats()
+
+    def test_checked_views_use_indexes(self):
+        for label, sql, plan, scans in check_views():
+            with self.subTest(view=label, sql=sql):
+                self.assertIsNotNone(sql, 'Nothing to check against')
+                self.assertEqual(scans, [], '\n'.join(plan))
+
+
+class SeedBenchPlanTests(TestCase):
+    def test_check_query_plans_passes_after_seed_bench(self):
+        # seed_bench runs ANALYZE, which changes the plans SQLite picks
+        call_command('seed_bench', students=400, courses=10, grades=1600, stdout=io.StringIO())
+        out = io.StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn('Every checked query uses an index.', out.getvalue())
@@ -0,0 +1,70 @@
+import json
+import shutil
+import tempfile
+
+from django.test import TestCase
+
+from students.models import Enrollment
+from students.report_cards import (
+    MANIFEST_NAME, cohort_report_cards, generate_report_cards, read_manifest, report_card_dir,
+)
+
+from .utils import make_course, make_grade, make_student
+
+
+class ReportCardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        course = make_course('CS1', credits=4)
+        for number in range(1, 5):
+            enrollment = Enrollment.objects.create(
+                student=make_student(number), course=course, semester='S1', academic_year='2024-2025'
+            )
+            make_grade(enrollment, 90)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = self.settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.directory = report_card_dir('S1', '2024-2025')
+
+    def generate(self, **kwargs):
+        return [student_id for student_id, _ in generate_report_cards('S1', '2024-2025', workers=1, **kwargs)]
+
+    def test_cohort_is_loaded_in_three_queries(self):
+        with self.assertNumQueries(3):
+            cards = list(cohort_report_cards('S1', '2024-2025'))
+        self.assertEqual([card['student']['student_id'] for card in cards], ['STU0001', 'STU0002', 'STU0003', 'STU0004'])
+        self.assertEqual(cards[0]['term']['gpa'], 4.0)
+        self.assertEqual(cards[0]['courses'][0]['exams'][0]['grade'], 'A')
+
+    def test_every_card_is_written_and_recorded(self):
+        self.assertEqual(self.generate(), ['STU0001', 'STU0002', 'STU0003', 'STU0004'])
+        manifest = read_manifest(self.directory)
+        self.assertEqual(manifest['cards']['STU0002'], 'STU0002.html')
+        self.assertIn('First2 Last2', (self.directory / 'STU0002.html').read_text())
+
+    def test_rerun_resumes_from_the_manifest(self):
+        self.generate()
+        # A card whose file went missing, and one the manifest never recorded
+        (self.directory / 'STU0003.html').unlink()
+        manifest = read_manifest(self.directory)
+        del manifest['cards']['STU0004']
+        (self.directory / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+        self.assertEqual(self.generate(), ['STU0003', 'STU0004'])
+        self.assertEqual(len(read_manifest(self.directory)['cards']), 4)
+        self.assertEqual(self.generate(), [])
+
+    def test_an_interrupted_run_records_what_finished(self):
+        run = generate_report_cards('S1', '2024-2025', workers=1)
+        first, _ = next(run)
+        run.close()
+        self.assertEqual(list(read_manifest(self.directory)['cards']), [first])
+        self.assertEqual(self.generate(), ['STU0002', 'STU0003', 'STU0004'])
+
+    def test_force_renders_everything_again(self):
+        self.generate()
+        self.assertEqual(len(self.generate(force=True)), 4)
@@ -0,0 +1,100 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from students.models import Student
+from students.routers import (
+    PRIMARY, REPLICA, STICKY_COOKIE, PinPrimaryAfterWriteMiddleware, ReplicaRouter, read_from_replica,
+)
+
+
+router = ReplicaRouter()
+
+
+def read_alias():
+    return router.db_for_read(Student)
+
+
+@read_from_replica
+def replica_view(request):
+    return HttpResponse(str(read_alias()))
+
+
+@read_from_replica
+async def async_replica_view(request):
+    return HttpResponse(str(read_alias()))
+
+
+@read_from_replica
+def streaming_view(request):
+    return StreamingHttpResponse(str(read_alias()) for _ in range(2))
+
+
+@mock.patch('students.routers.replica_enabled', return_value=True)
+class ReplicaRouterTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def test_reads_outside_replica_views_are_left_to_django(self, enabled):
+        self.assertIsNone(read_alias())
+
+    def test_replica_views_read_from_the_replica(self, enabled):
+        self.assertEqual(replica_view(self.factory.get('/')).content, REPLICA.encode())
+        response = async_to_sync(async_replica_view)(self.factory.get('/'))
+        self.assertEqual(response.content, REPLICA.encode())
+        self.assertIsNone(read_alias())
+
+    def test_streamed_chunks_read_from_the_replica(self, enabled):
+        response = streaming_view(self.factory.get('/'))
+        self.assertEqual(b''.join(response.streaming_content), (REPLICA * 2).encode())
+
+    def test_writes_go_to_the_primary(self, enabled):
+        self.assertEqual(router.db_for_write(Student), PRIMARY)
+        self.assertEqual(replica_view(self.factory.post('/')).content, b'None')
+
+    def test_pinned_browsers_read_from_the_primary(self, enabled):
+        request = self.factory.get('/')
+        request.COOKIES[STICKY_COOKIE] = '1'
+        self.assertEqual(replica_view(request).content, b'None')
+
+    def test_without_a_replica_everything_stays_on_the_primary(self, enabled):
+        enabled.return_value = False
+        self.assertEqual(replica_view(self.factory.get('/')).content, b'None')
+
+    def test_only_the_primary_is_migrated(self, enabled):
+        self.assertTrue(router.allow_migrate(PRIMARY, 'students'))
+        self.assertFalse(router.allow_migrate(REPLICA, 'students'))
+
+
+@mock.patch('students.routers.replica_enabled', return_value=True)
+class PinPrimaryAfterWriteTests(SimpleTestCase):
+    factory = RequestFactory()
+    middleware = PinPrimaryAfterWriteMiddleware(lambda request: HttpResponse())
+
+    def test_writes_pin_the_browser_to_the_primary(self, enabled):
+        with self.settings(STUDENTS_REPLICA_STICKY_SECONDS=7):
+            response = self.middleware(self.factory.post('/'))
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], 7)
+        self.assertTrue(cookie['httponly'])
+
+    def test_reads_do_not_pin(self, enabled):
+        self.assertNotIn(STICKY_COOKIE, self.middleware(self.factory.get('/')).cookies)
+
+    def test_nothing_is_pinned_without_a_replica(self, enabled):
+        enabled.return_value = False
+        self.assertNotIn(STICKY_COOKIE, self.middleware(self.factory.post('/')).cookies)
+
+
+@mock.patch('students.routers.replica_enabled', return_value=True)
+class StickyPrimaryTests(TestCase):
+    def test_the_cookie_is_set_by_a_write_through_the_whole_stack(self, enabled):
+        self.client.force_login(User.objects.create_user('teacher', password='secret'))
+        self.assertNotIn(STICKY_COOKIE, self.client.get(reverse('student_list')).cookies)
+        response = self.client.post(reverse('logout'))
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        # The test client sends it back with the next request
+        self.assertIn(STICKY_COOKIE, self.client.cookies)
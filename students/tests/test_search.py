@@ -0,0 +1,62 @@
+from django.test import TestCase
+
+from students.models import Enrollment, Student
+from students.search import search_related, search_students, tokenize
+
+from .utils import make_course, make_student
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ada = make_student(1, first_name='Ada', last_name='Lovelace', email='ada@example.com')
+        cls.alan = make_student(12, first_name='Alan', last_name='Turing', email='alan@example.com')
+        cls.grace = make_student(123, first_name='Grace', last_name='Hopper', email='grace@navy.example.com')
+
+    def search(self, query, **kwargs):
+        return list(search_students(Student.objects.order_by('pk'), query, **kwargs))
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('  Ada  LOVELACE-King '), ['ada', 'lovelace', 'king'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_every_word_must_prefix_an_indexed_word(self):
+        self.assertEqual(self.search('a'), [self.ada, self.alan])
+        self.assertEqual(self.search('ada love'), [self.ada])
+        self.assertEqual(self.search('ada turing'), [])
+        # Emails are indexed word by word
+        self.assertEqual(self.search('navy'), [self.grace])
+
+    def test_word_prefixes_only(self):
+        # "ace" is inside "Lovelace" but starts no word
+        self.assertEqual(self.search('ace'), [])
+
+    def test_blank_query_returns_everything(self):
+        self.assertEqual(self.search('  '), [self.ada, self.alan, self.grace])
+
+    def test_id_fragments_match_anywhere_in_the_student_id(self):
+        self.assertEqual(self.search('0001'), [self.ada])
+        self.assertEqual(self.search('012'), [self.alan, self.grace])
+        self.assertEqual(self.search('stu0123'), [self.grace])
+
+    def test_ranked_puts_exact_words_first(self):
+        make_student(4, first_name='Adam', last_name='Ada')
+        results = self.search('ada', ranked=True)
+        self.assertEqual(results[0].last_name, 'Ada')
+        self.assertEqual(len(results), 2)
+
+    def test_index_follows_edits(self):
+        self.ada.last_name = 'Byron'
+        self.ada.save()
+        self.assertEqual(self.search('byron'), [self.ada])
+        self.assertEqual(self.search('lovelace'), [])
+
+    def test_related_rows_match_by_student_or_course_code(self):
+        course = make_course('MATH1')
+        Enrollment.objects.create(student=self.ada, course=course, semester='S1', academic_year='2024-2025')
+        Enrollment.objects.create(student=self.alan, course=make_course('CS1'), semester='S1', academic_year='2024-2025')
+        enrollments = Enrollment.objects.all()
+        by_student = search_related(enrollments, 'turing', 'student', 'course')
+        self.assertEqual([enrollment.student for enrollment in by_student], [self.alan])
+        by_course = search_related(enrollments, 'math', 'student', 'course')
+        self.assertEqual([enrollment.student for enrollment in by_course], [self.ada])
@@ -0,0 +1,87 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from PIL import Image
+
+from students import jobs
+from students.models import Student
+from students.thumbnails import THUMBNAIL_SIZES, render_thumbnail, thumbnail_name
+
+from .utils import make_student
+
+
+def png(width=300, height=200, mode='RGBA'):
+    buffer = BytesIO()
+    Image.new(mode, (width, height), (200, 0, 0, 128) if mode == 'RGBA' else 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = self.settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_render_thumbnail_crops_to_an_opaque_square_jpeg(self):
+        thumbnail = Image.open(BytesIO(render_thumbnail(Image.open(BytesIO(png())), 80)))
+        self.assertEqual((thumbnail.format, thumbnail.size, thumbnail.mode), ('JPEG', (80, 80), 'RGB'))
+
+    def test_thumbnail_name_keeps_the_source_extension(self):
+        self.assertEqual(
+            thumbnail_name('student_profiles/ann.png', 'avatar'), 'student_profiles/thumbnails/avatar/ann.png.jpg'
+        )
+
+    def test_uploading_a_picture_generates_and_records_thumbnails(self):
+        student = make_student(1, profile_picture=SimpleUploadedFile('ann.png', png()))
+        name = student.profile_picture.name
+        for size in THUMBNAIL_SIZES:
+            self.assertTrue(default_storage.exists(thumbnail_name(name, size)))
+        self.assertTrue(Student.objects.get(pk=student.pk).has_thumbnails)
+        self.assertEqual(student.avatar_url(), '/media/' + thumbnail_name(name, 'avatar'))
+
+    def test_urls_are_built_without_asking_storage(self):
+        student = make_student(1)
+        student.profile_picture = 'student_profiles/ann.png'
+        with mock.patch.object(default_storage, 'exists', side_effect=AssertionError('storage hit')):
+            # Not generated yet: the picture itself
+            self.assertEqual(student.avatar_url(), '/media/student_profiles/ann.png')
+            student.has_thumbnails = True
+            self.assertEqual(student.detail_picture_url(), '/media/student_profiles/thumbnails/detail/ann.png.jpg')
+
+    def test_a_new_picture_is_shown_as_is_until_its_thumbnails_exist(self):
+        student = make_student(1, profile_picture=SimpleUploadedFile('ann.png', png()))
+        student.profile_picture = SimpleUploadedFile('broken.png', b'not an image')
+        with self.assertLogs('students.signals', 'ERROR'):
+            student.save()
+        student.refresh_from_db()
+        self.assertFalse(student.has_thumbnails)
+        self.assertEqual(student.avatar_url(), '/media/' + student.profile_picture.name)
+
+    def test_job_generates_the_missing_thumbnails(self):
+        default_storage.save('student_profiles/ann.png', BytesIO(png()))
+        default_storage.save('student_profiles/bad.png', BytesIO(b'not an image'))
+        ann, bad, _ = make_student(1), make_student(2), make_student(3)
+        # Bulk updates skip the signal that would generate them right away
+        Student.objects.filter(pk=ann.pk).update(profile_picture='student_profiles/ann.png')
+        Student.objects.filter(pk=bad.pk).update(profile_picture='student_profiles/bad.png', has_thumbnails=True)
+
+        job = jobs.enqueue('thumbnails')
+        self.assertTrue(jobs.run_job(jobs.claim_job('worker-1')))
+        job.refresh_from_db()
+        self.assertEqual(job.result, {'regenerated': 1, 'errors': {}})
+        self.assertEqual(list(Student.objects.filter(has_thumbnails=True)), [ann, bad])
+
+        # Regenerating everything finds the broken picture and stops linking its thumbnails
+        job = jobs.enqueue('thumbnails', {'missing_only': False})
+        self.assertTrue(jobs.run_job(jobs.claim_job('worker-1')))
+        job.refresh_from_db()
+        self.assertEqual(job.result['regenerated'], 1)
+        self.assertEqual(list(job.result['errors']), ['student_profiles/bad.png'])
+        self.assertEqual(list(Student.objects.filter(has_thumbnails=True)), [ann])
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from students.models import ComputedTranscript, Enrollment, Grade
+from students.transcripts import TRANSCRIPT_MAX_AGE, Transcript, compute_all_transcripts, get_transcript
+
+from .utils import make_course, make_grade, make_student
+
+
+class TranscriptTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_student(1)
+        four_credits = make_course('CS1', credits=4)
+        two_credits = make_course('CS2', credits=2)
+        fall = Enrollment.objects.create(
+            student=cls.student, course=four_credits, semester='S1', academic_year='2023-2024'
+        )
+        spring = Enrollment.objects.create(
+            student=cls.student, course=two_credits, semester='S2', academic_year='2023-2024'
+        )
+        # Two exams averaging 3.5 points, then a failed course
+        make_grade(fall, 95)
+        make_grade(fall, 85, exam_date=date(2024, 1, 10))
+        make_grade(spring, 30)
+
+    def test_credit_weighted_gpa(self):
+        transcript = get_transcript(self.student.pk)
+        self.assertEqual([term.gpa for term in transcript.semesters], [3.5, 0.0])
+        # (3.5 * 4 + 0.0 * 2) / 6
+        self.assertEqual(transcript.gpa, 2.33)
+        self.assertEqual(transcript.cumulative.credits, 6)
+        self.assertEqual(transcript.cumulative.earned_credits, 4)
+        self.assertEqual([term.label for term in transcript.years], ['2023-2024'])
+
+    def test_transcripts_are_stored_for_every_worker(self):
+        self.assertEqual(compute_all_transcripts(), 1)
+        stored = ComputedTranscript.objects.get(student=self.student)
+        self.assertEqual(len(stored.courses), 2)
+        # Served from the table without aggregating the grades again
+        with self.assertNumQueries(1):
+            self.assertEqual(get_transcript(self.student.pk).gpa, 2.33)
+
+    def test_student_without_grades(self):
+        transcript = get_transcript(make_student(2).pk)
+        self.assertIsInstance(transcript, Transcript)
+        self.assertIsNone(transcript.gpa)
+
+
+class TranscriptInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = make_student(1)
+        cls.course = make_course('CS1', credits=4)
+        cls.enrollment = Enrollment.objects.create(
+            student=cls.student, course=cls.course, semester='S1', academic_year='2024-2025'
+        )
+        cls.grade = make_grade(cls.enrollment, 95)
+
+    def test_transcript_follows_grade_changes(self):
+        self.assertEqual(get_transcript(self.student.pk).gpa, 4.0)
+        self.grade.marks_obtained = Decimal('45')
+        self.grade.grade = 'F'
+        self.grade.save()
+        self.assertEqual(get_transcript(self.student.pk).gpa, 0.0)
+
+        Grade.objects.filter(pk=self.grade.pk).delete()
+        self.assertIsNone(get_transcript(self.student.pk).gpa)
+
+    def test_transcript_follows_bulk_grade_updates(self):
+        self.assertEqual(get_transcript(self.student.pk).gpa, 4.0)
+        Grade.objects.filter(pk=self.grade.pk).update(grade='C')
+        self.assertEqual(get_transcript(self.student.pk).gpa, 2.0)
+
+    def test_credit_changes_invalidate_every_transcript(self):
+        other = make_course('CS2', credits=1)
+        enrollment = Enrollment.objects.create(
+            student=self.student, course=other, semester='S1', academic_year='2024-2025'
+        )
+        make_grade(enrollment, 30)
+        self.assertEqual(get_transcript(self.student.pk).gpa, 3.2)
+        other.credits = 4
+        other.save()
+        self.assertEqual(get_transcript(self.student.pk).gpa, 2.0)
+
+    def test_grade_changes_delete_the_stored_transcript(self):
+        get_transcript(self.student.pk)
+        self.assertTrue(ComputedTranscript.objects.filter(student=self.student).exists())
+        self.grade.save()
+        self.assertFalse(ComputedTranscript.objects.filter(student=self.student).exists())
+
+    def test_stale_transcripts_are_recomputed(self):
+        ComputedTranscript.objects.create(
+            student=self.student, courses=[],
+            computed_at=timezone.now() - TRANSCRIPT_MAX_AGE - timedelta(minutes=1),
+        )
+        self.assertEqual(get_transcript(self.student.pk).gpa, 4.0)
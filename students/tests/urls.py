@@ -0,0 +1,7 @@
+from django.urls import include, path
+
+from config.urls import urlpatterns as project_urlpatterns
+
+# The project's URLs with the async views mounted whatever
+# STUDENTS_ASYNC_VIEWS says
+urlpatterns = project_urlpatterns + [path('async/', include('students.async_urls'))]
@@ -0,0 +1,52 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from students.importers import read_records
+from students.models import Course, Grade, Student
+
+
+def make_student(number, **fields):
+    values = {
+        'student_id': f'STU{number:04d}',
+        'first_name': f'First{number}',
+        'last_name': f'Last{number}',
+        'email': f'student{number}@example.com',
+        'phone': '5550100',
+        'address': '1 School Road',
+        'date_of_birth': date(2005, 1, 1),
+        'gender': 'MFO'[number % 3],
+        'emergency_contact_name': 'Parent',
+        'emergency_contact_phone': '5550101',
+    }
+    values.update(fields)
+    return Student.objects.create(**values)
+
+
+def make_course(code, **fields):
+    values = {
+        'course_code': code,
+        'course_name': f'Course {code}',
+        'description': 'A course',
+        'credits': 3,
+        'level': 'UG',
+        'duration_months': 6,
+        'fee': Decimal('100.00'),
+    }
+    values.update(fields)
+    return Course.objects.create(**values)
+
+
+def make_grade(enrollment, marks, total=100, exam_date=date(2024, 5, 1)):
+    marks, total = Decimal(marks), Decimal(total)
+    return Grade.objects.create(
+        enrollment=enrollment,
+        marks_obtained=marks,
+        total_marks=total,
+        grade=Grade.letter_for_percentage(marks / total * 100),
+        exam_date=exam_date,
+    )
+
+
+def csv_records(text):
+    return read_records(io.StringIO(text), 'csv')
@@ -0,0 +1,84 @@
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import django
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+
+# Square thumbnails, at twice the largest size they are displayed at so
+# they stay sharp on high-density screens
+THUMBNAIL_SIZES = {
+    'avatar': 80,    # 32-40px avatars in the list views
+    'detail': 400,   # up to 200px on the detail and edit pages
+}
+THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_QUALITY = 85
+
+
+def thumbnail_name(name, size):
+    """Storage name of one thumbnail of the picture stored as ``name``"""
+    directory, filename = posixpath.split(name)
+    # Keep the source extension: alice.png and alice.jpg need their own thumbnails
+    return posixpath.join(directory, THUMBNAIL_DIR, size, f'{filename}.jpg')
+
+
+def thumbnail_url(name, size, generated):
+    """
+    URL of one thumbnail, or of the picture itself until its thumbnails are
+    ``generated``. Storage is not asked whether the file exists, so list
+    pages build their avatar URLs without a filesystem hit per row.
+    """
+    return default_storage.url(thumbnail_name(name, size) if generated else name)
+
+
+def render_thumbnail(image, edge):
+    """A centre-cropped square JPEG of ``image``, ``edge`` pixels across"""
+    thumbnail = ImageOps.fit(image, (edge, edge), Image.LANCZOS)
+    if thumbnail.mode in ('RGBA', 'LA', 'P'):
+        # JPEG has no alpha channel: flatten transparent pixels onto white
+        thumbnail = thumbnail.convert('RGBA')
+        background = Image.new('RGB', thumbnail.size, 'white')
+        background.paste(thumbnail, mask=thumbnail.getchannel('A'))
+        thumbnail = background
+    elif thumbnail.mode != 'RGB':
+        thumbnail = thumbnail.convert('RGB')
+    buffer = BytesIO()
+    thumbnail.save(buffer, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def make_thumbnails(name):
+    """Write every thumbnail size for one stored picture, replacing old ones"""
+    with default_storage.open(name, 'rb') as f:
+        image = Image.open(f)
+        # Phones store the orientation in EXIF instead of rotating the pixels
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    written = []
+    for size, edge in THUMBNAIL_SIZES.items():
+        target = thumbnail_name(name, size)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        written.append(default_storage.save(target, ContentFile(render_thumbnail(image, edge))))
+    return written
+
+
+def _regenerate_one(name):
+    try:
+        make_thumbnails(name)
+    except (OSError, Image.DecompressionBombError) as exc:
+        return name, str(exc)
+    return name, None
+
+
+def regenerate_thumbnails(names, workers=None, chunk_size=16):
+    """
+    Rebuild thumbnails for many pictures across a process pool. Yields
+    (name, error) as each finishes; error is None on success.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        yield from pool.map(_regenerate_one, names, chunksize=chunk_size)
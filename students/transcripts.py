@@ -0,0 +1,227 @@
+"""
+Credit-weighted GPAs and transcripts, computed in SQL and stored.
+
+Computed transcripts live in the ComputedTranscript table rather than a
+per-process cache, so every worker reads the same ones and a precompute
+run by compute_transcripts or a background job serves them all. The
+signals and bulk paths that change grades, enrollments or credits delete
+the rows they affect, which makes the invalidation visible to every
+process at once. Rows older than TRANSCRIPT_MAX_AGE are recomputed on
+read as a backstop.
+"""
+import csv
+from datetime import timedelta
+from itertools import groupby
+
+from django.db.models import Avg, Count, QuerySet
+from django.utils import timezone
+
+from .managers import deferred_bookkeeping
+from .models import ComputedTranscript, Enrollment, Grade, Student
+
+
+TRANSCRIPT_MAX_AGE = timedelta(days=1)
+PASSING_POINTS = min(Grade.GRADE_POINTS[letter] for letter in Grade.PASSING_GRADES)
+SEMESTER_LABELS = dict(Enrollment.SEMESTER_CHOICES)
+
+
+class Term:
+    """Credit-weighted GPA over the courses of one semester, one year, or a whole record"""
+
+    def __init__(self, academic_year=None, semester=None):
+        self.academic_year = academic_year
+        self.semester = semester
+        self.courses = []
+        self.credits = 0
+        self.earned_credits = 0
+        self.quality_points = 0.0
+
+    def add(self, course):
+        self.courses.append(course)
+        self.credits += course['credits']
+        self.quality_points += course['grade_points'] * course['credits']
+        if course['passed']:
+            self.earned_credits += course['credits']
+
+    @property
+    def gpa(self):
+        return round(self.quality_points / self.credits, 2) if self.credits else None
+
+    @property
+    def label(self):
+        if self.semester:
+            return f'{SEMESTER_LABELS.get(self.semester, self.semester)}, {self.academic_year}'
+        return self.academic_year or 'Cumulative'
+
+
+class Transcript:
+    """A student's graded courses with per-semester, per-year and cumulative GPA"""
+
+    def __init__(self, student_id, courses=()):
+        self.student_id = student_id
+        self.semesters = []
+        self.years = []
+        self.cumulative = Term()
+        for course in courses:
+            self.add(course)
+
+    def add(self, course):
+        year, semester = course['academic_year'], course['semester']
+        if not self.years or self.years[-1].academic_year != year:
+            self.years.append(Term(year))
+        if not self.semesters or (self.semesters[-1].academic_year, self.semesters[-1].semester) != (year, semester):
+            self.semesters.append(Term(year, semester))
+        self.semesters[-1].add(course)
+        self.years[-1].add(course)
+        self.cumulative.add(course)
+
+    @property
+    def courses(self):
+        return self.cumulative.courses
+
+    @property
+    def gpa(self):
+        return self.cumulative.gpa
+
+
+def course_results(student_ids=None):
+    """
+    One row per graded enrollment: its course, credits, and the average grade
+    points and percentage over that enrollment's grades.
+
+    Everything is aggregated in a single GROUP BY query; rows come back
+    ordered by student, academic year and semester.
+    """
+    grades = Grade.objects.all()
+    if student_ids is not None:
+        grades = grades.filter(enrollment__student_id__in=student_ids)
+    return grades.values(
+        'enrollment_id',
+        'enrollment__student_id',
+        'enrollment__academic_year',
+        'enrollment__semester',
+        'enrollment__course__course_code',
+        'enrollment__course__course_name',
+        'enrollment__course__credits',
+    ).annotate(
+        grade_points=Avg(Grade.points_expression()),
+        percentage=Avg(Grade.percentage_expression()),
+        exams=Count('id'),
+    ).order_by(
+        'enrollment__student_id',
+        'enrollment__academic_year',
+        'enrollment__semester',
+        'enrollment__course__course_code',
+    )
+
+
+def _course(row):
+    return {
+        'course_code': row['enrollment__course__course_code'],
+        'course_name': row['enrollment__course__course_name'],
+        'credits': row['enrollment__course__credits'],
+        'academic_year': row['enrollment__academic_year'],
+        'semester': row['enrollment__semester'],
+        'grade_points': row['grade_points'],
+        'percentage': row['percentage'],
+        'exams': row['exams'],
+        'passed': row['grade_points'] >= PASSING_POINTS,
+    }
+
+
+def build_transcripts(student_ids=None, chunk_size=5000):
+    """Yield a Transcript for every student with grades, streaming the rows"""
+    rows = course_results(student_ids).iterator(chunk_size=chunk_size)
+    for student_id, student_rows in groupby(rows, key=lambda row: row['enrollment__student_id']):
+        transcript = Transcript(student_id)
+        for row in student_rows:
+            transcript.add(_course(row))
+        yield transcript
+
+
+def save_transcripts(transcripts):
+    """Store computed transcripts, replacing any earlier ones, in one upsert"""
+    now = timezone.now()
+    ComputedTranscript.objects.bulk_create(
+        [
+            ComputedTranscript(student_id=transcript.student_id, courses=transcript.courses, computed_at=now)
+            for transcript in transcripts
+        ],
+        update_conflicts=True,
+        unique_fields=['student'],
+        update_fields=['courses', 'computed_at'],
+    )
+
+
+def get_transcript(student_id):
+    """The student's transcript, from the stored one when it is still valid"""
+    courses = ComputedTranscript.objects.filter(
+        student_id=student_id,
+        computed_at__gte=timezone.now() - TRANSCRIPT_MAX_AGE,
+    ).values_list('courses', flat=True).first()
+    if courses is not None:
+        return Transcript(student_id, courses)
+    transcript = next(build_transcripts([student_id]), None) or Transcript(student_id)
+    save_transcripts([transcript])
+    return transcript
+
+
+def store_transcripts(transcripts, batch_size=5000):
+    """Store transcripts in batches as they stream past, passing each one on"""
+    batch = []
+    for transcript in transcripts:
+        batch.append(transcript)
+        if len(batch) >= batch_size:
+            save_transcripts(batch)
+            batch = []
+        yield transcript
+    if batch:
+        save_transcripts(batch)
+
+
+def compute_all_transcripts(student_ids=None, chunk_size=5000):
+    """
+    Build and store transcripts for many students at once (the whole school
+    by default). Returns the number of transcripts computed.
+    """
+    transcripts = build_transcripts(student_ids, chunk_size=chunk_size)
+    return sum(1 for _ in store_transcripts(transcripts, batch_size=chunk_size))
+
+
+def write_transcript_report(f, chunk_size=5000):
+    """
+    Write a CSV of GPA and credits per semester, year and overall for every
+    student to ``f``, storing the transcripts on the way. Returns the
+    number of students.
+    """
+    student_ids = dict(Student.objects.values_list('pk', 'student_id').iterator(chunk_size=chunk_size))
+    writer = csv.writer(f)
+    writer.writerow(['student_id', 'academic_year', 'semester', 'gpa', 'credits', 'earned_credits'])
+    count = 0
+    for transcript in store_transcripts(build_transcripts(chunk_size=chunk_size), batch_size=chunk_size):
+        student_id = student_ids.get(transcript.student_id)
+        for term in transcript.semesters + transcript.years + [transcript.cumulative]:
+            writer.writerow([
+                student_id, term.academic_year or '', term.semester or '',
+                term.gpa, term.credits, term.earned_credits,
+            ])
+        count += 1
+    return count
+
+
+def invalidate_transcripts(student_ids):
+    """Drop the stored transcripts of these students (ids, or a queryset of them)"""
+    pending = deferred_bookkeeping()
+    if pending is not None:
+        pending.transcript_student_ids.update(student_ids)
+        return
+    if not isinstance(student_ids, QuerySet):
+        student_ids = set(student_ids)
+        if not student_ids:
+            return
+    ComputedTranscript.objects.filter(student_id__in=student_ids).delete()
+
+
+def invalidate_all_transcripts():
+    """Drop every stored transcript, e.g. after a course's credits change"""
+    ComputedTranscript.objects.all().delete()
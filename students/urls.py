@@ -23,4 +23,10 @@ urlpatterns = [
     # Grade URLs
     path('grades/', views.grade_list, name='grade_list'),
     path('grades/create/', views.grade_create, name='grade_create'),
+    path('grades/gradebook/', views.gradebook, name='gradebook'),
+    
+    # Background jobs
+    path('jobs/<int:pk>/', views.job_detail, name='job_detail'),
+    path('jobs/<int:pk>/status/', views.job_status, name='job_status'),
+    path('jobs/<int:pk>/download/', views.job_download, name='job_download'),
 ]
\ No newline at end of file
@@ -1,12 +1,31 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
 from django.contrib.auth import login, authenticate
 from django.contrib.auth.views import LogoutView as AuthLogoutView
 from django.contrib import messages
-from django.db.models import Q, Count, Avg
-from django.core.paginator import Paginator
-from .models import Student, Course, Enrollment, Grade
-from .forms import StudentForm, CourseForm, EnrollmentForm, GradeForm, SearchForm, LoginForm
+from django.conf import settings
+from django.db.models import Q, Count, Avg, F
+from .models import Student, Course, Enrollment, Grade, Job
+from .forms import (
+    StudentForm, CourseForm, EnrollmentForm, GradeForm, SearchForm, LoginForm,
+    GradeFilterForm, EnrollmentFilterForm, GradebookSectionForm, GradebookForm,
+)
+from .exports import EXPORT_FORMATS, EXPORTS, STREAMERS
+from .gradebook import existing_grades, save_grades, section_enrollments
+from .instrumentation import query_budget
+from .jobs import enqueue
+from .pagination import KeysetPaginator, cached_count
+from .routers import read_from_replica
+from .stats import get_stats
+from .transcripts import get_transcript
+
+STUDENTS_PER_PAGE = 10
+ENROLLMENTS_PER_PAGE = 25
+GRADES_PER_PAGE = 25
 
 class LogoutView(AuthLogoutView):
     """Custom logout view"""
@@ -41,69 +60,57 @@ def custom_login(request):
     
     return render(request, 'students/login.html', {'form': form})
 
+def recent_enrollments():
+    return list(Enrollment.objects.select_related('student', 'course').order_by('-enrollment_date')[:5])
+
+def popular_courses():
+    return list(Course.objects.order_by('-enrollment_count')[:5])
+
+def dashboard_context(stats, recent, popular):
+    return {
+        'total_students': stats.total_students,
+        'active_students': stats.active_students,
+        'total_courses': stats.active_courses,
+        'total_enrollments': stats.active_enrollments,
+        'recent_enrollments': recent,
+        'gender_distribution': stats.gender_distribution(),
+        'course_popularity': popular,
+    }
+
+@query_budget(6)
 @login_required
+@read_from_replica
 def dashboard(request):
     """Dashboard view with statistics"""
-    total_students = Student.objects.count()
-    active_students = Student.objects.filter(status='A').count()
-    total_courses = Course.objects.filter(is_active=True).count()
-    total_enrollments = Enrollment.objects.filter(is_active=True).count()
-    
-    # Recent enrollments
-    recent_enrollments = Enrollment.objects.select_related('student', 'course').order_by('-enrollment_date')[:5]
-    
-    # Gender distribution
-    gender_distribution = Student.objects.values('gender').annotate(count=Count('gender'))
-    
-    # Course popularity
-    course_popularity = Course.objects.annotate(
-        enrollment_count=Count('enrollments')
-    ).order_by('-enrollment_count')[:5]
-    
-    context = {
-        'total_students': total_students,
-        'active_students': active_students,
-        'total_courses': total_courses,
-        'total_enrollments': total_enrollments,
-        'recent_enrollments': recent_enrollments,
-        'gender_distribution': gender_distribution,
-        'course_popularity': course_popularity,
-    }
+    # Counts come from the precomputed stats row instead of scanning tables
+    context = dashboard_context(get_stats(), recent_enrollments(), popular_courses())
     return render(request, 'students/dashboard.html', context)
 
+def student_list_context(request, search_form, page_obj):
+    filter_params = request.GET.copy()
+    filter_params.pop('cursor', None)
+    return {
+        'page_obj': page_obj,
+        'search_form': search_form,
+        'total_students': page_obj.total,
+        'filter_query': filter_params.urlencode(),
+    }
+
+@query_budget(5)
 @login_required
 def student_list(request):
     """List all students with search and filter"""
-    students = Student.objects.all().order_by('-created_at')
     search_form = SearchForm(request.GET)
+    students = search_form.filter_queryset(Student.objects.for_list())
     
-    if search_form.is_valid():
-        query = search_form.cleaned_data.get('query')
-        status = search_form.cleaned_data.get('status')
-        
-        if query:
-            students = students.filter(
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query) |
-                Q(student_id__icontains=query) |
-                Q(email__icontains=query)
-            )
-        
-        if status:
-            students = students.filter(status=status)
-    
-    # Pagination
-    paginator = Paginator(students, 10)  # Show 10 students per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    context = {
-        'page_obj': page_obj,
-        'search_form': search_form,
-        'total_students': students.count(),
-    }
+    # Keyset pagination: every page is a seek on (created_at, id), so page N
+    # costs the same as page 1. The total is cached rather than recounted.
+    paginator = KeysetPaginator(students, STUDENTS_PER_PAGE, ordering=('created_at', 'id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'), total=cached_count(students))
+    context = student_list_context(request, search_form, page_obj)
     return render(request, 'students/student_list.html', context)
 
+@query_budget(6)
 @login_required
 def student_detail(request, pk):
     """View student details"""
@@ -112,9 +119,11 @@ def student_detail(request, pk):
     context = {
         'student': student,
         'enrollments': enrollments,
+        'transcript': get_transcript(student.pk),
     }
     return render(request, 'students/student_detail.html', context)
 
+@query_budget(12)
 @login_required
 def student_create(request):
     """Create a new student"""
@@ -130,6 +139,7 @@ def student_create(request):
     context = {'form': form}
     return render(request, 'students/student_form.html', context)
 
+@query_budget(12)
 @login_required
 def student_update(request, pk):
     """Update student information"""
@@ -150,6 +160,7 @@ def student_update(request, pk):
     }
     return render(request, 'students/student_form.html', context)
 
+@query_budget(16)
 @login_required
 def student_delete(request, pk):
     """Delete a student"""
@@ -163,13 +174,35 @@ def student_delete(request, pk):
     context = {'student': student}
     return render(request, 'students/student_confirm_delete.html', context)
 
+@query_budget(4)
 @login_required
 def course_list(request):
-    """List all courses"""
-    courses = Course.objects.all().order_by('-created_at')
-    context = {'courses': courses}
+    """List all courses with their enrollment counts"""
+    courses = Course.objects.for_list().order_by('-created_at')
+    
+    if getattr(settings, 'STUDENTS_DENORMALIZED_COUNTERS', False):
+        courses = courses.annotate(
+            num_enrollments=F('enrollment_count'),
+            num_active_enrollments=F('active_enrollment_count'),
+        )
+    else:
+        courses = courses.annotate(
+            num_enrollments=Count('enrollments'),
+            num_active_enrollments=Count('enrollments', filter=Q(enrollments__is_active=True)),
+        )
+    courses = list(courses)
+    
+    # The whole catalog is already loaded, so the summary cards need no queries
+    context = {
+        'courses': courses,
+        'total_courses': len(courses),
+        'active_courses': sum(1 for course in courses if course.is_active),
+        'total_enrollments': sum(course.num_enrollments for course in courses),
+        'total_fees': sum(course.fee for course in courses),
+    }
     return render(request, 'students/course_list.html', context)
 
+@query_budget(6)
 @login_required
 def course_create(request):
     """Create a new course"""
@@ -185,13 +218,50 @@ def course_create(request):
     context = {'form': form}
     return render(request, 'students/course_form.html', context)
 
+def enrollment_totals(filter_form, enrollments):
+    """
+    (total, active) for the filtered enrollment list.
+
+    A semester or year filter is counted through the section index. Without
+    one, most of the table is active and no index is cheaper than a full
+    scan, so the active count comes from the dashboard stats row instead.
+    """
+    filters = filter_form.cleaned_data if filter_form.is_valid() else {}
+    if filters.get('semester') or filters.get('academic_year'):
+        return cached_count(enrollments), cached_count(enrollments.filter(is_active=True))
+    
+    active = get_stats().active_enrollments
+    if filters.get('status') == 'active':
+        return active, active
+    total = cached_count(Enrollment.objects.all())
+    if filters.get('status') == 'inactive':
+        return total - active, 0
+    return total, active
+
+@query_budget(6)
 @login_required
+@read_from_replica
 def enrollment_list(request):
-    """List all enrollments"""
-    enrollments = Enrollment.objects.select_related('student', 'course').all().order_by('-enrollment_date')
-    context = {'enrollments': enrollments}
+    """List enrollments, filtered by semester, academic year and status"""
+    filter_form = EnrollmentFilterForm(request.GET)
+    enrollments = filter_form.filter_queryset(Enrollment.objects.for_list())
+    
+    # Keyset pages on (enrollment_date, id), totals cached like student_list's
+    total, active = enrollment_totals(filter_form, enrollments)
+    paginator = KeysetPaginator(enrollments, ENROLLMENTS_PER_PAGE, ordering=('enrollment_date', 'id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'), total=total)
+    filter_params = request.GET.copy()
+    filter_params.pop('cursor', None)
+    context = {
+        'enrollments': page_obj,
+        'page_obj': page_obj,
+        'active_enrollments': active,
+        'filter_form': filter_form,
+        'filter_query': filter_params.urlencode(),
+    }
     return render(request, 'students/enrollment_list.html', context)
 
+@query_budget(12)
 @login_required
 def enrollment_create(request):
     """Create a new enrollment"""
@@ -207,13 +277,73 @@ def enrollment_create(request):
     context = {'form': form}
     return render(request, 'students/enrollment_form.html', context)
 
+def grade_summary(grades):
+    """Summary numbers and letter distribution for a filtered set of grades"""
+    # All of them come from one aggregate query
+    summary = grades.aggregate(
+        total=Count('id'),
+        passed=Count('id', filter=Q(grade__in=Grade.PASSING_GRADES)),
+        average=Avg(Grade.percentage_expression()),
+        **{
+            'grade_%s' % letter: Count('id', filter=Q(grade=letter))
+            for letter, _ in Grade.GRADE_CHOICES
+        }
+    )
+    total = summary['total']
+    distribution = [
+        {
+            'letter': letter,
+            'label': label,
+            'count': summary['grade_%s' % letter],
+            'share': summary['grade_%s' % letter] * 100 / total if total else 0,
+        }
+        for letter, label in Grade.GRADE_CHOICES
+    ]
+    grade_points = sum(
+        item['count'] * Grade.GRADE_POINTS[item['letter']] for item in distribution
+    )
+    average = summary['average']
+    return {
+        'total_grades': total,
+        'pass_rate': summary['passed'] * 100 / total if total else 0,
+        'failed': total - summary['passed'],
+        'average_percentage': average,
+        'average_grade': Grade.letter_for_percentage(average) if average is not None else None,
+        'average_gpa': grade_points / total if total else None,
+        'distinctions': summary['grade_A'],
+        'distribution': distribution,
+        'distribution_counts': [item['count'] for item in distribution],
+    }
+
+def grade_page(request, grades):
+    """One keyset page of grade rows with their SQL-computed percentages"""
+    rows = grades.for_list().annotate(percentage_score=Grade.percentage_expression())
+    paginator = KeysetPaginator(rows, GRADES_PER_PAGE, ordering=('exam_date', 'id'))
+    return paginator.get_page(request.GET.get('cursor'))
+
+def grade_list_context(request, filter_form, summary, page_obj):
+    page_obj.total = summary['total_grades']
+    filter_params = request.GET.copy()
+    filter_params.pop('cursor', None)
+    return {
+        'grades': page_obj,
+        'page_obj': page_obj,
+        'filter_form': filter_form,
+        'filter_query': filter_params.urlencode(),
+        **summary,
+    }
+
+@query_budget(7)
 @login_required
+@read_from_replica
 def grade_list(request):
-    """List all grades"""
-    grades = Grade.objects.select_related('enrollment__student', 'enrollment__course').all().order_by('-exam_date')
-    context = {'grades': grades}
+    """List grades with filters, SQL-computed percentages and summary"""
+    filter_form = GradeFilterForm(request.GET)
+    grades = filter_form.filter_queryset(Grade.objects.all())
+    context = grade_list_context(request, filter_form, grade_summary(grades), grade_page(request, grades))
     return render(request, 'students/grade_list.html', context)
 
+@query_budget(8)
 @login_required
 def grade_create(request):
     """Add grades for an enrollment"""
@@ -227,4 +357,122 @@ def grade_create(request):
         form = GradeForm()
     
     context = {'form': form}
-    return render(request, 'students/grade_form.html', context)
\ No newline at end of file
+    return render(request, 'students/grade_form.html', context)
+
+@query_budget(12)
+@login_required
+def gradebook(request):
+    """Enter one exam's marks for a whole course section at once"""
+    section_form = GradebookSectionForm(request.GET or None)
+    context = {'section_form': section_form}
+    
+    if section_form.is_valid():
+        section = section_form.cleaned_data
+        enrollments = section_enrollments(section['course'], section['semester'], section['academic_year'])
+        grades = existing_grades(enrollments, section['exam_date'])
+        initial = {}
+        for enrollment in enrollments:
+            enrollment.current_grade = grades.get(enrollment.pk)
+            if enrollment.current_grade:
+                initial[f'marks_{enrollment.pk}'] = enrollment.current_grade.marks_obtained
+                initial[f'remarks_{enrollment.pk}'] = enrollment.current_grade.remarks
+        
+        form = GradebookForm(
+            request.POST or None,
+            initial=initial,
+            enrollments=enrollments,
+            total_marks=section['total_marks'],
+        )
+        if request.method == 'POST' and form.is_valid():
+            created, updated = save_grades(
+                enrollments,
+                section['exam_date'],
+                section['total_marks'],
+                form.entered_marks(),
+                form.entered_remarks(),
+            )
+            messages.success(request, f'Saved grades: {created} added, {updated} updated.')
+            return redirect(f'{request.path}?{request.GET.urlencode()}')
+        
+        context.update({
+            'form': form,
+            'section': section,
+        })
+    
+    return render(request, 'students/gradebook.html', context)
+
+@query_budget(4)
+@login_required
+@read_from_replica
+def export_data(request, export_type):
+    """Stream a filtered listing as CSV or JSON Lines"""
+    export_class = EXPORTS.get(export_type)
+    fmt = request.GET.get('format', 'csv')
+    if export_class is None or fmt not in EXPORT_FORMATS:
+        raise Http404('Unknown export')
+    
+    # Rows are read in chunks and written as they arrive, so the response
+    # starts immediately and memory stays flat however large the export is.
+    export = export_class(request.GET)
+    response = StreamingHttpResponse(STREAMERS[fmt](export), content_type=EXPORT_FORMATS[fmt])
+    filename = f'{export_type}-{timezone.localdate():%Y%m%d}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@query_budget(4)
+@login_required
+@require_POST
+def export_job(request, export_type):
+    """Queue a full export as a background job; the filters come from the query string"""
+    fmt = request.GET.get('format', 'csv')
+    if export_type not in EXPORTS or fmt not in EXPORT_FORMATS:
+        raise Http404('Unknown export')
+    
+    filters = {key: value for key, value in request.GET.items() if key != 'format'}
+    job = enqueue('export', {'export_type': export_type, 'format': fmt, 'filters': filters}, user=request.user)
+    return JsonResponse({
+        'job': job.pk,
+        'url': reverse('job_detail', args=[job.pk]),
+        'status_url': reverse('job_status', args=[job.pk]),
+    }, status=202)
+
+def _user_job(request, pk):
+    jobs = Job.objects.all() if request.user.is_staff else Job.objects.filter(created_by=request.user)
+    return get_object_or_404(jobs, pk=pk)
+
+def job_status_data(job, user):
+    return {
+        'job': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'finished': job.is_finished,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'result': job.result,
+        'download_url': reverse('job_download', args=[job.pk]) if job.result_file else None,
+        # Tracebacks are for staff; users just learn that it failed
+        'error': job.error if user.is_staff else '',
+    }
+
+@query_budget(3)
+@login_required
+def job_detail(request, pk):
+    """Progress page of one background job, polling job_status until it finishes"""
+    job = _user_job(request, pk)
+    return render(request, 'students/job_detail.html', {'job': job})
+
+@query_budget(3)
+@login_required
+def job_status(request, pk):
+    """A background job's status as JSON, polled by the job page"""
+    return JsonResponse(job_status_data(_user_job(request, pk), request.user))
+
+@query_budget(3)
+@login_required
+def job_download(request, pk):
+    """Download the file a background job produced"""
+    job = _user_job(request, pk)
+    if job.status != Job.SUCCEEDED or not job.result_file:
+        raise Http404('This job has no result file')
+    return FileResponse(job.result_file.open('rb'), as_attachment=True, filename=job.result_file.name.rsplit('/', 1)[-1])
+